@@ -0,0 +1,3 @@
+echo "Running bench.sh, the performance benchmark suite."
+echo "Comparing against benchmarks/baselines.json. Pass --save to update it."
+pipenv run python -m benchmarks.run "$@"
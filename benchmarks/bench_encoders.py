@@ -0,0 +1,151 @@
+"""Compares the frame encoders on synthetic screenshots: compression ratio,
+encode and decode time, and fidelity of the lossy encoders.
+
+Run with ``python -m benchmarks.bench_encoders``.
+"""
+
+import argparse
+import timeit
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from nerdtracker_client.screenshots import (
+    SyntheticScreen,
+    create_encoder,
+    decode_frame,
+)
+from nerdtracker_client.screenshots.encoders import ENCODERS, decode, encode
+from nerdtracker_client.screenshots.synthetic import PATTERNS
+
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440)}
+
+
+class EncoderResult(NamedTuple):
+    resolution: str
+    pattern: str
+    encoder: str
+    wire_bytes: int
+    ratio: float
+    encode_ms: float
+    decode_ms: float
+    psnr: float
+
+
+def psnr(original: np.ndarray, decoded: np.ndarray) -> float:
+    """Peak signal-to-noise ratio of a decoded frame against the original.
+
+    Args:
+        original (np.ndarray): The original 8-bit frame.
+        decoded (np.ndarray): The decoded frame.
+
+    Returns:
+        float: The PSNR in dB, infinite if the frames are identical.
+    """
+    error = np.mean((original.astype(np.float64) - decoded) ** 2)
+    if error == 0:
+        return float("inf")
+    return float(10 * np.log10(255**2 / error))
+
+
+def run(
+    resolutions: Sequence[str] = tuple(RESOLUTIONS),
+    patterns: Sequence[str] = tuple(PATTERNS),
+    encoders: Sequence[str] = tuple(ENCODERS),
+    repeat: int = 3,
+) -> list[EncoderResult]:
+    """Encodes a synthetic screenshot of every resolution and pattern with
+    every encoder. Encoders whose dependencies are missing are skipped.
+
+    Args:
+        resolutions (Sequence[str]): The resolutions to try, from RESOLUTIONS.
+        patterns (Sequence[str]): The SyntheticScreen patterns to try.
+        encoders (Sequence[str]): The encoders to try, from ENCODERS.
+        repeat (int): Number of timings per case, the best is kept. Defaults
+            to 3.
+
+    Returns:
+        list[EncoderResult]: The size, time and fidelity of each case.
+    """
+    results: list[EncoderResult] = []
+    for resolution in resolutions:
+        width, height = RESOLUTIONS[resolution]
+        for pattern in patterns:
+            screen = SyntheticScreen(width, height, pattern=pattern)
+            # Same as Screenshotter.take_screenshot: BGRA with alpha sliced.
+            screenshot = screen.grab(screen.monitors[1])[:, :, :-1]
+            for name in encoders:
+                try:
+                    encoder = create_encoder(name)
+                except ImportError:
+                    continue
+                payload = encode(screenshot, encoder)
+                body = payload.tobytes()
+                encode_seconds = min(
+                    timeit.repeat(
+                        lambda: encode(screenshot, encoder),
+                        number=1,
+                        repeat=repeat,
+                    )
+                )
+                decode_seconds = min(
+                    timeit.repeat(
+                        lambda: decode(decode_frame(body)),
+                        number=1,
+                        repeat=repeat,
+                    )
+                )
+                results.append(
+                    EncoderResult(
+                        resolution,
+                        pattern,
+                        name,
+                        len(body),
+                        screenshot.nbytes / len(body),
+                        encode_seconds * 1e3,
+                        decode_seconds * 1e3,
+                        psnr(screenshot, decode(decode_frame(body))),
+                    )
+                )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the comparison from the command line and prints a table of
+    results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resolutions", nargs="+", choices=list(RESOLUTIONS), default=None
+    )
+    parser.add_argument("--patterns", nargs="+", choices=PATTERNS, default=None)
+    parser.add_argument(
+        "--encoders", nargs="+", choices=list(ENCODERS), default=None
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'resolution':<11} {'pattern':<11} {'encoder':<8} {'bytes':>10} "
+        + f"{'ratio':>7} {'encode ms':>10} {'decode ms':>10} {'psnr':>7}"
+    )
+    for result in run(
+        args.resolutions or tuple(RESOLUTIONS),
+        args.patterns or tuple(PATTERNS),
+        args.encoders or tuple(ENCODERS),
+        args.repeat,
+    ):
+        print(
+            f"{result.resolution:<11} {result.pattern:<11} "
+            + f"{result.encoder:<8} {result.wire_bytes:>10} "
+            + f"{result.ratio:>7.1f} {result.encode_ms:>10.2f} "
+            + f"{result.decode_ms:>10.2f} {result.psnr:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
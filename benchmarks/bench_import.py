@@ -0,0 +1,117 @@
+"""Measures how long importing the package and its subpackages takes, using
+``python -X importtime``, and fails when an import goes over its budget.
+
+Run with ``python -m benchmarks.bench_import``.
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple, Sequence
+
+# Budgets, in milliseconds, for the cumulative import time of each module.
+# Loading any heavy dependency, such as numpy, fuzzywuzzy or cloudscraper,
+# takes well over these.
+BUDGETS_MS: dict[str, float] = {
+    "nerdtracker_client": 5.0,
+    "nerdtracker_client.player_list": 10.0,
+    "nerdtracker_client.scraper": 10.0,
+    "nerdtracker_client.screenshots": 10.0,
+}
+
+IMPORTTIME_LINE = re.compile(
+    r"import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|"
+    + r"\s+(?P<module>\S+)"
+)
+
+
+class ImportResult(NamedTuple):
+    module: str
+    milliseconds: float
+    budget_ms: float
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the import took longer than its budget
+
+        Returns:
+            bool: Whether the import took longer than its budget
+        """
+        return self.milliseconds > self.budget_ms
+
+
+def import_time(module: str) -> float:
+    """Imports a module in a fresh interpreter and reports how long it took.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        float: The cumulative import time of the module, in milliseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and (match["module"] == module):
+            return int(match["cumulative"]) / 1000.0
+    raise RuntimeError(f"No import time reported for {module}.")
+
+
+def run(
+    budgets_ms: dict[str, float] = BUDGETS_MS, repeat: int = 5
+) -> list[ImportResult]:
+    """Measures the import time of every module with a budget.
+
+    Args:
+        budgets_ms (dict[str, float]): The budget of each module, in
+            milliseconds.
+        repeat (int): Number of fresh imports per module, the median is kept.
+            Defaults to 5.
+
+    Returns:
+        list[ImportResult]: The median import time of each module.
+    """
+    return [
+        ImportResult(
+            module,
+            statistics.median(import_time(module) for _ in range(repeat)),
+            budget_ms,
+        )
+        for module, budget_ms in budgets_ms.items()
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Runs the benchmark from the command line and prints a table of results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+
+    Returns:
+        int: The exit code, 1 if any import went over its budget.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat)
+    print(f"{'module':<36} {'ms':>8} {'budget':>8}")
+    for result in results:
+        flag = "  OVER BUDGET" if result.over_budget else ""
+        print(
+            f"{result.module:<36} {result.milliseconds:>8.2f} "
+            + f"{result.budget_ms:>8.1f}{flag}"
+        )
+    return 1 if any(result.over_budget for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
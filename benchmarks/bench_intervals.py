@@ -0,0 +1,109 @@
+"""Measures how the interval utilities scale with the length of the list,
+comparing the pure Python functions in util with the vectorized ones in
+intervals.
+
+Run with ``python -m benchmarks.bench_intervals``.
+"""
+
+import argparse
+import random
+import timeit
+from typing import Callable, NamedTuple, Sequence
+
+from nerdtracker_client import intervals, util
+
+SIZES = [10**3, 10**4, 10**5]
+
+
+class IntervalResult(NamedTuple):
+    name: str
+    size: int
+    seconds: float
+
+    @property
+    def ns_per_item(self) -> float:
+        """The time taken per item of the list
+
+        Returns:
+            float: The time taken per item, in nanoseconds
+        """
+        return self.seconds / self.size * 1e9
+
+
+def make_data(size: int, seed: int = 0) -> list[int | None]:
+    """Creates a mostly increasing list of indices with Nones and drops, as
+    fed to identify_missing_values by SnapshotList.
+
+    Args:
+        size (int): The length of the list.
+        seed (int): Seed of the random number generator. Defaults to 0.
+
+    Returns:
+        list[int | None]: The list, starting with an integer.
+    """
+    rng = random.Random(seed)
+    data: list[int | None] = []
+    value = 0
+    for index in range(size):
+        value += rng.choice((1, 1, 1, 2))
+        data.append(None if index and rng.random() < 0.2 else value)
+    return data
+
+
+FUNCTIONS: dict[str, Callable[[list[int | None]], object]] = {
+    "util.identify_missing_values": util.identify_missing_values,
+    "intervals.missing_values": intervals.missing_values,
+    "util.identify_chunks_alternating_indices": (
+        util.identify_chunks_alternating_indices
+    ),
+    "intervals.run_boundaries": intervals.run_boundaries,
+    "util.identify_chunks": util.identify_chunks,
+    "intervals.chunks": intervals.chunks,
+}
+
+
+def run(sizes: Sequence[int] = SIZES, repeat: int = 5) -> list[IntervalResult]:
+    """Times every function on lists of every size.
+
+    Args:
+        sizes (Sequence[int]): The lengths of list to try.
+        repeat (int): Number of timings per case, the best is kept. Defaults
+            to 5.
+
+    Returns:
+        list[IntervalResult]: The best time of each function for each size.
+    """
+    results: list[IntervalResult] = []
+    for size in sizes:
+        data = make_data(size)
+        for name, function in FUNCTIONS.items():
+            seconds = min(
+                timeit.repeat(lambda: function(data), number=1, repeat=repeat)
+            )
+            results.append(IntervalResult(name, size, seconds))
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the benchmark from the command line and prints a table of results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'function':<42} {'size':>8} {'ms':>10} {'ns/item':>10}")
+    for result in run(args.sizes, args.repeat):
+        print(
+            f"{result.name:<42} {result.size:>8} "
+            + f"{result.seconds * 1e3:>10.3f} "
+            + f"{result.ns_per_item:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Measures how steady the capture cadence stays as the server slows down,
+with screenshots uploaded through the capture pipeline, against uploading
+them on the capture thread as the screenshotter used to.
+
+Run with ``python -m benchmarks.bench_pipeline``.
+"""
+
+import argparse
+import time
+from typing import NamedTuple, Sequence
+
+from nerdtracker_client.screenshots import Screenshotter, SyntheticScreen
+
+
+class PipelineResult(NamedTuple):
+    latency_ms: float
+    mode: str
+    interval_ms: float
+    max_interval_ms: float
+    uploaded: int
+    dropped: int
+
+
+def run(
+    latencies_ms: Sequence[float] = (0.0, 50.0, 200.0),
+    interval_ms: float = 20.0,
+    captures: int = 25,
+    upload_workers: int = 2,
+) -> list[PipelineResult]:
+    """Captures screenshots at a fixed interval while a simulated server
+    answers each upload after a latency.
+
+    Args:
+        latencies_ms (Sequence[float]): The server latencies to try, in
+            milliseconds.
+        interval_ms (float): The capture interval, in milliseconds. Defaults
+            to 20.
+        captures (int): Number of screenshots per case. Defaults to 25.
+        upload_workers (int): Number of upload workers of the pipeline.
+            Defaults to 2.
+
+    Returns:
+        list[PipelineResult]: The mean and largest interval between captures,
+            and the number of screenshots uploaded and dropped, of each case.
+    """
+    results: list[PipelineResult] = []
+    for latency_ms in latencies_ms:
+        for mode in ("synchronous", "pipeline"):
+            screenshotter = Screenshotter(
+                "http://localhost",
+                sct=SyntheticScreen(640, 360),
+                upload_workers=upload_workers,
+            )
+
+            def post(upload: object, latency: float = latency_ms) -> None:
+                time.sleep(latency / 1e3)
+
+            screenshotter.pipeline.upload = post
+            capture_times: list[float] = []
+            uploaded = 0
+            next_call = time.perf_counter()
+            for _ in range(captures):
+                time.sleep(max(next_call - time.perf_counter(), 0.0))
+                capture_times.append(time.perf_counter())
+                if mode == "synchronous":
+                    post(
+                        screenshotter.encode_upload(
+                            screenshotter.take_regions()
+                        )
+                    )
+                    uploaded += 1
+                else:
+                    screenshotter.pipeline.submit(screenshotter.take_regions())
+                next_call = max(
+                    next_call + interval_ms / 1e3, time.perf_counter()
+                )
+            screenshotter.__exit__(None, None, None)
+            metrics = screenshotter.pipeline.metrics()
+            if mode == "pipeline":
+                uploaded = metrics["upload"].processed
+            intervals = [
+                (second - first) * 1e3
+                for first, second in zip(capture_times, capture_times[1:])
+            ]
+            results.append(
+                PipelineResult(
+                    latency_ms,
+                    mode,
+                    sum(intervals) / len(intervals),
+                    max(intervals),
+                    uploaded,
+                    metrics["encode"].dropped + metrics["upload"].dropped,
+                )
+            )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the comparison from the command line and prints a table of
+    results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--latencies", nargs="+", type=float, default=[0.0, 50.0, 200.0]
+    )
+    parser.add_argument("--interval", type=float, default=20.0)
+    parser.add_argument("--captures", type=int, default=25)
+    parser.add_argument("--upload-workers", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'latency ms':>10} {'mode':<12} {'interval ms':>11} "
+        + f"{'max ms':>8} {'uploaded':>9} {'dropped':>8}"
+    )
+    for result in run(
+        args.latencies, args.interval, args.captures, args.upload_workers
+    ):
+        print(
+            f"{result.latency_ms:>10.0f} {result.mode:<12} "
+            + f"{result.interval_ms:>11.1f} {result.max_interval_ms:>8.1f} "
+            + f"{result.uploaded:>9} {result.dropped:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Simulates a session of menus, gameplay and scoreboards, with a server that
+is overloaded for a while, and counts the screenshots taken and uploaded at
+a fixed interval against an adaptive rate. Time is simulated, so the session
+runs in a few seconds.
+
+Run with ``python -m benchmarks.bench_rate``.
+"""
+
+import argparse
+from typing import NamedTuple, Sequence
+
+from nerdtracker_client.screenshots import (
+    AdaptiveRate,
+    ChangeDetector,
+    SyntheticScreen,
+)
+
+# The phases of the session: what is on screen, for how long in seconds, and
+# how long the server takes to answer an upload.
+SESSION = [
+    ("menu", 60.0, 0.1),
+    ("gameplay", 60.0, 0.1),
+    ("scoreboard", 20.0, 0.1),
+    ("menu", 60.0, 2.0),
+    ("scoreboard", 20.0, 0.1),
+]
+
+
+class RateResult(NamedTuple):
+    mode: str
+    captures: int
+    uploads: int
+    scoreboard_captures: int
+    longest_scoreboard_gap: float
+
+
+def run(
+    fixed_interval: float = 0.5,
+    min_interval: float = 0.25,
+    max_interval: float = 4.0,
+) -> list[RateResult]:
+    """Plays the session with each mode.
+
+    Args:
+        fixed_interval (float): The interval of the fixed mode, in seconds.
+            Defaults to 0.5.
+        min_interval (float): The minimum interval of the adaptive mode, in
+            seconds. Defaults to 0.25.
+        max_interval (float): The maximum interval of the adaptive mode, in
+            seconds. Defaults to 4.
+
+    Returns:
+        list[RateResult]: The screenshots taken and uploaded, those taken of
+            the scoreboard, and the longest time a scoreboard was on screen
+            without a screenshot, of each mode.
+    """
+    screens = {
+        "menu": SyntheticScreen(320, 180, seed=1),
+        "gameplay": SyntheticScreen(320, 180, seed=2),
+        "scoreboard": SyntheticScreen(320, 180, seed=3, pattern="scoreboard"),
+    }
+    static = {
+        name: screen.grab(screen.monitors[1])[:, :, :3]
+        for name, screen in screens.items()
+    }
+    results: list[RateResult] = []
+    for mode in ("fixed", "adaptive"):
+        rate = AdaptiveRate(min_interval, max_interval)
+        detector = ChangeDetector()
+        captures = uploads = scoreboard_captures = 0
+        longest_gap = 0.0
+        now = 0.0
+        phase_start = 0.0
+        for name, duration, latency in SESSION:
+            screen = screens[name]
+            last_capture = phase_start
+            while now < phase_start + duration:
+                if name == "gameplay":
+                    frame = screen.grab(screen.monitors[1])[:, :, :3]
+                else:
+                    frame = static[name]
+                captures += 1
+                if name == "scoreboard":
+                    scoreboard_captures += 1
+                    longest_gap = max(longest_gap, now - last_capture)
+                    last_capture = now
+                changed = detector.check([frame])
+                if changed:
+                    uploads += 1
+                    rate.record_upload(latency)
+                if mode == "fixed":
+                    now += fixed_interval
+                else:
+                    rate.record_frames([frame], changed)
+                    now += rate.interval
+            if name == "scoreboard":
+                longest_gap = max(
+                    longest_gap, phase_start + duration - last_capture
+                )
+            phase_start += duration
+        results.append(
+            RateResult(
+                mode, captures, uploads, scoreboard_captures, longest_gap
+            )
+        )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the simulation from the command line and prints a table of
+    results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixed-interval", type=float, default=0.5)
+    parser.add_argument("--min-interval", type=float, default=0.25)
+    parser.add_argument("--max-interval", type=float, default=4.0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'mode':<10} {'captures':>9} {'uploads':>8} "
+        + f"{'scoreboard':>11} {'max gap s':>10}"
+    )
+    for result in run(
+        args.fixed_interval, args.min_interval, args.max_interval
+    ):
+        print(
+            f"{result.mode:<10} {result.captures:>9} {result.uploads:>8} "
+            + f"{result.scoreboard_captures:>11} "
+            + f"{result.longest_scoreboard_gap:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measures how steady the capture cadence stays, and how many threads take
+them, when screenshots are taken by the timer thread started on every
+tick, against the asyncio scheduler.
+
+Run with ``python -m benchmarks.bench_scheduler``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import threading
+import time
+from typing import NamedTuple, Sequence
+
+from nerdtracker_client.screenshots import Screenshotter, SyntheticScreen
+
+
+class Response(NamedTuple):
+    """A response from the server, answering any upload"""
+
+    upload: object
+    text: str = "OK"
+
+
+class SchedulerResult(NamedTuple):
+    mode: str
+    captures: int
+    mean_lateness_ms: float
+    max_lateness_ms: float
+    capture_threads: int
+
+
+def run(interval_ms: float = 10.0, captures: int = 50) -> list[SchedulerResult]:
+    """Takes screenshots at a fixed interval with each scheduling mode.
+
+    Args:
+        interval_ms (float): The capture interval, in milliseconds. Defaults
+            to 10.
+        captures (int): Number of screenshots per mode. Defaults to 50.
+
+    Returns:
+        list[SchedulerResult]: How late the captures were, against their
+            deadline, and the number of threads that took them, of each mode.
+    """
+    results: list[SchedulerResult] = []
+    for mode in ("timer", "asyncio"):
+        screenshotter = Screenshotter(
+            "http://localhost",
+            time_interval=interval_ms / 1e3,
+            sct=SyntheticScreen(640, 360),
+        )
+        screenshotter.pipeline.upload = Response
+        capture_times: list[float] = []
+        thread_names: set[str] = set()
+        take_regions = screenshotter.take_regions
+
+        def take() -> list:
+            capture_times.append(time.monotonic())
+            thread_names.add(threading.current_thread().name)
+            return take_regions()
+
+        screenshotter.take_regions = take  # type: ignore[method-assign]
+        # The screenshotter prints every response.
+        with contextlib.redirect_stdout(io.StringIO()):
+            if mode == "timer":
+                screenshotter.next_call = (
+                    time.time() - screenshotter.time_interval
+                )
+                screenshotter.timer_start()
+                while len(capture_times) < captures:
+                    time.sleep(interval_ms / 1e3)
+                screenshotter.timer_stop()
+                capture_times = capture_times[:captures]
+            else:
+                asyncio.run(screenshotter.run_async(ticks=captures))
+            screenshotter.__exit__(None, None, None)
+
+        start = capture_times[0]
+        lateness = [
+            (captured - start - index * interval_ms / 1e3) * 1e3
+            for index, captured in enumerate(capture_times)
+        ]
+        results.append(
+            SchedulerResult(
+                mode,
+                len(capture_times),
+                statistics.mean(lateness),
+                max(lateness),
+                len(thread_names),
+            )
+        )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the benchmark from the command line and prints a table of results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interval-ms", type=float, default=10.0)
+    parser.add_argument("--captures", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'mode':<10} {'captures':>8} {'mean late ms':>13} "
+        + f"{'max late ms':>12} {'threads':>8}"
+    )
+    for result in run(args.interval_ms, args.captures):
+        print(
+            f"{result.mode:<10} {result.captures:>8} "
+            + f"{result.mean_lateness_ms:>13.2f} "
+            + f"{result.max_lateness_ms:>12.2f} "
+            + f"{result.capture_threads:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
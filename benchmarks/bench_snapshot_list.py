@@ -0,0 +1,126 @@
+"""Measures how SnapshotList.new_snapshot scales with the size of the lobby
+and the amount of OCR noise, using simulated scoreboards.
+
+Run with ``python -m benchmarks.bench_snapshot_list``.
+"""
+
+import argparse
+import statistics
+import time
+from typing import NamedTuple, Sequence
+
+from nerdtracker_client.player_list import Listing, SnapshotList
+from nerdtracker_client.player_list.synthetic import (
+    LobbySimulator,
+    OCRNoise,
+    reconciliation_accuracy,
+)
+
+LOBBY_SIZES = [12, 50, 100, 200]
+NOISE_RATES = [0.0, 0.02, 0.05, 0.1]
+
+
+class SweepResult(NamedTuple):
+    lobby_size: int
+    noise_rate: float
+    mean_latency_us: float
+    p95_latency_us: float
+    accuracy: float
+
+
+def run_case(
+    lobby_size: int,
+    noise_rate: float,
+    frames: int = 500,
+    visible_rows: int = 6,
+    seed: int = 0,
+) -> SweepResult:
+    """Feeds a simulated session through a SnapshotList and times each frame.
+
+    Args:
+        lobby_size (int): Number of players in the lobby.
+        noise_rate (float): Overall OCR noise rate, see OCRNoise.uniform.
+        frames (int): Number of frames to simulate. Defaults to 500.
+        visible_rows (int): Number of scoreboard rows on screen. Defaults to 6.
+        seed (int): Seed of the simulation. Defaults to 0.
+
+    Returns:
+        SweepResult: Latency per frame and final accuracy.
+    """
+    simulator = LobbySimulator(
+        lobby_size,
+        visible_rows,
+        join_rate=0.01,
+        leave_rate=0.01,
+        noise=OCRNoise.uniform(noise_rate),
+        seed=seed,
+    )
+    snapshot_list: SnapshotList[Listing] = SnapshotList(
+        [], max_list_length=lobby_size
+    )
+    latencies: list[float] = []
+    for frame in simulator.frames(frames):
+        listings = SnapshotList.listings_from_strings(frame.rows)
+        started = time.perf_counter()
+        snapshot_list.new_snapshot(listings)
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    return SweepResult(
+        lobby_size=lobby_size,
+        noise_rate=noise_rate,
+        mean_latency_us=statistics.fmean(latencies) * 1e6,
+        p95_latency_us=latencies[int(len(latencies) * 0.95)] * 1e6,
+        accuracy=reconciliation_accuracy(
+            snapshot_list, simulator.visible_lobby
+        ),
+    )
+
+
+def sweep(
+    lobby_sizes: Sequence[int] = LOBBY_SIZES,
+    noise_rates: Sequence[float] = NOISE_RATES,
+    frames: int = 500,
+) -> list[SweepResult]:
+    """Runs run_case for every combination of lobby size and noise rate.
+
+    Args:
+        lobby_sizes (Sequence[int]): The lobby sizes to try.
+        noise_rates (Sequence[float]): The noise rates to try.
+        frames (int): Number of frames per case. Defaults to 500.
+
+    Returns:
+        list[SweepResult]: One result per combination.
+    """
+    return [
+        run_case(lobby_size, noise_rate, frames)
+        for lobby_size in lobby_sizes
+        for noise_rate in noise_rates
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the sweep from the command line and prints a table of results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=LOBBY_SIZES)
+    parser.add_argument("--noise", type=float, nargs="+", default=NOISE_RATES)
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    print(f"{'size':>6} {'noise':>6} {'mean us':>10} {'p95 us':>10} {'acc':>6}")
+    for result in sweep(args.sizes, args.noise, args.frames):
+        print(
+            f"{result.lobby_size:>6} {result.noise_rate:>6.2f} "
+            + f"{result.mean_latency_us:>10.1f} "
+            + f"{result.p95_latency_us:>10.1f} "
+            + f"{result.accuracy:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
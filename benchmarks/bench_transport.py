@@ -0,0 +1,140 @@
+"""Compares the per-frame upload latency of a new connection per frame, as
+with the module-level requests.post, against the pooled transports, posting
+to a local stand-in server.
+
+Run with ``python -m benchmarks.bench_transport``.
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Iterable, NamedTuple, Sequence, cast
+
+import numpy as np
+import requests
+
+from nerdtracker_client.screenshots import (
+    Transport,
+    create_transport,
+    encode_frame,
+)
+from nerdtracker_client.screenshots.transport import TRANSPORTS
+from nerdtracker_client.screenshots.wire import CONTENT_TYPE, FramePayload
+from nerdtracker_client.tests.fixtures.server import StandInServer
+
+SIZES = {"region": (324, 384), "1080p": (1080, 1920)}
+
+
+class TransportResult(NamedTuple):
+    size: str
+    method: str
+    median_ms: float
+    p90_ms: float
+    connections: int
+
+
+def time_uploads(
+    post: Callable[[FramePayload], object], payload: FramePayload, uploads: int
+) -> list[float]:
+    """Times consecutive uploads.
+
+    Args:
+        post (Callable[[FramePayload], object]): Function posting a payload.
+        payload (FramePayload): The payload.
+        uploads (int): Number of uploads.
+
+    Returns:
+        list[float]: The time of each upload, in milliseconds
+    """
+    times = []
+    for _ in range(uploads):
+        started = time.perf_counter()
+        post(payload)
+        times.append((time.perf_counter() - started) * 1e3)
+    return times
+
+
+def run(
+    sizes: Sequence[str] = tuple(SIZES), uploads: int = 50
+) -> list[TransportResult]:
+    """Uploads frames of every size with every method.
+
+    Args:
+        sizes (Sequence[str]): The frame sizes to try, from SIZES.
+        uploads (int): Number of uploads per case. Defaults to 50.
+
+    Returns:
+        list[TransportResult]: The median and 90th percentile upload time,
+            and the number of connections opened, of each case.
+    """
+    headers = {"Content-Type": CONTENT_TYPE}
+    results: list[TransportResult] = []
+    for size in sizes:
+        frame = np.zeros((*SIZES[size], 3), dtype=np.uint8)
+        payload = encode_frame(frame)
+        methods: dict[str, Transport | None] = {"requests.post": None}
+        for name in TRANSPORTS:
+            try:
+                methods[name] = create_transport(name)
+            except ImportError:
+                continue
+        for method, transport in methods.items():
+            with StandInServer() as server:
+                if transport is None:
+                    times = time_uploads(
+                        lambda body: requests.post(
+                            server.address,
+                            data=cast(Iterable[bytes], body),
+                            headers=headers,
+                        ),
+                        payload,
+                        uploads,
+                    )
+                else:
+                    transport.warm_up(server.address)
+                    times = time_uploads(
+                        lambda body: transport.post(
+                            server.address, body, headers, 10.0
+                        ),
+                        payload,
+                        uploads,
+                    )
+                    transport.close()
+            results.append(
+                TransportResult(
+                    size,
+                    method,
+                    statistics.median(times),
+                    statistics.quantiles(times, n=10)[-1],
+                    server.connections,
+                )
+            )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the comparison from the command line and prints a table of
+    results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES))
+    parser.add_argument("--uploads", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'size':<7} {'method':<14} {'median ms':>10} {'p90 ms':>8} "
+        + f"{'connections':>12}"
+    )
+    for result in run(args.sizes or tuple(SIZES), args.uploads):
+        print(
+            f"{result.size:<7} {result.method:<14} {result.median_ms:>10.2f} "
+            + f"{result.p90_ms:>8.2f} {result.connections:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compares the binary frame wire format with the np.array_str body the
+screenshotter used to send: bytes on the wire and serialization time.
+
+Run with ``python -m benchmarks.bench_wire``.
+"""
+
+import argparse
+import timeit
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from nerdtracker_client.screenshots import (
+    SyntheticScreen,
+    decode_frame,
+    encode_frame,
+    frame_to_array,
+)
+
+RESOLUTIONS = {"1080p": (1920, 1080), "1440p": (2560, 1440)}
+
+
+class WireResult(NamedTuple):
+    resolution: str
+    method: str
+    wire_bytes: int
+    encode_ms: float
+    lossless: bool
+
+
+def run(
+    resolutions: Sequence[str] = tuple(RESOLUTIONS), repeat: int = 5
+) -> list[WireResult]:
+    """Serializes a synthetic screenshot of every resolution both ways.
+
+    Args:
+        resolutions (Sequence[str]): The resolutions to try, from RESOLUTIONS.
+        repeat (int): Number of timings per case, the best is kept. Defaults
+            to 5.
+
+    Returns:
+        list[WireResult]: The size and time of each method for each
+            resolution.
+    """
+    results: list[WireResult] = []
+    for resolution in resolutions:
+        width, height = RESOLUTIONS[resolution]
+        screen = SyntheticScreen(width, height)
+        # Same as Screenshotter.take_screenshot: BGRA with alpha sliced off.
+        screenshot = np.array(screen.grab(screen.monitors[1]))[:, :, :-1]
+
+        body = np.array_str(screenshot)
+        seconds = min(
+            timeit.repeat(
+                lambda: np.array_str(screenshot), number=1, repeat=repeat
+            )
+        )
+        results.append(
+            WireResult(resolution, "array_str", len(body), seconds * 1e3, False)
+        )
+
+        payload = encode_frame(screenshot)
+        seconds = min(
+            timeit.repeat(
+                lambda: encode_frame(screenshot), number=1, repeat=repeat
+            )
+        )
+        decoded = frame_to_array(decode_frame(payload.tobytes()))
+        results.append(
+            WireResult(
+                resolution,
+                "wire",
+                len(payload),
+                seconds * 1e3,
+                bool(np.array_equal(decoded, screenshot)),
+            )
+        )
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Runs the comparison from the command line and prints a table of
+    results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resolutions", nargs="+", choices=list(RESOLUTIONS), default=None
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'resolution':<11} {'method':<10} {'bytes':>12} "
+        + f"{'encode ms':>10} {'lossless':>9}"
+    )
+    for result in run(args.resolutions or tuple(RESOLUTIONS), args.repeat):
+        print(
+            f"{result.resolution:<11} {result.method:<10} "
+            + f"{result.wire_bytes:>12} {result.encode_ms:>10.3f} "
+            + f"{str(result.lossless):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
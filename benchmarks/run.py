@@ -0,0 +1,385 @@
+"""Runs the benchmark suite, compares every result against the stored
+baselines and flags regressions beyond a threshold. Runs fully offline.
+
+Run with ``python -m benchmarks.run``, or ``python -m benchmarks.run --save``
+to store the results as the new baselines.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, NamedTuple, Sequence
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+FIXTURE_HTML_PATH = (
+    Path(__file__).parent.parent
+    / "nerdtracker_client"
+    / "tests"
+    / "html"
+    / "joy_test_html.html"
+)
+
+Benchmark = Callable[[], object]
+
+
+class Case(NamedTuple):
+    """A benchmark: a name and a setup function returning what to time"""
+
+    name: str
+    setup: Callable[[], Benchmark]
+
+
+class CaseResult(NamedTuple):
+    name: str
+    seconds: float
+    baseline: float | None
+
+    @property
+    def ratio(self) -> float | None:
+        """How long the case took compared to its baseline
+
+        Returns:
+            float | None: The time divided by the baseline time, or None if
+                there is no baseline
+        """
+        if not self.baseline:
+            return None
+        return self.seconds / self.baseline
+
+    def regressed(self, threshold: float) -> bool:
+        """Whether the case is slower than its baseline beyond a threshold.
+
+        Args:
+            threshold (float): The tolerated slowdown, 0.25 for 25% slower.
+
+        Returns:
+            bool: Whether the case regressed
+        """
+        return (self.ratio is not None) and (self.ratio > 1.0 + threshold)
+
+
+def parse_tracker_html_case() -> Benchmark:
+    from bs4 import BeautifulSoup
+
+    from nerdtracker_client.scraper import parse_tracker_html
+
+    html = FIXTURE_HTML_PATH.read_bytes()
+    return lambda: parse_tracker_html(BeautifulSoup(html, "html.parser"))
+
+
+def new_snapshot_case(lobby_size: int) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        from nerdtracker_client.player_list import (
+            Listing,
+            LobbySimulator,
+            OCRNoise,
+            SnapshotList,
+        )
+
+        simulator = LobbySimulator(
+            lobby_size, noise=OCRNoise.uniform(0.02), seed=0
+        )
+        frames = [frame.rows for frame in simulator.frames(100)]
+
+        def session() -> None:
+            snapshot_list: SnapshotList[Listing] = SnapshotList(
+                [], max_list_length=lobby_size
+            )
+            for rows in frames:
+                snapshot_list.new_snapshot(
+                    SnapshotList.listings_from_strings(rows)
+                )
+
+        return session
+
+    return setup
+
+
+def listing_eq_matrix_case(size: int) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        import random
+
+        from nerdtracker_client.player_list import Listing
+        from nerdtracker_client.player_list.synthetic import (
+            random_player_name,
+        )
+
+        rng = random.Random(0)
+        listings = [Listing(random_player_name(rng)) for _ in range(size)]
+        return lambda: [
+            [first == second for second in listings] for first in listings
+        ]
+
+    return setup
+
+
+def interval_case(function_name: str, size: int) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        from benchmarks.bench_intervals import FUNCTIONS, make_data
+
+        data = make_data(size)
+        function = FUNCTIONS[function_name]
+        return lambda: function(data)
+
+    return setup
+
+
+def screenshot_case(encode: bool) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        from nerdtracker_client.screenshots import Screenshotter
+        from nerdtracker_client.screenshots.synthetic import SyntheticScreen
+
+        screenshotter = Screenshotter("http://localhost", sct=SyntheticScreen())
+        if not encode:
+            return screenshotter.take_screenshot
+        screenshot = screenshotter.take_screenshot()
+        return lambda: screenshotter.encode_screenshot(screenshot)
+
+    return setup
+
+
+def regions_case(preset: str, encode: bool) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        from nerdtracker_client.screenshots import Screenshotter
+        from nerdtracker_client.screenshots.synthetic import SyntheticScreen
+
+        screenshotter = Screenshotter(
+            "http://localhost", sct=SyntheticScreen(), regions=preset
+        )
+        if not encode:
+            # Released like after their upload, so the buffers are reused.
+            return lambda: screenshotter.release_screenshots(
+                screenshotter.take_regions()
+            )
+        screenshots = screenshotter.take_regions()
+        return lambda: screenshotter.encode_regions(screenshots)
+
+    return setup
+
+
+def change_detector_case() -> Benchmark:
+    from nerdtracker_client.screenshots import ChangeDetector, SyntheticScreen
+
+    screen = SyntheticScreen()
+    frames = [screen.grab(screen.monitors[1])[:, :, :-1] for _ in range(2)]
+    detector = ChangeDetector(threshold=255.0)
+    detector.check(frames[:1])
+    return lambda: detector.check(frames[1:])
+
+
+def tile_tracker_case() -> Benchmark:
+    from nerdtracker_client.screenshots import SyntheticScreen, TileTracker
+
+    screen = SyntheticScreen(pattern="scoreboard")
+    frames = [screen.grab(screen.monitors[1])[:, :, :-1] for _ in range(2)]
+    tracker = TileTracker(keyframe_interval=10**9)
+    tracker.update(frames[0], 1)
+    return lambda: tracker.update(frames[1], 2)
+
+
+def encoder_case(name: str) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        from nerdtracker_client.screenshots import (
+            SyntheticScreen,
+            create_encoder,
+        )
+        from nerdtracker_client.screenshots.encoders import encode
+
+        screen = SyntheticScreen(pattern="scoreboard")
+        screenshot = screen.grab(screen.monitors[1])[:, :, :-1]
+        encoder = create_encoder(name)
+        return lambda: encode(screenshot, encoder)
+
+    return setup
+
+
+def frame_ring_case(
+    pixel_format: str, downscale: int
+) -> Callable[[], Benchmark]:
+    def setup() -> Benchmark:
+        from nerdtracker_client.screenshots import FrameRing, SyntheticScreen
+
+        screen = SyntheticScreen()
+        source = screen.grab(screen.monitors[1])
+        ring = FrameRing(1080, 1920, 2, pixel_format, downscale)
+        return lambda: ring.release(ring.convert(source))
+
+    return setup
+
+
+CASES: list[Case] = [
+    Case("scraper.parse_tracker_html", parse_tracker_html_case),
+    *[
+        Case(f"snapshot_list.new_snapshot[{size}]", new_snapshot_case(size))
+        for size in (12, 50, 200)
+    ],
+    Case("listing.eq_matrix[50]", listing_eq_matrix_case(50)),
+    *[
+        Case(f"{name}[10000]", interval_case(name, 10_000))
+        for name in (
+            "util.identify_missing_values",
+            "util.identify_chunks",
+            "util.identify_chunks_alternating_indices",
+            "intervals.missing_values",
+        )
+    ],
+    Case("screenshotter.take_screenshot[1080p]", screenshot_case(False)),
+    Case("screenshotter.encode_screenshot[1080p]", screenshot_case(True)),
+    *[
+        Case(
+            f"screenshotter.{method}[{preset},1080p]",
+            regions_case(preset, encode),
+        )
+        for preset in ("scoreboard", "player_names")
+        for method, encode in (
+            ("take_regions", False),
+            ("encode_regions", True),
+        )
+    ],
+    Case("change_detector.check[1080p]", change_detector_case),
+    Case("tile_tracker.update[1080p]", tile_tracker_case),
+    *[
+        Case(f"encoders.encode[{name},1080p]", encoder_case(name))
+        for name in ("jpeg", "png", "zlib")
+    ],
+    *[
+        Case(
+            f"frame_ring.convert[{pixel_format}/{downscale},1080p]",
+            frame_ring_case(pixel_format, downscale),
+        )
+        for pixel_format, downscale in (("bgr", 1), ("gray", 1), ("gray", 2))
+    ],
+]
+
+
+def time_benchmark(benchmark: Benchmark, repeat: int = 5) -> float:
+    """Times a benchmark, calling it enough times per timing to last at least
+    0.2 seconds.
+
+    Args:
+        benchmark (Benchmark): The function to time.
+        repeat (int): Number of timings, the best is kept. Defaults to 5.
+
+    Returns:
+        float: The best time per call, in seconds.
+    """
+    timer = timeit.Timer(benchmark)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, float]:
+    """Reads the stored baselines.
+
+    Args:
+        path (Path): The baselines file. Defaults to benchmarks/baselines.json.
+
+    Returns:
+        dict[str, float]: The baseline time per call of each case, in seconds.
+            Empty if there is no baselines file.
+    """
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def save_baselines(
+    results: list[CaseResult], path: Path = BASELINES_PATH
+) -> None:
+    """Stores results as the new baselines, along with the machine they were
+    measured on. Baselines of cases that were not run are kept.
+
+    Args:
+        results (list[CaseResult]): The results to store.
+        path (Path): The baselines file. Defaults to benchmarks/baselines.json.
+    """
+    stored_results = load_baselines(path)
+    stored_results.update({result.name: result.seconds for result in results})
+    baselines = {
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "results": stored_results,
+    }
+    path.write_text(json.dumps(baselines, indent=4) + "\n")
+
+
+def run(
+    pattern: str = "",
+    repeat: int = 5,
+    baselines: dict[str, float] | None = None,
+) -> list[CaseResult]:
+    """Runs every case whose name contains a pattern.
+
+    Args:
+        pattern (str): Only cases whose name contains it are run. Defaults to
+            "", which runs every case.
+        repeat (int): Number of timings per case. Defaults to 5.
+        baselines (dict[str, float] | None): The baseline of each case.
+            Defaults to None, which reads the stored baselines.
+
+    Returns:
+        list[CaseResult]: The result of each case that was run.
+    """
+    baselines = load_baselines() if baselines is None else baselines
+    return [
+        CaseResult(
+            case.name,
+            time_benchmark(case.setup(), repeat),
+            baselines.get(case.name),
+        )
+        for case in CASES
+        if pattern in case.name
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Runs the suite from the command line and prints a table of results.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+
+    Returns:
+        int: The exit code, 1 if any case regressed.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-k", "--pattern", default="")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Tolerated slowdown against the baseline, 0.25 for 25%%.",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as baselines."
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat)
+    print(f"{'case':<48} {'time':>12} {'baseline':>12} {'ratio':>7}")
+    for result in results:
+        ratio = "" if result.ratio is None else f"{result.ratio:.2f}"
+        baseline = (
+            "" if result.baseline is None else f"{result.baseline * 1e6:.1f}us"
+        )
+        flag = "  REGRESSED" if result.regressed(args.threshold) else ""
+        print(
+            f"{result.name:<48} {result.seconds * 1e6:>10.1f}us "
+            + f"{baseline:>12} {ratio:>7}{flag}"
+        )
+
+    if args.save:
+        save_baselines(results)
+        print(f"Saved baselines to {BASELINES_PATH}")
+        return 0
+    return (
+        1 if any(result.regressed(args.threshold) for result in results) else 0
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,4 +3,5 @@ pytest_plugins = [
     "nerdtracker_client.tests.fixtures.scraper",
     "nerdtracker_client.tests.fixtures.stats",
     "nerdtracker_client.tests.fixtures.listing",
+    "nerdtracker_client.tests.fixtures.server",
 ]
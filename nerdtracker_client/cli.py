@@ -0,0 +1,460 @@
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypedDict,
+)
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list.enrichment import (
+    StatsFetcher,
+    create_tracker_fetcher,
+)
+
+OUTPUT_FORMATS = ["ndjson", "csv"]
+CSV_COLUMNS = ["id", "cached", "error"] + ntc_stats.STAT_COLUMNS
+
+
+class LookupRecord(TypedDict):
+    id: str
+    stats: ntc_stats.StatColumns | None
+    cached: bool
+    error: str | None
+
+
+def read_ids(
+    stream: Iterable[str], chunk_size: int = 100
+) -> Iterator[list[str]]:
+    """Reads activision user strings, one per line, in chunks. Blank lines
+    are skipped.
+
+    Args:
+        stream (Iterable[str]): The lines to read, such as an open file.
+        chunk_size (int): Maximum number of ids per chunk. Defaults to 100.
+
+    Yields:
+        list[str]: The ids of each chunk, in order.
+    """
+    chunk: list[str] = []
+    for line in stream:
+        user_id = line.strip()
+        if not user_id:
+            continue
+        chunk.append(user_id)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class RateLimiter:
+    """RateLimiter class spaces out calls from any number of threads so that
+    they do not exceed a given rate.
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        clock: Callable[[], float] | None = None,
+        sleep: Callable[[float], None] | None = None,
+    ) -> None:
+        """Constructor for the RateLimiter class
+
+        Args:
+            rate (float | None): Maximum number of calls per second, or None
+                for no limit.
+            clock (Callable[[], float] | None): Function returning the current
+                time in seconds. Defaults to None, which uses time.monotonic.
+            sleep (Callable[[float], None] | None): Function sleeping for a
+                number of seconds. Defaults to None, which uses time.sleep.
+        """
+        self.rate = rate
+        self.clock = clock if clock is not None else time.monotonic
+        self.sleep = sleep if sleep is not None else time.sleep
+        self._next_time = float("-inf")
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"RateLimiter({self.rate}/s)"
+
+    def wait(self) -> None:
+        """Blocks until the next call is allowed"""
+        if not self.rate:
+            return
+        with self._lock:
+            now = self.clock()
+            scheduled_time = max(self._next_time, now)
+            self._next_time = scheduled_time + 1.0 / self.rate
+        if scheduled_time > now:
+            self.sleep(scheduled_time - now)
+
+
+class StatsCache:
+    """StatsCache class keeps the stats already retrieved, optionally backed by
+    an append-only NDJSON file so that they survive between runs. Empty stats,
+    such as those returned when tracker.gg blocks the scraper, are never
+    cached, so they are retrieved again on the next run.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """Constructor for the StatsCache class
+
+        Args:
+            path (str | Path | None): The cache file, created if it does not
+                exist. Defaults to None, which only caches in memory.
+        """
+        self.path = Path(path) if path is not None else None
+        self.stats: dict[str, ntc_stats.StatColumns] = {}
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+        if self.path is None:
+            return
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as cache_file:
+                for line in cache_file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash while writing.
+                        continue
+                    if entry["stats"]:
+                        self.stats[entry["id"]] = entry["stats"]
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __repr__(self) -> str:
+        return f"StatsCache({self.path}, Entries: {len(self.stats)})"
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self.stats
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def get(self, user_id: str) -> ntc_stats.StatColumns | None:
+        """Returns the cached stats of an id.
+
+        Args:
+            user_id (str): The activision user string.
+
+        Returns:
+            ntc_stats.StatColumns | None: The stats, or None if not cached.
+        """
+        return self.stats.get(user_id)
+
+    def put(self, user_id: str, stats: ntc_stats.StatColumns) -> None:
+        """Caches the stats of an id, appending them to the cache file. Empty
+        stats are ignored.
+
+        Args:
+            user_id (str): The activision user string.
+            stats (ntc_stats.StatColumns): The stats.
+        """
+        if not stats:
+            return
+        with self._lock:
+            self.stats[user_id] = stats
+            if self._file is not None:
+                self._file.write(
+                    json.dumps({"id": user_id, "stats": stats}) + "\n"
+                )
+                self._file.flush()
+
+    def close(self) -> None:
+        """Closes the cache file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RecordWriter:
+    """RecordWriter class streams lookup records to a text stream, one per
+    line, as NDJSON or CSV.
+    """
+
+    def __init__(self, out: IO[str], output_format: str = "ndjson") -> None:
+        """Constructor for the RecordWriter class
+
+        Args:
+            out (IO[str]): The stream to write to.
+            output_format (str): Either "ndjson" or "csv". Defaults to
+                "ndjson".
+
+        Raises:
+            ValueError: If the output format is not supported.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.out = out
+        self.output_format = output_format
+        self._csv_writer: csv.DictWriter | None = None
+        if output_format == "csv":
+            self._csv_writer = csv.DictWriter(
+                out, CSV_COLUMNS, extrasaction="ignore"
+            )
+            self._csv_writer.writeheader()
+
+    def write(self, record: LookupRecord) -> None:
+        """Writes a record and flushes it, so that it can be consumed straight
+        away.
+
+        Args:
+            record (LookupRecord): The record to write.
+        """
+        if self._csv_writer is not None:
+            row: dict[str, Any] = {
+                "id": record["id"],
+                "cached": record["cached"],
+                "error": record["error"] or "",
+            }
+            row.update(record["stats"] or {})
+            self._csv_writer.writerow(row)
+        else:
+            self.out.write(json.dumps(record) + "\n")
+        self.out.flush()
+
+
+class LookupProgress:
+    """LookupProgress class counts lookups as they complete and periodically
+    reports progress and throughput.
+    """
+
+    def __init__(
+        self, stream: IO[str] | None = None, interval: float = 1.0
+    ) -> None:
+        """Constructor for the LookupProgress class
+
+        Args:
+            stream (IO[str] | None): The stream to report to, or None to not
+                report. Defaults to None.
+            interval (float): Minimum time, in seconds, between two reports.
+                Defaults to 1 second.
+        """
+        self.stream = stream
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.completed = 0
+        self.cached = 0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return f"LookupProgress({self.summary()})"
+
+    @property
+    def throughput(self) -> float:
+        """The number of lookups completed per second so far
+
+        Returns:
+            float: The number of lookups completed per second
+        """
+        elapsed = time.monotonic() - self.started
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """Summarizes the progress so far.
+
+        Returns:
+            str: The number of lookups completed, cached and failed, and the
+                throughput.
+        """
+        return (
+            f"{self.completed} done, {self.cached} cached, "
+            + f"{self.errors} errors, {self.throughput:.1f}/s"
+        )
+
+    def update(self, record: LookupRecord) -> None:
+        """Counts a completed lookup, reporting if the interval has passed.
+
+        Args:
+            record (LookupRecord): The record of the completed lookup.
+        """
+        self.completed += 1
+        self.cached += record["cached"]
+        self.errors += record["error"] is not None
+        now = time.monotonic()
+        if (self.stream is not None) and (
+            now - self.last_report >= self.interval
+        ):
+            self.last_report = now
+            print(self.summary(), file=self.stream, flush=True)
+
+    def finish(self) -> None:
+        """Reports the final summary"""
+        if self.stream is not None:
+            print(f"Finished: {self.summary()}", file=self.stream, flush=True)
+
+
+def lookup(
+    user_id: str,
+    fetch_stats: StatsFetcher,
+    cache: StatsCache,
+    rate_limiter: RateLimiter,
+) -> LookupRecord:
+    """Looks up the stats of a single id, from the cache if possible.
+
+    Args:
+        user_id (str): The activision user string.
+        fetch_stats (StatsFetcher): Function retrieving the stats of an id.
+        cache (StatsCache): The stats already retrieved.
+        rate_limiter (RateLimiter): Limits the rate of retrievals.
+
+    Returns:
+        LookupRecord: The outcome of the lookup.
+    """
+    stats = cache.get(user_id)
+    if stats is not None:
+        return LookupRecord(id=user_id, stats=stats, cached=True, error=None)
+    rate_limiter.wait()
+    try:
+        stats = fetch_stats(user_id)
+    except Exception as exc:
+        return LookupRecord(
+            id=user_id, stats=None, cached=False, error=repr(exc)
+        )
+    if stats:
+        cache.put(user_id, stats)
+    return LookupRecord(id=user_id, stats=stats, cached=False, error=None)
+
+
+def lookup_stream(
+    chunks: Iterable[list[str]],
+    fetch_stats: StatsFetcher,
+    concurrency: int = 8,
+    rate: float | None = None,
+    cache: StatsCache | None = None,
+) -> Iterator[LookupRecord]:
+    """Looks up the stats of ids, yielding each record as soon as it
+    completes. Ids are submitted as earlier lookups complete, keeping a
+    rolling window of twice the concurrency in flight, so the retrievals never
+    all wait for the slowest one. Only one chunk is held in memory at a time,
+    and ids repeated within a chunk are only looked up once.
+
+    Args:
+        chunks (Iterable[list[str]]): The ids, in chunks.
+        fetch_stats (StatsFetcher): Function retrieving the stats of an id.
+        concurrency (int): Maximum number of retrievals running at the same
+            time. Defaults to 8.
+        rate (float | None): Maximum number of retrievals per second, or None
+            for no limit. Defaults to None.
+        cache (StatsCache | None): The stats already retrieved. Defaults to
+            None, which caches in memory for this run only.
+
+    Yields:
+        LookupRecord: The outcome of each lookup, in order of completion.
+    """
+    cache = cache if cache is not None else StatsCache()
+    rate_limiter = RateLimiter(rate)
+    window = 2 * concurrency
+    pending: set[concurrent.futures.Future[LookupRecord]] = set()
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+        for chunk in chunks:
+            for user_id in dict.fromkeys(chunk):
+                if len(pending) >= window:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield future.result()
+                pending.add(
+                    executor.submit(
+                        lookup, user_id, fetch_stats, cache, rate_limiter
+                    )
+                )
+        for future in concurrent.futures.as_completed(pending):
+            yield future.result()
+
+
+def open_stream(
+    path: str, mode: str, standard_stream: IO[str]
+) -> ContextManager[IO[str]]:
+    """Opens a text file, or a standard stream that is left open on exit.
+
+    Args:
+        path (str): The path of the file, or - for the standard stream.
+        mode (str): Either "r" or "w".
+        standard_stream (IO[str]): The stream to use for -.
+
+    Returns:
+        ContextManager[IO[str]]: The stream, as a context manager
+    """
+    if path == "-":
+        return contextlib.nullcontext(standard_stream)
+    # The csv module handles line endings itself.
+    newline = "" if mode == "w" else None
+    return open(path, mode, encoding="utf-8", newline=newline)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Looks up the tracker.gg stats of activision user strings read from a
+    file or stdin, streaming one record per player to stdout.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+
+    Returns:
+        int: The exit code, 1 if any lookup failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog="nerdtracker-lookup",
+        description="Look up the tracker.gg stats of many players.",
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="File with one activision user string per line, or - for stdin.",
+    )
+    parser.add_argument("-o", "--output", default="-", help="Output file.")
+    parser.add_argument(
+        "-f", "--format", choices=OUTPUT_FORMATS, default="ndjson"
+    )
+    parser.add_argument("-j", "--concurrency", type=int, default=8)
+    parser.add_argument(
+        "-r", "--rate", type=float, default=None, help="Max lookups/second."
+    )
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--cache", default=None, help="NDJSON cache file.")
+    parser.add_argument("--cold-war", action="store_true")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    progress = LookupProgress(None if args.quiet else sys.stderr)
+    with (
+        open_stream(args.input, "r", sys.stdin) as in_file,
+        open_stream(args.output, "w", sys.stdout) as out_file,
+    ):
+        cache = StatsCache(args.cache)
+        try:
+            writer = RecordWriter(out_file, args.format)
+            for record in lookup_stream(
+                read_ids(in_file, args.chunk_size),
+                create_tracker_fetcher(args.cold_war),
+                concurrency=args.concurrency,
+                rate=args.rate,
+                cache=cache,
+            ):
+                writer.write(record)
+                progress.update(record)
+        finally:
+            progress.finish()
+            cache.close()
+    return 1 if progress.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
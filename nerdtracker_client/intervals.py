@@ -0,0 +1,158 @@
+from typing import Sequence, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+T = TypeVar("T")
+
+
+def none_mask(data: Sequence[object]) -> npt.NDArray[np.bool_]:
+    """Marks which items of a list are None.
+
+    Args:
+        data (Sequence[object]): The list of items.
+
+    Returns:
+        npt.NDArray[np.bool_]: True where the item is None, False elsewhere.
+    """
+    return np.fromiter(
+        (item is None for item in data), dtype=np.bool_, count=len(data)
+    )
+
+
+def run_length_encode(
+    mask: npt.NDArray[np.bool_],
+) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Splits a boolean mask into runs of equal values. For example,
+    >>> run_length_encode(np.array([False, False, True, False]))
+
+    returns the value, start and length of each of the three runs
+    >>> (array([False, True, False]), array([0, 2, 3]), array([2, 1, 1]))
+
+    Args:
+        mask (npt.NDArray[np.bool_]): The mask to encode.
+
+    Returns:
+        tuple[npt.NDArray[np.bool_], npt.NDArray[np.intp],
+            npt.NDArray[np.intp]]: The value, start index and length of each
+            run, in order.
+    """
+    if mask.size == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return mask[:0], empty, empty
+    starts = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+    starts = np.concatenate(([0], starts)).astype(np.intp)
+    lengths = np.diff(np.append(starts, mask.size)).astype(np.intp)
+    return mask[starts], starts, lengths
+
+
+def run_boundaries(data: Sequence[object]) -> npt.NDArray[np.intp]:
+    """Finds the indices where a list switches between None and other items.
+
+    Vectorized equivalent of util.identify_chunks_alternating_indices: the
+    indices alternate between the start of a run of Nones and the start of
+    the run of items following it.
+
+    Args:
+        data (Sequence[object]): The list of items, separated by None.
+
+    Returns:
+        npt.NDArray[np.intp]: The alternating indices.
+    """
+    values, starts, _ = run_length_encode(none_mask(data))
+    # The first run only counts if it is a run of Nones.
+    if values.size and not values[0]:
+        return starts[1:]
+    return starts
+
+
+def chunk_bounds(data: Sequence[object]) -> list[tuple[int, int]]:
+    """Finds the runs of consecutive items in a list separated by None.
+
+    Args:
+        data (Sequence[object]): The list of items, separated by None.
+
+    Returns:
+        list[tuple[int, int]]: The start and stop index of each run of items.
+    """
+    values, starts, lengths = run_length_encode(none_mask(data))
+    items = ~values
+    return list(zip(starts[items].tolist(), (starts + lengths)[items].tolist()))
+
+
+def chunks(data: Sequence[T]) -> list[list[T]]:
+    """Vectorized equivalent of util.identify_chunks.
+
+    Args:
+        data (Sequence[T]): The list of items, separated by None.
+
+    Returns:
+        list[list[T]]: The runs of consecutive items, without Nones.
+    """
+    return [list(data[start:stop]) for start, stop in chunk_bounds(data)]
+
+
+def find_gaps(values: npt.ArrayLike) -> npt.NDArray[np.int64]:
+    """Finds the integers skipped by a strictly increasing sequence.
+
+    Args:
+        values (npt.ArrayLike): The strictly increasing integers.
+
+    Returns:
+        npt.NDArray[np.int64]: The integers between the first and last value
+            that are not in the sequence, in increasing order.
+    """
+    array = np.asarray(values, dtype=np.int64)
+    steps = np.diff(array)
+    gaps = np.flatnonzero(steps > 1)
+    counts = steps[gaps] - 1
+    if counts.size == 0:
+        return np.empty(0, dtype=np.int64)
+    # Each gap expands to a range starting right after the value before it.
+    offsets = np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    return np.repeat(array[gaps] + 1, counts) + offsets
+
+
+def impute_missing(data: Sequence[int | None]) -> npt.NDArray[np.int64]:
+    """Fills in the Nones of a list, assuming each is one more than the value
+    before it.
+
+    Args:
+        data (Sequence[int | None]): The list of integers, with None as a
+            placeholder. Assumes the first value is not None.
+
+    Raises:
+        TypeError: If the first value in the list is None.
+
+    Returns:
+        npt.NDArray[np.int64]: The list with every None filled in.
+    """
+    if (len(data) == 0) or not isinstance(data[0], (int, np.integer)):
+        raise TypeError("First value in data must be an integer.")
+
+    present = ~none_mask(data)
+    indices = np.arange(len(data))
+    values = np.zeros(len(data), dtype=np.int64)
+    values[present] = [value for value in data if value is not None]
+    # Index of the last value that is not None, at or before each position.
+    last_present = np.maximum.accumulate(np.where(present, indices, 0))
+    return values[last_present] + (indices - last_present)
+
+
+def missing_values(data: Sequence[int | None]) -> npt.NDArray[np.int64]:
+    """Vectorized equivalent of util.identify_missing_values.
+
+    Args:
+        data (Sequence[int | None]): The monotonically increasing integers,
+            with None as a placeholder. Assumes the first value is not None.
+
+    Returns:
+        npt.NDArray[np.int64]: The missing values, in increasing order.
+    """
+    imputed = impute_missing(data)
+    smallest_value, largest_value = imputed[0], imputed[-1]
+    unique = np.unique(imputed)
+    in_range = (unique >= smallest_value) & (unique <= largest_value)
+    return find_gaps(unique[in_range])
@@ -0,0 +1,104 @@
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any, Callable
+
+
+class _LazyModule(ModuleType):
+    """_LazyModule class stands in for a module until one of its attributes is
+    first accessed, which imports the module and copies its attributes over.
+
+    Unlike importlib.util.LazyLoader, which is not thread-safe before Python
+    3.12, the first access is guarded by a lock, and the module is imported
+    through the regular import system, so threads touching it at the same
+    time all wait for it to be fully executed.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Constructor for the _LazyModule class
+
+        Args:
+            name (str): The absolute name of the module.
+        """
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attribute: str) -> Any:
+        """Imports the module, then returns one of its attributes. Only called
+        for attributes that were not copied over yet.
+
+        Args:
+            attribute (str): The name of the attribute.
+
+        Returns:
+            Any: The attribute of the module
+        """
+        with self._lazy_lock:
+            module = importlib.import_module(self.__name__)
+            # Copied, so later lookups skip __getattr__.
+            self.__dict__.update(vars(module))
+        return getattr(module, attribute)
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Imports a module without executing it until one of its attributes is
+    first accessed, so that heavy dependencies only load when they are used.
+    The first access is thread-safe.
+
+    Args:
+        name (str): The absolute name of the module, such as "numpy".
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found.
+
+    Returns:
+        ModuleType: The module, loaded on first attribute access.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if (spec is None) or (spec.loader is None):
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
+
+
+def lazy_exports(
+    package: str, exports: dict[str, list[str]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Creates the module-level __getattr__ and __dir__ of a package that
+    re-exports names from its submodules without importing them upfront
+    (PEP 562). A submodule is imported the first time one of its names is
+    accessed.
+
+    Args:
+        package (str): The name of the package, usually __name__.
+        exports (dict[str, list[str]]): The names to re-export, keyed by the
+            absolute name of the submodule defining them.
+
+    Returns:
+        tuple[Callable[[str], Any], Callable[[], list[str]]]: The __getattr__
+            and __dir__ functions of the package.
+    """
+    modules = {
+        name: module_name
+        for module_name, names in exports.items()
+        for name in names
+    }
+
+    def __getattr__(name: str) -> Any:
+        module_name = modules.get(name)
+        if module_name is None:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}"
+            )
+        value = getattr(importlib.import_module(module_name), name)
+        # Cached on the package, so later lookups skip __getattr__.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(modules))
+
+    return __getattr__, __dir__
@@ -1,2 +1,92 @@
-from nerdtracker_client.player_list.listing import EmptyListing, Listing
-from nerdtracker_client.player_list.snapshot_list import SnapshotList
+from typing import TYPE_CHECKING
+
+from nerdtracker_client.lazy import lazy_exports
+
+# Submodules are only imported when one of their names is first accessed, so
+# that importing the package does not load fuzzywuzzy and friends upfront.
+_EXPORTS = {
+    "nerdtracker_client.player_list.changes": [
+        "ListingAddition",
+        "ListingUpdate",
+        "SnapshotChanges",
+    ],
+    "nerdtracker_client.player_list.checkpoint": [
+        "SnapshotCheckpointer",
+        "read_checkpoint",
+        "restore",
+        "save_checkpoint",
+    ],
+    "nerdtracker_client.player_list.concurrent_snapshot_list": [
+        "ConcurrentSnapshotList",
+        "ListSnapshot",
+    ],
+    "nerdtracker_client.player_list.enrichment": [
+        "StatsEnricher",
+        "create_tracker_fetcher",
+    ],
+    "nerdtracker_client.player_list.listing": ["EmptyListing", "Listing"],
+    "nerdtracker_client.player_list.manager": [
+        "ListingIndex",
+        "ManagerMetrics",
+        "SnapshotListManager",
+    ],
+    "nerdtracker_client.player_list.recording": [
+        "RecordedFrame",
+        "ReplayResult",
+        "SnapshotRecorder",
+        "VirtualClock",
+        "read_recording",
+        "replay",
+    ],
+    "nerdtracker_client.player_list.snapshot_list": ["SnapshotList"],
+    "nerdtracker_client.player_list.synthetic": [
+        "LobbySimulator",
+        "OCRNoise",
+        "SyntheticFrame",
+        "reconciliation_accuracy",
+    ],
+}
+__all__ = [name for names in _EXPORTS.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from nerdtracker_client.player_list.changes import (
+        ListingAddition,
+        ListingUpdate,
+        SnapshotChanges,
+    )
+    from nerdtracker_client.player_list.checkpoint import (
+        SnapshotCheckpointer,
+        read_checkpoint,
+        restore,
+        save_checkpoint,
+    )
+    from nerdtracker_client.player_list.concurrent_snapshot_list import (
+        ConcurrentSnapshotList,
+        ListSnapshot,
+    )
+    from nerdtracker_client.player_list.enrichment import (
+        StatsEnricher,
+        create_tracker_fetcher,
+    )
+    from nerdtracker_client.player_list.listing import EmptyListing, Listing
+    from nerdtracker_client.player_list.manager import (
+        ListingIndex,
+        ManagerMetrics,
+        SnapshotListManager,
+    )
+    from nerdtracker_client.player_list.recording import (
+        RecordedFrame,
+        ReplayResult,
+        SnapshotRecorder,
+        VirtualClock,
+        read_recording,
+        replay,
+    )
+    from nerdtracker_client.player_list.snapshot_list import SnapshotList
+    from nerdtracker_client.player_list.synthetic import (
+        LobbySimulator,
+        OCRNoise,
+        SyntheticFrame,
+        reconciliation_accuracy,
+    )
@@ -0,0 +1,75 @@
+from typing import NamedTuple
+
+from nerdtracker_client.player_list.listing import Listing
+
+
+class ListingAddition(NamedTuple):
+    """A listing that was added to the SnapshotList, and where it landed"""
+
+    position: int
+    listing: Listing
+
+
+class ListingUpdate(NamedTuple):
+    """A listing already in the SnapshotList whose identifier changed"""
+
+    listing: Listing
+    old_id: str | int | None
+    new_id: str | int | None
+    full_match_upgrade: bool
+
+
+class SnapshotChanges:
+    """SnapshotChanges class is a compact change-set describing what a single
+    call to SnapshotList.new_snapshot did to the list. Consumers can use it to
+    do work proportional to the number of changes rather than to the length of
+    the list.
+    """
+
+    def __init__(
+        self,
+        added: list[ListingAddition] | None = None,
+        updated: list[ListingUpdate] | None = None,
+        dropped: list[Listing] | None = None,
+    ) -> None:
+        """Constructor for the SnapshotChanges class
+
+        Args:
+            added (list[ListingAddition] | None): Listings added to the list,
+                with their position in the list after the update. Defaults to
+                None, which is treated as an empty list.
+            updated (list[ListingUpdate] | None): Listings whose identifier
+                changed, either through a fuzzy update or a full match
+                upgrade. Defaults to None, which is treated as an empty list.
+            dropped (list[Listing] | None): Listings removed from the list.
+                Defaults to None, which is treated as an empty list.
+        """
+        self.added: list[ListingAddition] = added or []
+        self.updated: list[ListingUpdate] = updated or []
+        self.dropped: list[Listing] = dropped or []
+
+    def __repr__(self) -> str:
+        out_str = (
+            "SnapshotChanges("
+            + f"Added: {len(self.added)}, "
+            + f"Updated: {len(self.updated)}, "
+            + f"Dropped: {len(self.dropped)}"
+            + ")"
+        )
+        return out_str
+
+    def __len__(self) -> int:
+        """Returns the total number of changes
+
+        Returns:
+            int: The number of added, updated and dropped listings combined
+        """
+        return len(self.added) + len(self.updated) + len(self.dropped)
+
+    def __bool__(self) -> bool:
+        """Whether the change-set contains any changes
+
+        Returns:
+            bool: Whether anything changed
+        """
+        return len(self) > 0
@@ -0,0 +1,268 @@
+import concurrent.futures
+import json
+import os
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable
+
+from nerdtracker_client.player_list.changes import SnapshotChanges
+from nerdtracker_client.player_list.listing import EmptyListing, Listing
+from nerdtracker_client.player_list.snapshot_list import SnapshotList
+
+# File layout: a header followed by the zlib-compressed JSON state of the list.
+# An empty listing is stored as null, any other as
+# [listing_id, full_match, listing_time, last_seen, stats, votes], where votes
+# holds the OCR readings behind the consensus id, see Listing.observe, as a
+# [length, readings, [character counts of each position]] list per length.
+# Checkpoints written before votes were saved have no votes.
+MAGIC = b"NTCK\x01"
+
+
+def checkpoint_state(snapshot_list: SnapshotList) -> dict[str, Any]:
+    """Captures the state of a SnapshotList as plain data.
+
+    Args:
+        snapshot_list (SnapshotList): The list to capture.
+
+    Returns:
+        dict[str, Any]: The state of the list, ready to be serialized.
+    """
+    listings: list[list[Any] | None] = []
+    # Copied first, since the list may be updated by another thread.
+    for listing in tuple(snapshot_list.list):
+        if listing.is_empty:
+            listings.append(None)
+            continue
+        listings.append(
+            [
+                listing.listing_id,
+                listing.full_match,
+                listing.listing_time,
+                listing.last_seen,
+                listing.stats,
+                # Copied, since the votes keep changing while the state is
+                # written in the background.
+                [
+                    [
+                        length,
+                        count,
+                        [
+                            dict(votes)
+                            for votes in listing.id_votes.get(length, [])
+                        ],
+                    ]
+                    for length, count in listing.length_votes.items()
+                ],
+            ]
+        )
+    return {
+        "saved_at": snapshot_list.now(),
+        "max_list_length": snapshot_list.max_list_length,
+        "max_list_age": snapshot_list.max_list_age,
+        "listings": listings,
+    }
+
+
+def write_checkpoint(state: dict[str, Any], path: str | Path) -> None:
+    """Writes a captured state to disk atomically.
+
+    The state is written to a temporary file next to the checkpoint, which
+    then replaces it, so a crash while writing leaves the previous checkpoint
+    intact.
+
+    Args:
+        state (dict[str, Any]): The state, as returned by checkpoint_state.
+        path (str | Path): The checkpoint file.
+    """
+    path = Path(path)
+    data = MAGIC + zlib.compress(
+        json.dumps(state, separators=(",", ":")).encode("utf-8")
+    )
+    temporary_path = path.with_name(path.name + ".tmp")
+    with open(temporary_path, "wb") as temporary_file:
+        temporary_file.write(data)
+        temporary_file.flush()
+        os.fsync(temporary_file.fileno())
+    os.replace(temporary_path, path)
+
+
+def save_checkpoint(snapshot_list: SnapshotList, path: str | Path) -> None:
+    """Writes the state of a SnapshotList to a checkpoint file.
+
+    Args:
+        snapshot_list (SnapshotList): The list to save.
+        path (str | Path): The checkpoint file.
+    """
+    write_checkpoint(checkpoint_state(snapshot_list), path)
+
+
+def read_checkpoint(path: str | Path) -> dict[str, Any]:
+    """Reads the state saved in a checkpoint file.
+
+    Args:
+        path (str | Path): The checkpoint file.
+
+    Raises:
+        ValueError: If the file is not a valid checkpoint.
+
+    Returns:
+        dict[str, Any]: The saved state.
+    """
+    data = Path(path).read_bytes()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a snapshot list checkpoint.")
+    try:
+        return json.loads(zlib.decompress(data[len(MAGIC) :]))
+    except (zlib.error, ValueError) as error:
+        raise ValueError(f"{path} is a corrupted checkpoint.") from error
+
+
+def restore(
+    path: str | Path,
+    list_factory: Callable[..., SnapshotList] = SnapshotList,
+    **list_kwargs: Any,
+) -> SnapshotList:
+    """Recreates a SnapshotList from a checkpoint file.
+
+    The listings keep the time they were last observed, so those that were
+    not observed within max_list_age, counting the time the client was not
+    running, are dropped straight away.
+
+    Args:
+        path (str | Path): The checkpoint file.
+        list_factory (Callable[..., SnapshotList]): Creates the new list from
+            an initial snapshot and the keyword arguments. Defaults to
+            SnapshotList.
+        **list_kwargs (Any): Keyword arguments passed to list_factory, such as
+            clock. max_list_length and max_list_age default to the values
+            saved in the checkpoint.
+
+    Returns:
+        SnapshotList: The restored list.
+    """
+    state = read_checkpoint(path)
+    list_kwargs.setdefault("max_list_length", state["max_list_length"])
+    list_kwargs.setdefault("max_list_age", state["max_list_age"])
+    snapshot_list = list_factory([], **list_kwargs)
+
+    listings: list[Listing] = []
+    for entry in state["listings"]:
+        if entry is None:
+            listings.append(EmptyListing())
+            continue
+        listing_id, full_match, listing_time, last_seen, stats = entry[:5]
+        listing = Listing(listing_id, full_match, stats, listing_time)
+        listing.last_seen = last_seen
+        for length, count, position_votes in entry[5] if entry[5:] else []:
+            listing.length_votes[length] = count
+            listing.id_votes[length] = [
+                Counter(votes) for votes in position_votes
+            ]
+        listings.append(listing)
+    snapshot_list.add_list(listings)
+    snapshot_list.expire()
+    return snapshot_list
+
+
+class SnapshotCheckpointer:
+    """SnapshotCheckpointer class watches a SnapshotList and saves it to a
+    checkpoint file every few changes, so that a restarted client can resume
+    with the listings and stats it had. The state is captured on the thread
+    applying the snapshot, and compressed and written on a background thread.
+    """
+
+    def __init__(
+        self,
+        snapshot_list: SnapshotList,
+        path: str | Path,
+        every_changes: int = 10,
+    ) -> None:
+        """Constructor for the SnapshotCheckpointer class
+
+        Args:
+            snapshot_list (SnapshotList): The SnapshotList to watch.
+            path (str | Path): The checkpoint file.
+            every_changes (int): Number of added, updated and dropped listings
+                after which a checkpoint is saved. Defaults to 10.
+        """
+        self.snapshot_list = snapshot_list
+        self.path = Path(path)
+        self.every_changes = every_changes
+        self.unsaved_changes = 0
+        self.checkpoints = 0
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(1)
+        self._last_write: concurrent.futures.Future | None = None
+        snapshot_list.add_listener(self.on_changes)
+
+    def __repr__(self) -> str:
+        out_str = (
+            "SnapshotCheckpointer("
+            + f"{self.path}, "
+            + f"Checkpoints: {self.checkpoints}, "
+            + f"Unsaved: {self.unsaved_changes}"
+            + ")"
+        )
+        return out_str
+
+    def __enter__(self) -> "SnapshotCheckpointer":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Upon closing, saves a last checkpoint and stops watching the list.
+
+        Args:
+            exc_type (type[BaseException] | None): Exception type, unused
+            exc_value (BaseException | None): Exception value, unused
+            traceback (TracebackType | None): Traceback, unused
+        """
+        self.close()
+
+    def on_changes(self, changes: SnapshotChanges) -> None:
+        """Counts the changes of a snapshot, saving a checkpoint once there
+        are enough of them.
+
+        Args:
+            changes (SnapshotChanges): The change-set of the latest snapshot.
+        """
+        self.unsaved_changes += len(changes)
+        if self.unsaved_changes >= self.every_changes:
+            self.save()
+
+    def save(self) -> concurrent.futures.Future:
+        """Captures the state of the list and writes it in the background.
+
+        Returns:
+            concurrent.futures.Future: The pending write.
+        """
+        state = checkpoint_state(self.snapshot_list)
+        self.unsaved_changes = 0
+        with self._lock:
+            self.checkpoints += 1
+            self._last_write = self._executor.submit(
+                write_checkpoint, state, self.path
+            )
+            return self._last_write
+
+    def wait(self) -> None:
+        """Blocks until the last checkpoint has been written"""
+        with self._lock:
+            last_write = self._last_write
+        if last_write is not None:
+            last_write.result()
+
+    def close(self) -> None:
+        """Stops watching the list, then saves a last checkpoint if there are
+        unsaved changes and waits for it to be written."""
+        self.snapshot_list.remove_listener(self.on_changes)
+        if self.unsaved_changes > 0:
+            self.save()
+        self._executor.shutdown(wait=True)
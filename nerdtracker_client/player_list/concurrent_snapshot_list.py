@@ -0,0 +1,212 @@
+import functools
+import threading
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, TypeVar, cast
+
+from nerdtracker_client.player_list.changes import SnapshotChanges
+from nerdtracker_client.player_list.listing import Listing
+from nerdtracker_client.player_list.snapshot_list import SnapshotList
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ListSnapshot(NamedTuple):
+    """An immutable, consistent view of a ConcurrentSnapshotList. The
+    change-set is the one of the write that published it, which is empty for
+    writes other than snapshots."""
+
+    version: int
+    listings: tuple[Listing, ...]
+    changes: SnapshotChanges
+
+
+def _writer(method: F, skip_if_unchanged: bool = False) -> F:
+    """Wraps a SnapshotList method so that it runs as a copy-on-write writer.
+
+    The outermost writer takes the write lock, runs the method and then
+    publishes the result. Nested writers, such as new_snapshot calling
+    drop_list, only run the method.
+
+    Args:
+        method (F): The SnapshotList method to wrap.
+        skip_if_unchanged (bool): Whether to skip publishing when the method
+            returns None or an empty change-set. Defaults to False.
+
+    Returns:
+        F: The wrapped method.
+    """
+
+    @functools.wraps(method)
+    def wrapper(
+        self: "ConcurrentSnapshotList", *args: Any, **kwargs: Any
+    ) -> Any:
+        with self._write_lock:
+            self._write_depth += 1
+            result = None
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                self._write_depth -= 1
+            if self._write_depth > 0:
+                return result
+            if skip_if_unchanged and not result:
+                return result
+            self._publish(
+                result
+                if isinstance(result, SnapshotChanges)
+                else SnapshotChanges()
+            )
+            return result
+
+    return cast(F, wrapper)
+
+
+class ConcurrentSnapshotList(SnapshotList):
+    """ConcurrentSnapshotList class is a SnapshotList that can be written to by
+    one thread while other threads read it. Writers are serialized by a lock
+    and are the only ones to touch the live listings. After each write, the
+    listings are published as an immutable tuple with a single assignment, so
+    readers get a consistent snapshot without taking a lock. Published
+    listings are copied on write: a writer replaces a listing it updates with
+    a copy instead of mutating it, so the listings readers hold, including
+    those of the published change-set, never change afterwards.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Constructor for the ConcurrentSnapshotList class. Takes the same
+        arguments as SnapshotList.
+
+        Args:
+            *args (Any): Positional arguments passed to SnapshotList.
+            **kwargs (Any): Keyword arguments passed to SnapshotList.
+        """
+        self._write_lock = threading.RLock()
+        # Nothing is published until the list is fully initialized.
+        self._write_depth = 1
+        self._published_ids: frozenset[int] = frozenset()
+        self._published = ListSnapshot(-1, (), SnapshotChanges())
+        try:
+            super().__init__(*args, **kwargs)
+        finally:
+            self._write_depth = 0
+        self._publish(SnapshotChanges())
+
+    def __repr__(self) -> str:
+        return (
+            super()
+            .__repr__()
+            .replace("SnapshotList(", "ConcurrentSnapshotList(", 1)
+        )
+
+    def _publish(self, changes: SnapshotChanges) -> None:
+        """Publishes the current listings to readers, bumping the version.
+
+        Args:
+            changes (SnapshotChanges): The change-set of the write.
+        """
+        listings = tuple(self.list)
+        self._published_ids = frozenset(map(id, listings))
+        self._published = ListSnapshot(
+            self._published.version + 1, listings, changes
+        )
+
+    def _is_shared(self, listing: Listing) -> bool:
+        """Whether a listing was published, and must be copied on write.
+
+        Args:
+            listing (Listing): A listing of the list.
+
+        Returns:
+            bool: Whether the listing is in the published listings
+        """
+        # The published tuple keeps its listings alive, so their ids are not
+        # reused.
+        return id(listing) in self._published_ids
+
+    def _set_list(self, new_list: Iterable[Listing]) -> bool:
+        """Replaces the listings, see SnapshotList.list.
+
+        Args:
+            new_list (Iterable[Listing]): The listings to keep.
+
+        Returns:
+            bool: Whether the listings differ from the published ones
+        """
+        cast(Callable, cast(property, SnapshotList.list).fset)(self, new_list)
+        published = self._published.listings
+        return len(self.list) != len(published) or any(
+            mine is not theirs for mine, theirs in zip(self.list, published)
+        )
+
+    def snapshot(self) -> ListSnapshot:
+        """Returns the latest published state of the list. Never blocks.
+
+        Returns:
+            ListSnapshot: The version, listings and change-set that were last
+                published.
+        """
+        return self._published
+
+    @property
+    def version(self) -> int:
+        """The version of the latest published state. Increases by one every
+        time a write is published.
+
+        Returns:
+            int: The version of the latest published state
+        """
+        return self._published.version
+
+    def changed_since(self, version: int) -> bool:
+        """Whether anything was published after the given version.
+
+        Args:
+            version (int): The version the reader last looked at.
+
+        Returns:
+            bool: Whether the list changed since that version
+        """
+        return self._published.version != version
+
+    def __contains__(self, listing: Listing) -> bool:
+        """Checks whether the fed listing is in the published listings.
+
+        Args:
+            listing (Listing): The listing to check.
+
+        Returns:
+            bool: Whether the listing is in the published listings.
+        """
+        return listing in self._published.listings
+
+    def __iter__(self) -> Iterator[Listing]:
+        """Iterates over the published listings.
+
+        Returns:
+            Iterator[Listing]: An iterator over the published listings
+        """
+        return iter(self._published.listings)
+
+    def __len__(self) -> int:
+        """Returns the number of published listings.
+
+        Returns:
+            int: The number of published listings
+        """
+        return len(self._published.listings)
+
+    new_snapshot = _writer(SnapshotList.new_snapshot, skip_if_unchanged=True)
+    feed_strings = _writer(SnapshotList.feed_strings, skip_if_unchanged=True)
+    flush = _writer(SnapshotList.flush, skip_if_unchanged=True)
+    drop = _writer(SnapshotList.drop)
+    drop_list = _writer(SnapshotList.drop_list)
+    insert = _writer(SnapshotList.insert)
+    add_list = _writer(SnapshotList.add_list)
+    replace = _writer(SnapshotList.replace)
+    expire = _writer(SnapshotList.expire, skip_if_unchanged=True)
+    attach_stats = _writer(SnapshotList.attach_stats, skip_if_unchanged=True)
+    # Defined last so that the property does not shadow the builtin list in
+    # the annotations of the methods above.
+    list = property(
+        cast(property, SnapshotList.list).fget,
+        cast(Callable, _writer(_set_list, skip_if_unchanged=True)),
+    )
@@ -0,0 +1,271 @@
+import concurrent.futures
+import threading
+from types import TracebackType
+from typing import Callable, Optional
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list.changes import SnapshotChanges
+from nerdtracker_client.player_list.concurrent_snapshot_list import (
+    ConcurrentSnapshotList,
+)
+from nerdtracker_client.player_list.listing import Listing
+from nerdtracker_client.player_list.snapshot_list import SnapshotList
+
+StatsFetcher = Callable[[str], Optional[ntc_stats.StatColumns]]
+
+
+def create_tracker_fetcher(cold_war_flag: bool = False) -> StatsFetcher:
+    """Creates a function that retrieves stats from tracker.gg, sharing a
+    single scraper between calls.
+
+    Args:
+        cold_war_flag (bool): Flag to indicate whether to retrieve stats from
+            Cold War or Modern Warfare. Defaults to False, which retrieves
+            stats from Modern Warfare.
+
+    Returns:
+        StatsFetcher: A function taking an activision user string and returning
+            its stats.
+    """
+    # Imported here so that player_list does not pull in the scraper
+    # dependencies unless stats are actually fetched.
+    from nerdtracker_client.scraper import (
+        create_scraper,
+        parse_tracker_html,
+        retrieve_page_from_tracker,
+    )
+
+    scraper = create_scraper()
+
+    def fetch_stats(activision_user_string: str) -> ntc_stats.StatColumns:
+        soup = retrieve_page_from_tracker(
+            scraper, activision_user_string, cold_war_flag=cold_war_flag
+        )
+        return parse_tracker_html(soup)
+
+    return fetch_stats
+
+
+class StatsEnricher:
+    """StatsEnricher class watches a SnapshotList and fills in the stats of its
+    listings in the background. Fetches are dispatched without blocking the
+    thread feeding the SnapshotList, attached to the listings when they
+    arrive, and cancelled when the listings they were meant for are dropped.
+    Fetches that fail or come back empty, such as when tracker.gg blocks the
+    scraper, are neither cached nor attached, and are retried while a listing
+    still needs them, up to max_attempts fetches per listing id.
+
+    Stats are attached from the threads running the fetches, through
+    SnapshotList.attach_stats. A ConcurrentSnapshotList attaches them under
+    its write lock and publishes them as a new version, so it can be fed by
+    another thread. A plain SnapshotList must not be written to while stats
+    may arrive.
+    """
+
+    def __init__(
+        self,
+        snapshot_list: SnapshotList,
+        fetch_stats: StatsFetcher | None = None,
+        max_workers: int = 4,
+        max_attempts: int = 3,
+    ) -> None:
+        """Constructor for the StatsEnricher class
+
+        Args:
+            snapshot_list (SnapshotList): The SnapshotList to watch.
+            fetch_stats (StatsFetcher | None): Function retrieving the stats of
+                a listing id. Defaults to None, which retrieves them from
+                tracker.gg.
+            max_workers (int): Maximum number of fetches running at the same
+                time. Defaults to 4.
+            max_attempts (int): Maximum number of fetches of a listing id
+                whose stats could not be retrieved. Defaults to 3.
+        """
+        self.snapshot_list = snapshot_list
+        self.fetch_stats = (
+            fetch_stats if fetch_stats is not None else create_tracker_fetcher()
+        )
+        self.max_attempts = max_attempts
+        self.stats_cache: dict[str, ntc_stats.StatColumns] = {}
+        self.failures: dict[str, int] = {}
+        self._closed = False
+        self._pending: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        snapshot_list.add_listener(self.on_changes)
+        for listing in tuple(snapshot_list.list):
+            self.request(listing)
+
+    def __repr__(self) -> str:
+        out_str = (
+            "StatsEnricher("
+            + f"Pending: {len(self._pending)}, "
+            + f"Cached: {len(self.stats_cache)}, "
+            + f"Failed: {len(self.failures)}"
+            + ")"
+        )
+        return out_str
+
+    def __enter__(self) -> "StatsEnricher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Upon closing, stops watching the list and cancels pending fetches.
+
+        Args:
+            exc_type (type[BaseException] | None): Exception type, unused
+            exc_value (BaseException | None): Exception value, unused
+            traceback (TracebackType | None): Traceback, unused
+        """
+        self.close()
+
+    @property
+    def pending(self) -> set[str]:
+        """The listing ids whose stats are being fetched
+
+        Returns:
+            set[str]: The listing ids whose stats are being fetched
+        """
+        with self._lock:
+            return set(self._pending)
+
+    def close(self) -> None:
+        """Stops watching the list and cancels every pending fetch"""
+        self.snapshot_list.remove_listener(self.on_changes)
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def on_changes(self, changes: SnapshotChanges) -> None:
+        """Dispatches and cancels fetches based on a change-set.
+
+        Args:
+            changes (SnapshotChanges): The change-set of the latest snapshot.
+        """
+        live_keys = {
+            str(listing.listing_id)
+            for listing in tuple(self.snapshot_list.list)
+            if not listing.is_empty
+        }
+        for listing in changes.dropped:
+            self.cancel(str(listing.listing_id), live_keys)
+
+        for update in changes.updated:
+            self.cancel(str(update.old_id), live_keys)
+            # A full match is the authoritative id, so its stats replace the
+            # ones carried over from the fuzzy id once they arrive.
+            self.request(update.listing, force=update.full_match_upgrade)
+
+        for addition in changes.added:
+            self.request(addition.listing)
+
+    def request(self, listing: Listing, force: bool = False) -> None:
+        """Dispatches a fetch for a listing, unless it already has stats, or
+        its stats could not be retrieved in max_attempts fetches.
+
+        Args:
+            listing (Listing): The listing to fetch the stats of.
+            force (bool): Whether to fetch even if the listing already has
+                stats. Defaults to False.
+        """
+        if listing.is_empty or (listing.has_stats and not force):
+            return
+
+        key = str(listing.listing_id)
+        with self._lock:
+            if key in self.stats_cache:
+                listing.stats = self.stats_cache[key]
+                return
+            if (
+                self._closed
+                or (key in self._pending)
+                or (self.failures.get(key, 0) >= self.max_attempts)
+            ):
+                return
+            future = self._executor.submit(self.fetch_stats, key)
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._on_done(key, done))
+
+    def cancel(self, key: str, live_keys: set[str] | None = None) -> None:
+        """Cancels the fetch for a listing id, if no listing still needs it.
+
+        Args:
+            key (str): The listing id whose fetch to cancel.
+            live_keys (set[str] | None): The listing ids currently in the list.
+                Defaults to None, which always cancels.
+        """
+        if (live_keys is not None) and (key in live_keys):
+            return
+        with self._lock:
+            future = self._pending.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def _on_done(self, key: str, future: concurrent.futures.Future) -> None:
+        """Attaches the stats of a finished fetch to the matching listings, or
+        retries it if it failed or came back empty.
+
+        Args:
+            key (str): The listing id that was fetched.
+            future (concurrent.futures.Future): The finished fetch.
+        """
+        with self._lock:
+            if self._pending.get(key) is not future:
+                # Cancelled, or superseded by another fetch.
+                return
+            if future.cancelled():
+                del self._pending[key]
+                return
+
+        stats = None if future.exception() is not None else future.result()
+        if not stats:
+            needed = any(
+                str(listing.listing_id) == key for listing in self._listings()
+            )
+            with self._lock:
+                if self._pending.get(key) is not future:
+                    return
+                attempts = self.failures.get(key, 0) + 1
+                self.failures[key] = attempts
+                if (
+                    self._closed
+                    or (not needed)
+                    or (attempts >= self.max_attempts)
+                ):
+                    del self._pending[key]
+                    return
+                # Stays pending while it is retried.
+                retry = self._executor.submit(self.fetch_stats, key)
+                self._pending[key] = retry
+            retry.add_done_callback(lambda done: self._on_done(key, done))
+            return
+
+        with self._lock:
+            self.stats_cache[key] = stats
+            self.failures.pop(key, None)
+        self.snapshot_list.attach_stats(key, stats)
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def _listings(self) -> tuple[Listing, ...]:
+        """The listings of the list, as seen from the threads running the
+        fetches.
+
+        Returns:
+            tuple[Listing, ...]: The published listings of a
+                ConcurrentSnapshotList, or a copy of the listings of a plain
+                SnapshotList
+        """
+        if isinstance(self.snapshot_list, ConcurrentSnapshotList):
+            return self.snapshot_list.snapshot().listings
+        return tuple(self.snapshot_list.list)
@@ -1,9 +1,15 @@
 import time
-from typing import Optional
-
-from fuzzywuzzy import fuzz
+from collections import Counter
+from typing import TYPE_CHECKING, Optional
 
 import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.lazy import lazy_module
+
+if TYPE_CHECKING:
+    from fuzzywuzzy import fuzz
+else:
+    # Only loaded when listings are first compared.
+    fuzz = lazy_module("fuzzywuzzy.fuzz")
 
 # Constants
 SIMILARITY_THRESHOLD = 80
@@ -18,6 +24,7 @@ class Listing:
         listing_id: str | int,
         full_match: bool = False,
         stats: Optional[ntc_stats.StatColumns] = None,
+        listing_time: float | None = None,
     ) -> None:
         """Constructor for the Listing class
 
@@ -25,12 +32,19 @@ class Listing:
             listing_id (str | int): The identifier for the listing
             full_match (bool): Whether the listing id is a full match or not
             stats (Optional[ntc_stats.StatColumns]): The stats for the listing.
+            listing_time (float | None): The time the listing was created, or
+                None to use the current time. Defaults to None.
         """
 
         self.listing_id: str | int | None = listing_id
         self.full_match = full_match
         self.stats = stats
-        self.listing_time = time.time()
+        self.listing_time = (
+            time.time() if listing_time is None else listing_time
+        )
+        self.last_seen = self.listing_time
+        self.id_votes: dict[int, list[Counter[str]]] = {}
+        self.length_votes: Counter[int] = Counter()
 
     def __repr__(self) -> str:
         """Returns a string representation of the listing object. Purposefully
@@ -94,9 +108,14 @@ class Listing:
     def update(self, other: "Listing") -> None:
         """Updates the listing with another listing
 
-        Given another listing, transforms the current listing into the other
-        listing. If the current listing is a full match, then this function
-        does nothing.
+        Given another reading of the same listing, adds it to the evidence
+        for the listing. If the current listing is a full match, then this
+        function does nothing. If the other listing is a full match, or its
+        id is not a string, its id replaces the current one outright.
+        Otherwise, its id only counts as one more OCR reading, and the listing
+        id becomes the consensus of every reading, see observe. Stats already
+        attached to the current listing are kept unless the other listing
+        brings its own.
 
         Args:
             other (Listing): The other listing
@@ -104,11 +123,68 @@ class Listing:
         if self.full_match:
             return
 
-        self.listing_id = other.listing_id
-        self.stats = other.stats
+        if other.full_match or not isinstance(other.listing_id, str):
+            self.listing_id = other.listing_id
+        else:
+            self.observe(other.listing_id)
+        if other.stats is not None:
+            self.stats = other.stats
         self.full_match = other.full_match
         self.listing_time = other.listing_time
 
+    def observe(self, observed_id: str) -> None:
+        """Adds an OCR reading of the listing id to the evidence for it.
+
+        Each reading votes for its length, and for the character at each of
+        its positions among the readings of the same length, so that a reading
+        that inserts or drops a character does not shift the votes of the
+        others. The listing id is the consensus of the votes, and only changes
+        length or a character when another one has strictly more votes, so
+        readings that disagree evenly do not make it flip.
+
+        Args:
+            observed_id (str): The listing id as read by the OCR unit
+        """
+        # An id set as an int, such as a full match, is read as a string.
+        current_id = "" if self.listing_id is None else str(self.listing_id)
+        # The votes of the current id are only counted once the listing is
+        # read a second time, since most listings never are.
+        if not self.length_votes:
+            self.__add_votes(current_id)
+        self.__add_votes(observed_id)
+
+        length = len(current_id)
+        best_length, best_count = self.length_votes.most_common(1)[0]
+        if best_count > self.length_votes[length]:
+            length = best_length
+        if length not in self.id_votes:
+            # Set outright, by a full match, and not read since.
+            return
+
+        characters: list[str] = []
+        for position, votes in enumerate(self.id_votes[length]):
+            character = (
+                current_id[position] if length == len(current_id) else ""
+            )
+            best_character, best_count = votes.most_common(1)[0]
+            if best_count > votes[character]:
+                character = best_character
+            characters.append(character)
+        self.listing_id = "".join(characters)
+
+    def __add_votes(self, observed_id: str) -> None:
+        """Counts the votes of an OCR reading of the listing id.
+
+        Args:
+            observed_id (str): The listing id as read by the OCR unit
+        """
+        self.length_votes[len(observed_id)] += 1
+        votes = self.id_votes.setdefault(
+            len(observed_id), [Counter() for _ in observed_id]
+        )
+        for position, character in enumerate(observed_id):
+            votes[position][character] += 1
+
     def update_time(self, new_time: float | None) -> None:
         """Updates the listing time.
 
@@ -121,6 +197,16 @@ class Listing:
 
         self.listing_time = time.time() if new_time is None else new_time
 
+    def mark_seen(self, new_time: float | None = None) -> None:
+        """Marks the listing as observed in a snapshot.
+
+        Args:
+            new_time (float | None): The time the listing was observed, or None
+                to use the current time. Defaults to None.
+        """
+
+        self.last_seen = time.time() if new_time is None else new_time
+
     def update_id_full_match(self, new_id: str | int) -> None:
         """Updates the listing id if a full match has been found
 
@@ -142,8 +228,14 @@ class Listing:
         """
         if self.listing_id is None:
             return EmptyListing()
-        new_listing = Listing(self.listing_id, self.full_match)
+        new_listing = Listing(self.listing_id, self.full_match, self.stats)
         new_listing.listing_time = self.listing_time
+        new_listing.last_seen = self.last_seen
+        new_listing.id_votes = {
+            length: [votes.copy() for votes in position_votes]
+            for length, position_votes in self.id_votes.items()
+        }
+        new_listing.length_votes = self.length_votes.copy()
         return new_listing
 
     @property
@@ -178,6 +270,9 @@ class EmptyListing(Listing):
         self.stats = None
         self.full_match = False
         self.listing_time = 0.0
+        self.last_seen = 0.0
+        self.id_votes = {}
+        self.length_votes = Counter()
 
     def __repr__(self) -> str:
         """Returns a string representation of the listing object. Purposefully
@@ -233,6 +328,15 @@ class EmptyListing(Listing):
         """
         pass
 
+    def mark_seen(self, new_time: float | None = None) -> None:
+        """Marks the listing as observed in a snapshot.
+
+        Args:
+            new_time (float | None): For EmptyListing, this does nothing. This
+                is just here to override the parent class method.
+        """
+        pass
+
     def update_id_full_match(self, new_id: str | int) -> None:
         """Updates the listing id if a full match has been found
 
@@ -0,0 +1,376 @@
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator, Sequence, TypedDict
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list.changes import SnapshotChanges
+from nerdtracker_client.player_list.listing import Listing
+from nerdtracker_client.player_list.snapshot_list import SnapshotList
+
+
+class ManagerMetrics(TypedDict):
+    """Aggregate metrics across every list of a SnapshotListManager"""
+
+    lists: int
+    listings: int
+    shared_listings: int
+    shared_stats: int
+    snapshots: int
+    skipped_frames: int
+    added: int
+    updated: int
+    dropped: int
+    evicted_lists: int
+
+
+class ListingIndex:
+    """ListingIndex class maps listing ids to a single shared listing and a
+    single shared stats object, so that a player seen in several lists is
+    only resolved, fetched and stored once. The index never updates the
+    listings it keeps: lists get copies of the shared listings, and the
+    stats, which are never updated in place, are shared as they are.
+    """
+
+    def __init__(self) -> None:
+        """Constructor for the ListingIndex class"""
+        self.listings: dict[str, Listing] = {}
+        self.stats: dict[str, ntc_stats.StatColumns] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"ListingIndex(Listings: {len(self.listings)}, "
+            + f"Stats: {len(self.stats)})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def __contains__(self, listing_id: object) -> bool:
+        return str(listing_id) in self.stats
+
+    def share(self, listing: Listing) -> ntc_stats.StatColumns | None:
+        """Shares stats between a listing and the index, without updating the
+        listing.
+
+        If the listing has stats and there are no shared stats for its id,
+        they become the shared stats. The listing becomes the shared listing
+        for its id if there is none, or if the consensus of the shared
+        listing moved to another id.
+
+        Args:
+            listing (Listing): The listing to share stats with.
+
+        Returns:
+            ntc_stats.StatColumns | None: The shared stats for the id of the
+                listing, if any, for the caller to attach
+        """
+        if listing.is_empty:
+            return None
+        key = str(listing.listing_id)
+        shared = self.listings.get(key)
+        if (shared is None) or (str(shared.listing_id) != key):
+            self.listings[key] = listing
+        return self.__shared_stats(key, listing)
+
+    def intern(self, listing: Listing) -> Listing:
+        """Returns a copy of the shared listing for the id of a listing.
+
+        The copy of a listing already kept by a list carries its consensus
+        and stats, so that membership checks find it before comparing ids.
+        Being a copy, it is only ever updated by the list it is added to.
+        Otherwise the new listing is returned, and only becomes the shared
+        listing for its id once a list reports it added, see share.
+
+        Args:
+            listing (Listing): A listing read from a snapshot, not yet in a
+                list.
+
+        Returns:
+            Listing: The listing to add to a list, with the shared stats
+        """
+        if listing.is_empty:
+            return listing
+        key = str(listing.listing_id)
+        shared = self.listings.get(key)
+        # The id of the shared listing changes as its consensus does.
+        if (shared is not None) and (str(shared.listing_id) == key):
+            stats = listing.stats
+            listing = shared.copy()
+            if stats is not None:
+                listing.stats = stats
+        stats = self.__shared_stats(key, listing)
+        if stats is not None:
+            listing.stats = stats
+        return listing
+
+    def __shared_stats(
+        self, key: str, listing: Listing
+    ) -> ntc_stats.StatColumns | None:
+        """Returns the shared stats for an id, making those of the listing
+        the shared stats if there are none.
+
+        Args:
+            key (str): The id of the listing.
+            listing (Listing): The listing.
+
+        Returns:
+            ntc_stats.StatColumns | None: The shared stats for the id, if any
+        """
+        if listing.has_stats:
+            return self.stats.setdefault(key, listing.stats)  # type: ignore
+        return self.stats.get(key)
+
+    def prune(self, live_keys: set[str]) -> int:
+        """Drops the entries of the ids no list keeps anymore.
+
+        Args:
+            live_keys (set[str]): The listing ids still kept by a list.
+
+        Returns:
+            int: The number of ids dropped.
+        """
+        dead_keys = (self.listings.keys() | self.stats.keys()) - live_keys
+        for key in dead_keys:
+            self.listings.pop(key, None)
+            self.stats.pop(key, None)
+        return len(dead_keys)
+
+
+class SnapshotListManager:
+    """SnapshotListManager class owns several named SnapshotLists, such as one
+    per team or per monitor, routes snapshots to them by key, and shares
+    listings and stats between them through a single ListingIndex. To bound
+    memory, the least recently used lists are evicted once the total number of
+    listings goes over budget, along with the index entries no other list
+    needs.
+
+    Listings passed to new_snapshot are replaced by a copy of the shared
+    listing for their id, so that they start from the consensus reached in
+    other lists while each list updates only its own listings. The listings
+    built by feed_strings only share stats. Stats are attached through
+    SnapshotList.attach_stats, so that a ConcurrentSnapshotList copies and
+    publishes the listings it updates.
+    """
+
+    def __init__(
+        self,
+        max_total_listings: int = 240,
+        list_factory: Callable[..., SnapshotList] = SnapshotList,
+        **list_kwargs: Any,
+    ) -> None:
+        """Constructor for the SnapshotListManager class
+
+        Args:
+            max_total_listings (int): Budget for the number of listings kept
+                across every list. Defaults to 240, 20 full lists.
+            list_factory (Callable[..., SnapshotList]): Creates a new list from
+                an initial snapshot and list_kwargs. Defaults to SnapshotList.
+            **list_kwargs (Any): Keyword arguments passed to list_factory.
+        """
+        self.max_total_listings = max_total_listings
+        self.list_factory = list_factory
+        self.list_kwargs = list_kwargs
+        self.index = ListingIndex()
+        self.lists: OrderedDict[Hashable, SnapshotList] = OrderedDict()
+        self.__listeners: dict[Hashable, Callable[[SnapshotChanges], None]] = {}
+        self.snapshots = 0
+        self.evicted_lists = 0
+        self.added = 0
+        self.updated = 0
+        self.dropped = 0
+
+    def __repr__(self) -> str:
+        out_str = (
+            "SnapshotListManager(\n"
+            + f"\tNo. Lists: {len(self.lists)},\n"
+            + f"\tNo. Listings: {self.total_listings},\n"
+            + f"\tMax Listings: {self.max_total_listings},\n"
+            + ")"
+        )
+        return out_str
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.lists
+
+    def __getitem__(self, key: Hashable) -> SnapshotList:
+        return self.lists[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.lists)
+
+    def __len__(self) -> int:
+        return len(self.lists)
+
+    @property
+    def total_listings(self) -> int:
+        """The number of listings kept across every list
+
+        Returns:
+            int: The number of listings kept across every list
+        """
+        return sum(
+            len(snapshot_list.list) for snapshot_list in self.lists.values()
+        )
+
+    def get(self, key: Hashable) -> SnapshotList:
+        """Returns the list for a key, creating it if needed, and marks it as
+        the most recently used.
+
+        Args:
+            key (Hashable): The key of the list.
+
+        Returns:
+            SnapshotList: The list for the key.
+        """
+        if key in self.lists:
+            self.lists.move_to_end(key)
+            return self.lists[key]
+        snapshot_list = self.list_factory([], **self.list_kwargs)
+        listener = functools.partial(self.__on_changes, snapshot_list)
+        snapshot_list.add_listener(listener)
+        self.__listeners[key] = listener
+        self.lists[key] = snapshot_list
+        return snapshot_list
+
+    def remove(self, key: Hashable) -> SnapshotList:
+        """Removes the list for a key.
+
+        Args:
+            key (Hashable): The key of the list.
+
+        Returns:
+            SnapshotList: The list that was removed.
+        """
+        snapshot_list = self.lists.pop(key)
+        snapshot_list.remove_listener(self.__listeners.pop(key))
+        self.index.prune(self.__live_keys())
+        return snapshot_list
+
+    def new_snapshot(
+        self, key: Hashable, new_snapshot: list[Listing]
+    ) -> SnapshotChanges:
+        """Routes a snapshot to the list for a key.
+
+        Args:
+            key (Hashable): The key of the list.
+            new_snapshot (list[Listing]): The snapshot to apply.
+
+        Returns:
+            SnapshotChanges: The change-set of the snapshot.
+        """
+        changes = self.get(key).new_snapshot(
+            [self.index.intern(listing) for listing in new_snapshot]
+        )
+        self.__enforce_budget()
+        return changes
+
+    def feed_strings(
+        self, key: Hashable, snapshot: Sequence[str | None]
+    ) -> SnapshotChanges | None:
+        """Routes the raw strings of an OCR frame to the list for a key.
+
+        Args:
+            key (Hashable): The key of the list.
+            snapshot (Sequence[str | None]): The rows of the frame.
+
+        Returns:
+            SnapshotChanges | None: The change-set of the snapshot that was
+                applied, or None if no snapshot was applied.
+        """
+        changes = self.get(key).feed_strings(snapshot)
+        self.__enforce_budget()
+        return changes
+
+    def attach_stats(
+        self, listing_id: str | int, stats: ntc_stats.StatColumns
+    ) -> int:
+        """Makes stats the shared stats for a listing id, and attaches them to
+        every listing with that id across every list.
+
+        Args:
+            listing_id (str | int): The listing id the stats belong to.
+            stats (ntc_stats.StatColumns): The stats.
+
+        Returns:
+            int: The number of listings the stats were attached to.
+        """
+        key = str(listing_id)
+        self.index.stats[key] = stats
+        return sum(
+            len(snapshot_list.attach_stats(key, stats))
+            for snapshot_list in self.lists.values()
+        )
+
+    def metrics(self) -> ManagerMetrics:
+        """Returns aggregate metrics across every list.
+
+        Returns:
+            ManagerMetrics: The aggregate metrics.
+        """
+        return ManagerMetrics(
+            lists=len(self.lists),
+            listings=self.total_listings,
+            shared_listings=len(self.index.listings),
+            shared_stats=len(self.index),
+            snapshots=self.snapshots,
+            skipped_frames=sum(
+                snapshot_list.skipped_frames
+                for snapshot_list in self.lists.values()
+            ),
+            added=self.added,
+            updated=self.updated,
+            dropped=self.dropped,
+            evicted_lists=self.evicted_lists,
+        )
+
+    def __on_changes(
+        self, snapshot_list: SnapshotList, changes: SnapshotChanges
+    ) -> None:
+        """Shares the stats of the listings that entered or changed in a list.
+
+        Args:
+            snapshot_list (SnapshotList): The list the change-set is from.
+            changes (SnapshotChanges): The change-set of the list.
+        """
+        self.snapshots += 1
+        listings = [addition.listing for addition in changes.added] + [
+            update.listing for update in changes.updated
+        ]
+        for listing in listings:
+            stats = self.index.share(listing)
+            if (stats is not None) and (listing.stats is not stats):
+                snapshot_list.attach_stats(str(listing.listing_id), stats)
+        self.added += len(changes.added)
+        self.updated += len(changes.updated)
+        self.dropped += len(changes.dropped)
+
+    def __live_keys(self) -> set[str]:
+        """The ids of the listings kept across every list.
+
+        Returns:
+            set[str]: The ids of the listings kept across every list
+        """
+        return {
+            str(listing.listing_id)
+            for snapshot_list in self.lists.values()
+            for listing in snapshot_list.list
+            if not listing.is_empty
+        }
+
+    def __enforce_budget(self) -> None:
+        """Evicts the least recently used lists while over budget. The most
+        recently used list is never evicted. The index is also pruned once it
+        holds more ids than the budget, since listings dropped from lists that
+        are not evicted leave their entries behind."""
+        total_listings = self.total_listings
+        while (total_listings > self.max_total_listings) and (
+            len(self.lists) > 1
+        ):
+            key = next(iter(self.lists))
+            total_listings -= len(self.remove(key).list)
+            self.evicted_lists += 1
+        if (
+            max(len(self.index.listings), len(self.index))
+            > self.max_total_listings
+        ):
+            self.index.prune(self.__live_keys())
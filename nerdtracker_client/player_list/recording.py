@@ -0,0 +1,296 @@
+import argparse
+import struct
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, Iterator, NamedTuple, Sequence
+
+from nerdtracker_client.player_list.listing import Listing
+from nerdtracker_client.player_list.snapshot_list import SnapshotList
+
+# File layout: a header, then one record per frame. A record is the frame
+# timestamp and row count, followed by each row as its length and UTF-8 bytes.
+# A length of NONE_ROW marks a row the OCR unit could not read.
+MAGIC = b"NTSR\x01"
+FRAME_HEADER = struct.Struct("<dH")
+ROW_HEADER = struct.Struct("<H")
+NONE_ROW = 0xFFFF
+
+
+class RecordedFrame(NamedTuple):
+    """A single OCR snapshot read back from a recording"""
+
+    timestamp: float
+    rows: tuple[str | None, ...]
+
+
+class SnapshotRecorder:
+    """SnapshotRecorder class appends the row strings of every OCR snapshot,
+    along with when it was taken, to a compact binary file. Recordings can be
+    replayed through a SnapshotList with replay.
+    """
+
+    def __init__(self, path: str | Path, flush_every: int = 1) -> None:
+        """Constructor for the SnapshotRecorder class
+
+        Args:
+            path (str | Path): The file to append to. Created if it does not
+                exist.
+            flush_every (int): Number of frames to buffer before flushing to
+                disk. Defaults to 1, which flushes every frame.
+        """
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.frames = 0
+        self._file: BinaryIO = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def __repr__(self) -> str:
+        return f"SnapshotRecorder({self.path}, Frames: {self.frames})"
+
+    def __enter__(self) -> "SnapshotRecorder":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Upon closing, flushes and closes the file.
+
+        Args:
+            exc_type (type[BaseException] | None): Exception type, unused
+            exc_value (BaseException | None): Exception value, unused
+            traceback (TracebackType | None): Traceback, unused
+        """
+        self.close()
+
+    def record(
+        self, rows: Sequence[str | None], timestamp: float | None = None
+    ) -> None:
+        """Appends a snapshot to the recording.
+
+        Args:
+            rows (Sequence[str | None]): The rows of the snapshot, as read by
+                the OCR unit.
+            timestamp (float | None): When the snapshot was taken, or None to
+                use the current time. Defaults to None.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        chunks = [FRAME_HEADER.pack(timestamp, len(rows))]
+        for row in rows:
+            if row is None:
+                chunks.append(ROW_HEADER.pack(NONE_ROW))
+                continue
+            encoded = row.encode("utf-8")[: NONE_ROW - 1]
+            chunks.append(ROW_HEADER.pack(len(encoded)))
+            chunks.append(encoded)
+        self._file.write(b"".join(chunks))
+        self.frames += 1
+        if self.frames % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the file"""
+        if not self._file.closed:
+            self._file.flush()
+            self._file.close()
+
+
+def read_recording(path: str | Path) -> Iterator[RecordedFrame]:
+    """Reads the snapshots of a recording back, in order.
+
+    A frame cut short at the end of the file, as left behind by a crash while
+    recording, is ignored.
+
+    Args:
+        path (str | Path): The recording to read.
+
+    Raises:
+        ValueError: If the file is not a snapshot recording.
+
+    Yields:
+        RecordedFrame: The snapshots of the recording.
+    """
+    data = Path(path).read_bytes()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a snapshot recording.")
+
+    offset = len(MAGIC)
+    while offset + FRAME_HEADER.size <= len(data):
+        timestamp, row_count = FRAME_HEADER.unpack_from(data, offset)
+        position = offset + FRAME_HEADER.size
+        rows: list[str | None] = []
+        for _ in range(row_count):
+            if position + ROW_HEADER.size > len(data):
+                return
+            (length,) = ROW_HEADER.unpack_from(data, position)
+            position += ROW_HEADER.size
+            if length == NONE_ROW:
+                rows.append(None)
+                continue
+            if position + length > len(data):
+                return
+            rows.append(
+                data[position : position + length].decode("utf-8", "replace")
+            )
+            position += length
+        offset = position
+        yield RecordedFrame(timestamp, tuple(rows))
+
+
+class VirtualClock:
+    """VirtualClock class is a clock that only moves when told to, so that
+    recordings can be replayed as fast as possible while the SnapshotList sees
+    the original timing.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        """Constructor for the VirtualClock class
+
+        Args:
+            start (float): The initial time, in seconds. Defaults to 0.
+        """
+        self.current_time = start
+
+    def __repr__(self) -> str:
+        return f"VirtualClock({self.current_time})"
+
+    def __call__(self) -> float:
+        """Returns the current virtual time
+
+        Returns:
+            float: The current virtual time, in seconds
+        """
+        return self.current_time
+
+    def advance(self, seconds: float) -> None:
+        """Moves the clock forward.
+
+        Args:
+            seconds (float): How far to move the clock, in seconds.
+        """
+        self.current_time += seconds
+
+    def set(self, new_time: float) -> None:
+        """Moves the clock to the given time.
+
+        Args:
+            new_time (float): The new time, in seconds.
+        """
+        self.current_time = new_time
+
+
+class ReplayResult(NamedTuple):
+    """The outcome of replaying a recording"""
+
+    frames: int
+    applied_frames: int
+    skipped_frames: int
+    elapsed: float
+    recorded_duration: float
+    snapshot_list: SnapshotList
+
+    @property
+    def frames_per_second(self) -> float:
+        """How many frames were replayed per second of wall time
+
+        Returns:
+            float: The number of frames replayed per second
+        """
+        return self.frames / self.elapsed if self.elapsed > 0 else float("inf")
+
+    @property
+    def speedup(self) -> float:
+        """How much faster than real time the recording was replayed
+
+        Returns:
+            float: The recorded duration divided by the replay duration
+        """
+        if self.elapsed <= 0:
+            return float("inf")
+        return self.recorded_duration / self.elapsed
+
+
+def replay(path: str | Path, **list_kwargs: Any) -> ReplayResult:
+    """Replays a recording through a new SnapshotList as fast as possible.
+
+    The SnapshotList runs on a VirtualClock following the recorded timestamps,
+    so expiry and debouncing behave as they did while recording.
+
+    Args:
+        path (str | Path): The recording to replay.
+        **list_kwargs (Any): Keyword arguments passed to SnapshotList, such as
+            max_list_length or debounce_window.
+
+    Returns:
+        ReplayResult: Throughput figures and the final SnapshotList.
+    """
+    frames = list(read_recording(path))
+    start_time = frames[0].timestamp if frames else 0.0
+    clock = VirtualClock(start_time)
+    snapshot_list: SnapshotList[Listing] = SnapshotList(
+        [], clock=clock, **list_kwargs
+    )
+
+    applied_frames = 0
+    started = time.perf_counter()
+    for frame in frames:
+        clock.set(frame.timestamp)
+        if snapshot_list.feed_strings(frame.rows) is not None:
+            applied_frames += 1
+    if snapshot_list.flush() is not None:
+        applied_frames += 1
+    elapsed = time.perf_counter() - started
+
+    return ReplayResult(
+        frames=len(frames),
+        applied_frames=applied_frames,
+        skipped_frames=snapshot_list.skipped_frames,
+        elapsed=elapsed,
+        recorded_duration=clock() - start_time,
+        snapshot_list=snapshot_list,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Replays a recording from the command line and reports how it went.
+
+    Args:
+        argv (Sequence[str] | None): The command line arguments. Defaults to
+            None, which uses sys.argv.
+    """
+    parser = argparse.ArgumentParser(
+        description="Replay a snapshot recording through a SnapshotList."
+    )
+    parser.add_argument("path", help="The recording to replay.")
+    parser.add_argument("--max-list-length", type=int, default=12)
+    parser.add_argument("--max-list-age", type=float, default=5.0 * 60.0)
+    parser.add_argument("--debounce-window", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    result = replay(
+        args.path,
+        max_list_length=args.max_list_length,
+        max_list_age=args.max_list_age,
+        debounce_window=args.debounce_window,
+    )
+    print(
+        f"Frames: {result.frames} "
+        + f"(applied {result.applied_frames}, "
+        + f"skipped {result.skipped_frames})"
+    )
+    print(
+        f"Replayed {result.recorded_duration:.1f}s in {result.elapsed:.3f}s: "
+        + f"{result.frames_per_second:.0f} frames/s, "
+        + f"{result.speedup:.0f}x real time"
+    )
+    print(result.snapshot_list)
+    for listing in result.snapshot_list.list:
+        print(f"\t{listing}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
+import heapq
+import itertools
 import time
-from typing import Optional, TypeVar, cast
-
+from typing import Callable, Generic, Iterable, Optional, Sequence, cast
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list.changes import (
+    ListingAddition,
+    ListingUpdate,
+    SnapshotChanges,
+)
 from nerdtracker_client.player_list.listing import EmptyListing, Listing
+from nerdtracker_client.player_list.storage import ListingBuffer, T
 from nerdtracker_client.util import identify_missing_values
 
-T = TypeVar("T", bound=Listing)
-
 
-class SnapshotList:
+class SnapshotList(Generic[T]):
     """SnapshotList class is a class that tries to keep a real-time list based
     on the snapshot fed to it. More formally, it keeps a list of length n based
     on a snapshot fed to it of length k. It will then attempt to update the list
@@ -19,21 +26,52 @@ class SnapshotList:
         initial_snapshot: list[T],
         max_list_length: int = 12,
         max_list_age: float = 5.0 * 60.0,
+        debounce_window: float = 0.0,
+        clock: Callable[[], float] | None = None,
     ) -> None:
         """Initializes the SnapshotList class.
 
         Args:
             initial_snapshot (list[T]): The initial snapshot to use to create
                 the list.
-            max_list_length (int): Maximum length to attempt to keep. Defaults
-                to 12.
-            max_list_age (float): Maximum age, in seconds, before the
-                SnapshotList is considered stale. Defaults to 300 seconds.
+            max_list_length (int): Maximum length to keep. Once reached,
+                listings are evicted from the opposite end of where new ones
+                are added. Defaults to 12.
+            max_list_age (float): Maximum time, in seconds, a listing is kept
+                after it was last observed in a snapshot. Defaults to 300
+                seconds.
+            debounce_window (float): Minimum time, in seconds, between two
+                snapshots applied through feed_strings. Changed frames that
+                arrive sooner are coalesced and only the latest is applied.
+                Defaults to 0 seconds, which applies every changed frame.
+            clock (Callable[[], float] | None): Function returning the current
+                time in seconds, used instead of time.time, for instance to
+                replay a recording faster than real time. Defaults to None,
+                which uses time.time.
         """
-        self.list: list[T] = initial_snapshot
-        self.last_update = time.time()
+        self.clock = clock
         self.max_list_length = max_list_length
         self.max_list_age = max_list_age
+        # The heap holds the expiry time, entry number and id of the listings,
+        # while the listings themselves are only held by __tracked, so those
+        # that leave the list are released straight away. Heap entries whose
+        # number is not the current one of their listing are stale.
+        self.__expiry_heap: list[tuple[float, int, int]] = []
+        self.__tracked: dict[int, tuple[int, T]] = {}
+        self.__expiry_counter = itertools.count()
+        self.last_update = self.now()
+        for listing in initial_snapshot:
+            listing.mark_seen(self.last_update)
+        self.list = initial_snapshot
+        self.last_changes = SnapshotChanges()
+        self.debounce_window = debounce_window
+        self.skipped_frames = 0
+        self.coalesced_frames = 0
+        self.__last_rows: tuple[str | None, ...] | None = None
+        self.__last_rows_hash: int | None = None
+        self.__last_fed_time = float("-inf")
+        self.__pending_rows: tuple[str | None, ...] | None = None
+        self.__listeners: list[Callable[[SnapshotChanges], None]] = []
 
     def __repr__(self) -> str:
         out_str = (
@@ -46,24 +84,81 @@ class SnapshotList:
         )
         return out_str
 
-    @property
-    def __is_list_stale(self) -> bool:
-        """Whether the list is stale
+    def now(self) -> float:
+        """Returns the current time according to the clock of the list.
+
+        Returns:
+            float: The current time, in seconds
+        """
+        return time.time() if self.clock is None else self.clock()
+
+    def __track(self, listings: Iterable[T]) -> None:
+        """Starts tracking the expiry of listings that entered the list.
+
+        Args:
+            listings (Iterable[T]): The listings that entered the list.
+        """
+        for listing in listings:
+            if listing.is_empty:
+                continue
+            entry_number = next(self.__expiry_counter)
+            self.__tracked[id(listing)] = (entry_number, listing)
+            heapq.heappush(
+                self.__expiry_heap,
+                (
+                    listing.last_seen + self.max_list_age,
+                    entry_number,
+                    id(listing),
+                ),
+            )
+
+    def __untrack(self, listings: Iterable[T]) -> None:
+        """Stops tracking the expiry of listings that left the list.
+
+        Args:
+            listings (Iterable[T]): The listings that left the list.
+        """
+        for listing in listings:
+            self.__tracked.pop(id(listing), None)
+
+    def expire(self, now: float | None = None) -> list[T]:
+        """Drops the listings that were not observed within max_list_age.
 
-        Checks whether the list is stale based on the last update time and the
-        maximum age of the list.
+        Expiry times are kept in a min-heap and only refreshed lazily, so this
+        only looks at listings whose expiry time has passed. Those that were
+        observed in the meantime are pushed back with their new expiry time,
+        and entries of listings that already left the list are skipped.
+
+        Args:
+            now (float | None): The current time, or None to use the current
+                time. Defaults to None.
 
         Returns:
-            bool: Whether the list is stale
+            list[T]: The listings that were dropped.
         """
-        return (time.time() - self.last_update) > self.max_list_age
+        now = self.now() if now is None else now
+        expired: list[T] = []
+        while self.__expiry_heap and (self.__expiry_heap[0][0] <= now):
+            _, entry_number, listing_id = heapq.heappop(self.__expiry_heap)
+            tracked = self.__tracked.get(listing_id)
+            if (tracked is None) or (tracked[0] != entry_number):
+                continue
+            listing = tracked[1]
+            if listing.last_seen + self.max_list_age <= now:
+                del self.__tracked[listing_id]
+                expired.append(listing)
+            else:
+                self.__track([listing])
+        if not expired:
+            return []
+        return self.list.remove_listings(expired)
 
     @staticmethod
     def from_list_of_strings(
         initial_snapshot: list[str | None],
         max_list_length: int = 12,
         max_list_age: float = 5.0 * 60.0,
-    ) -> "SnapshotList":
+    ) -> "SnapshotList[Listing]":
         """Creates a SnapshotList from a list of strings.
 
         Given a list of strings, creates a SnapshotList with the strings as the
@@ -76,21 +171,132 @@ class SnapshotList:
                 create the SnapshotList.
             max_list_length (int): Max length the list will attempt to keep.
                 Defaults to 12.
-            max_list_age (float): Maximum age, in seconds, before the
-                SnapshotList is considered stale. Defaults to 300 seconds.
+            max_list_age (float): Maximum time, in seconds, a listing is kept
+                after it was last observed in a snapshot. Defaults to 300
+                seconds.
 
         Returns:
-            SnapshotList: The SnapshotList created from the list of strings.
+            SnapshotList[Listing]: The SnapshotList created from the list of
+                strings.
         """
 
-        fed_snapshot = []
-        for snapshot_row in initial_snapshot:
+        fed_snapshot = SnapshotList.listings_from_strings(initial_snapshot)
+        return SnapshotList(fed_snapshot, max_list_length, max_list_age)
+
+    @staticmethod
+    def listings_from_strings(
+        snapshot: Sequence[str | None],
+        listing_time: float | None = None,
+    ) -> list[Listing]:
+        """Converts a list of strings into a list of listings.
+
+        If the string is empty or None, it will be converted to an
+        EmptyListing. Otherwise, the string will be used to create a new
+        Listing.
+
+        Args:
+            snapshot (Sequence[str | None]): The strings to convert.
+            listing_time (float | None): The creation time of the listings, or
+                None to use the current time. Defaults to None.
+
+        Returns:
+            list[Listing]: The listings, in the same order as the strings.
+        """
+        fed_snapshot: list[Listing] = []
+        for snapshot_row in snapshot:
             if (snapshot_row == "") or (snapshot_row is None):
                 listing: Listing | EmptyListing = EmptyListing()
             else:
-                listing = Listing(snapshot_row)
+                listing = Listing(snapshot_row, listing_time=listing_time)
             fed_snapshot.append(listing)
-        return SnapshotList(fed_snapshot, max_list_length, max_list_age)
+        return fed_snapshot
+
+    def feed_strings(
+        self, snapshot: Sequence[str | None]
+    ) -> SnapshotChanges | None:
+        """Feeds the raw strings of an OCR frame to the list.
+
+        Frames that are identical to the last frame fed are skipped without
+        being reconciled, which costs a single pass over the rows. Changed
+        frames that arrive within debounce_window seconds of the last applied
+        frame are held back, and only the latest of them is applied once the
+        window has passed, either on a later call or through flush. Nothing
+        runs on a timer: a frame held back stays pending, and the list stays
+        out of date, until the next call to feed_strings or flush, so callers
+        that stop feeding frames should call flush.
+
+        Args:
+            snapshot (Sequence[str | None]): The rows of the frame, as read by
+                the OCR unit.
+
+        Returns:
+            SnapshotChanges | None: The change-set of the snapshot that was
+                applied, or None if no snapshot was applied.
+        """
+        rows = tuple(snapshot)
+        rows_hash = hash(rows)
+        latest_rows = (
+            self.__pending_rows
+            if self.__pending_rows is not None
+            else self.__last_rows
+        )
+        now = self.now()
+        window_passed = (now - self.__last_fed_time) >= self.debounce_window
+
+        if (rows_hash == self.__last_rows_hash) and (rows == latest_rows):
+            self.skipped_frames += 1
+            if window_passed and self.__pending_rows is not None:
+                return self.flush()
+            return None
+
+        if self.__pending_rows is not None:
+            self.coalesced_frames += 1
+        self.__pending_rows = rows
+        self.__last_rows_hash = rows_hash
+        if not window_passed:
+            return None
+        return self.flush()
+
+    def flush(self) -> SnapshotChanges | None:
+        """Applies the frame held back by feed_strings, if there is one.
+
+        Returns:
+            SnapshotChanges | None: The change-set of the snapshot that was
+                applied, or None if there was no frame held back.
+        """
+        rows = self.__pending_rows
+        if rows is None:
+            return None
+        self.__pending_rows = None
+        self.__last_rows = rows
+        self.__last_fed_time = self.now()
+        return self.new_snapshot(
+            cast(
+                list[T],
+                self.listings_from_strings(rows, self.__last_fed_time),
+            )
+        )
+
+    def add_listener(self, listener: Callable[[SnapshotChanges], None]) -> None:
+        """Registers a function to call with the change-set of every snapshot.
+
+        Args:
+            listener (Callable[[SnapshotChanges], None]): The function to call.
+                It is called on the thread applying the snapshot, so it should
+                return quickly.
+        """
+        self.__listeners.append(listener)
+
+    def remove_listener(
+        self, listener: Callable[[SnapshotChanges], None]
+    ) -> None:
+        """Unregisters a function registered through add_listener.
+
+        Args:
+            listener (Callable[[SnapshotChanges], None]): The function to stop
+                calling.
+        """
+        self.__listeners.remove(listener)
 
     def __contains__(self, listing: T) -> bool:
         """Checks whether the fed listing is in the SnapshotList.
@@ -103,7 +309,7 @@ class SnapshotList:
         """
         return listing in self.list
 
-    def new_snapshot(self, new_snapshot: list[T]) -> None:
+    def new_snapshot(self, new_snapshot: list[T]) -> SnapshotChanges:
         """Updates the list based on a new snapshot.
 
         Given a new snapshot of Listings, updates the list with a few
@@ -111,17 +317,28 @@ class SnapshotList:
         the current list, the list will be appended with the new snapshot. If
         there is an overlap, then depending on where the overlap is, the shared
         listings will be updated and the rest will be either appended or
-        prepended. Missing listings from the current list will be dropped. If
-        the list is stale, it will be replaced with the new snapshot.
+        prepended. Missing listings from the current list will be dropped, as
+        will listings that were not observed within max_list_age.
+
+        The change-set describing the update is returned, kept in
+        ``last_changes`` and passed to the listeners registered through
+        add_listener.
 
         Args:
             new_snapshot (list[T]): The new snapshot to use to update the list.
+
+        Returns:
+            SnapshotChanges: The listings added, updated and dropped by this
+                snapshot.
         """
-        # If the list is stale, update it.
-        if self.__is_list_stale:
-            self.list = new_snapshot
-            self.last_update = time.time()
-            return
+        changes = SnapshotChanges()
+        self.last_changes = changes
+        now = self.now()
+        self.last_update = now
+        # Drop the listings that have not been observed in a while.
+        changes.dropped += self.expire(now)
+        for new_listing in new_snapshot:
+            new_listing.mark_seen(now)
 
         # Find the first and last listing that are not empty
         first_listing: Listing | None = None
@@ -147,7 +364,11 @@ class SnapshotList:
         # Four cases:
         # 1. Neither are found. Append the new snapshot to the end.
         if not first_listing_found and not last_listing_found:
-            self.list += new_snapshot
+            evicted = self.__add_listings(new_snapshot)
+            changes.dropped += [
+                listing for listing in evicted if not listing.is_empty
+            ]
+            changes.added = self.__appended(new_snapshot, True)
         # 2. Either case is found. Calculate overlaps, drops, and appends. Then,
         # use whether first OR last is found to determine whether to append or
         # prepend for new entries. The case where both are found is handled by
@@ -157,6 +378,11 @@ class SnapshotList:
                 overlap_indices_old,
                 overlap_indices_new,
             ) = self.__new_snapshot_overlap(new_snapshot)
+            # Empty rows before the first overlapping listing say nothing about
+            # which listings were dropped.
+            while overlap_indices_old[0] is None:
+                overlap_indices_old.pop(0)
+                overlap_indices_new.pop(0)
             dropped_indices = identify_missing_values(overlap_indices_old)
             new_indices = [
                 index
@@ -172,17 +398,76 @@ class SnapshotList:
                 if old_index is None:
                     continue
                 new_index = cast(int, new_index)
-                self.__update_existing_listing(
-                    new_snapshot[new_index], old_index
+                update = self.__update_existing_listing(
+                    new_snapshot[new_index], old_index, now
                 )
+                if update is not None:
+                    changes.updated.append(update)
 
             # Drop the listings that are considered dropped.
+            changes.dropped += [
+                self.list[index]
+                for index in dropped_indices
+                if not self.list[index].is_empty
+            ]
             self.drop_list(dropped_indices)
 
             # Add the listings that are not considered dropped and are not
             # overlapping with the existing listings.
             new_listings = [new_snapshot[index] for index in new_indices]
-            self.add_list(new_listings, append=first_listing_found)
+            evicted = self.__add_listings(
+                new_listings, append=first_listing_found
+            )
+            changes.dropped += [
+                listing for listing in evicted if not listing.is_empty
+            ]
+            changes.added = self.__appended(new_listings, first_listing_found)
+
+        for listener in self.__listeners:
+            listener(changes)
+        return changes
+
+    def __appended(
+        self, new_listings: list[T], append: bool
+    ) -> list[ListingAddition]:
+        """Builds the additions of a change-set for a block of listings that was
+        just added to either end of the list.
+
+        Args:
+            new_listings (list[T]): The block of listings that was added.
+            append (bool): Whether the block was appended or prepended.
+
+        Returns:
+            list[ListingAddition]: The non-empty listings of the block that are
+                still in the list, along with their position in the list.
+        """
+        start_position = len(self.list) - len(new_listings) if append else 0
+        return [
+            addition
+            for addition in self.__additions(start_position, new_listings)
+            if 0 <= addition.position < len(self.list)
+        ]
+
+    @staticmethod
+    def __additions(
+        start_position: int, new_listings: list[T]
+    ) -> list[ListingAddition]:
+        """Builds the additions of a change-set for a block of new listings.
+
+        Args:
+            start_position (int): The position in the list of the first listing
+                of the block.
+            new_listings (list[T]): The block of listings that was added.
+
+        Returns:
+            list[ListingAddition]: The non-empty listings of the block, along
+                with their position in the list.
+        """
+        return [
+            ListingAddition(start_position + offset, listing)
+            for offset, listing in enumerate(new_listings)
+            if not listing.is_empty
+        ]
 
     def __new_snapshot_overlap(
         self, new_snapshot: list[T]
@@ -218,35 +503,117 @@ class SnapshotList:
                 overlap_new_index.append(None)
         return (overlap_old_index, overlap_new_index)
 
-    def __update_existing_listing(self, new_listing: T, index: int) -> None:
+    def __update_existing_listing(
+        self, new_listing: T, index: int, now: float
+    ) -> ListingUpdate | None:
         """Updates an existing listing with a new listing.
 
         Given a new listing and an index, updates the existing listing at that
-        index with the new listing.
+        index with the new listing, and marks it as observed.
 
         Args:
             new_listing (T): The new listing to use to update the existing
                 listing at the given index.
             index (int): The index of the existing listing to update.
+            now (float): The time the new listing was observed.
+
+        Returns:
+            ListingUpdate | None: The update that was applied, or None if the
+                identifier of the listing at the given index did not change.
         """
         old_listing = self.list[index]
-        if isinstance(old_listing, EmptyListing):
+        old_id = old_listing.listing_id
+        old_full_match = old_listing.full_match
+        if isinstance(new_listing, EmptyListing):
+            return None
+        if isinstance(old_listing, EmptyListing) or (
+            new_listing.full_match and not old_full_match
+        ):
+            # Carry the stats over to the listing replacing the old one.
+            if not new_listing.has_stats:
+                new_listing.stats = old_listing.stats
             self.list[index] = new_listing
-            return
+            self.__untrack([old_listing])
+            self.__track([new_listing])
+        else:
+            old_listing = self.__own(index)
+            old_listing.mark_seen(now)
+            if old_full_match:
+                return None
+            # TODO: Add logic to Listing to use all data from the listings.
+            old_listing.update(new_listing)
+
+        current_listing = self.list[index]
+        full_match_upgrade = current_listing.full_match and not old_full_match
+        if (current_listing.listing_id == old_id) and not full_match_upgrade:
+            return None
+        return ListingUpdate(
+            current_listing,
+            old_id,
+            current_listing.listing_id,
+            full_match_upgrade,
+        )
 
-        if isinstance(new_listing, EmptyListing):
-            return
+    def __own(self, index: int) -> T:
+        """Returns the listing at an index, ready to be updated in place.
 
-        if old_listing.full_match:
-            return
+        Args:
+            index (int): The index of the listing.
 
-        if new_listing.full_match:
-            self.list[index] = new_listing
-            return
+        Returns:
+            T: The listing at the index, replaced by a copy first if it is
+                shared
+        """
+        listing = self.list[index]
+        if not self._is_shared(listing):
+            return listing
+        # Copied on write, so that readers holding it never see it change.
+        copied = cast(T, listing.copy())
+        self.__untrack([listing])
+        self.list[index] = copied
+        self.__track([copied])
+        return copied
+
+    def attach_stats(
+        self, listing_id: str | int, stats: ntc_stats.StatColumns
+    ) -> list[T]:
+        """Attaches stats to every listing with the given id.
 
-        # TODO: Add logic to Listing to use all data from the listings.
-        self.list[index].update(new_listing)
-        return
+        Args:
+            listing_id (str | int): The listing id the stats belong to.
+            stats (ntc_stats.StatColumns): The stats.
+
+        Returns:
+            list[T]: The listings the stats were attached to, which did not
+                already have them.
+        """
+        key = str(listing_id)
+        attached: list[T] = []
+        for index in range(len(self.list)):
+            listing = self.list[index]
+            if (
+                listing.is_empty
+                or (str(listing.listing_id) != key)
+                or (listing.stats is stats)
+            ):
+                continue
+            listing = self.__own(index)
+            listing.stats = stats
+            attached.append(listing)
+        return attached
+
+    def _is_shared(self, listing: T) -> bool:
+        """Whether a listing may be held by readers, in which case it is
+        copied instead of being updated in place. Listings are never shared by
+        a SnapshotList, see ConcurrentSnapshotList.
+
+        Args:
+            listing (T): A listing of the list.
+
+        Returns:
+            bool: Whether the listing may be held by readers
+        """
+        return False
 
     def drop(
         self,
@@ -271,26 +638,26 @@ class SnapshotList:
         """
         if stop_index is None:
             stop_index = len(self.list)
-        for _ in range(start_index, stop_index, step):
-            self.list.pop(start_index)
+        drop_count = len(range(start_index, stop_index, step))
+        if start_index + drop_count > len(self.list):
+            raise IndexError("drop index out of range")
+        self.__untrack(
+            self.list.remove_indices(
+                range(start_index, start_index + drop_count)
+            )
+        )
         return
 
     def drop_list(self, indices: list[int]) -> None:
         """Drops one or more listings based on the index.
 
-        Given a list of indices, drops the listings at those indices. In
-        practice, this overwrites the existing list with a shallow copy with the
-        dropped listings removed.
+        Given a list of indices, drops the listings at those indices in a
+        single pass over the list.
 
         Args:
             indices (list[int]): A list of indices to drop.
         """
-        new_list = [
-            listing
-            for index, listing in enumerate(self.list)
-            if index not in indices
-        ]
-        self.list = new_list
+        self.__untrack(self.list.remove_indices(indices))
 
     def insert(
         self,
@@ -301,19 +668,18 @@ class SnapshotList:
 
         Given a list of listings and a start index, inserts the new listings
         into the current list at the start index. Does not support inserting
-        listings into specific indices, must insert at the start index.
+        listings into specific indices, must insert at the start index. If the
+        list grows beyond max_list_length, listings are evicted from the start,
+        unless the new listings are inserted at the start.
 
         Args:
             new_list (list[T]): A list of listings to insert into the current
                 list.
             start_index (int): The index to insert the new listings at.
         """
-        new_list = [
-            *self.list[:start_index],
-            *new_list,
-            *self.list[start_index:],
-        ]
-        self.list = new_list
+        evicted = self.list.insert_list(new_list, start_index)
+        self.__track(new_list)
+        self.__untrack(evicted)
 
     def add_list(
         self,
@@ -322,14 +688,40 @@ class SnapshotList:
     ) -> None:
         """Adds a list of listings to the list.
 
+        If the list grows beyond max_list_length, listings are evicted from the
+        opposite end of where the new list is added.
+
         Args:
             new_list (list[Listing]): The new list to add.
             append (bool): Whether to append the new list or prepend it.
         """
+        self.__add_listings(new_list, append)
+
+    def __add_listings(
+        self,
+        new_list: list[T],
+        append: bool = True,
+    ) -> list[T]:
+        """Adds a list of listings to the list, see add_list.
+
+        Args:
+            new_list (list[T]): The new list to add.
+            append (bool): Whether to append the new list or prepend it.
+                Defaults to True.
+
+        Returns:
+            list[T]: The listings that were in the list and were evicted to
+                stay within max_list_length.
+        """
         if append:
-            self.list += new_list
+            evicted = self.list.append_list(new_list)
         else:
-            self.list = new_list + self.list
+            evicted = self.list.prepend_list(new_list)
+        # New listings are evicted too when there are more than fit.
+        self.__track(new_list)
+        self.__untrack(evicted)
+        new_ids = {id(listing) for listing in new_list}
+        return [listing for listing in evicted if id(listing) not in new_ids]
 
     def replace(
         self,
@@ -361,3 +753,29 @@ class SnapshotList:
             # Some values were dropped.
             self.drop(start_index, stop_index, step)
             self.insert(new_list, start_index)
+
+    # Defined last so that the property does not shadow the builtin list in
+    # the annotations of the methods above.
+    @property
+    def list(self) -> ListingBuffer[T]:
+        """The listings currently kept, in order
+
+        Returns:
+            ListingBuffer[T]: The bounded buffer holding the listings
+        """
+        return self.__list
+
+    @list.setter
+    def list(self, new_list: Iterable[T]) -> None:
+        """Replaces the listings with a new iterable of listings. If there are
+        more than max_list_length, only the last ones are kept.
+
+        Args:
+            new_list (Iterable[T]): The listings to keep.
+        """
+        self.__list: ListingBuffer[T] = ListingBuffer(
+            new_list, self.max_list_length
+        )
+        self.__expiry_heap.clear()
+        self.__tracked.clear()
+        self.__track(self.__list)
@@ -0,0 +1,204 @@
+from collections import deque
+from typing import Any, Iterable, Sequence, SupportsIndex, TypeVar, overload
+
+from nerdtracker_client.player_list.listing import Listing
+
+T = TypeVar("T", bound=Listing)
+
+
+class ListingBuffer(deque[T]):
+    """ListingBuffer class is the storage layer behind SnapshotList. It is a
+    deque with a maximum length, so prepending and appending are O(1) and the
+    list never grows beyond the maximum length. Listings pushed out of the
+    buffer are evicted from the opposite end of where new listings are added.
+
+    It can be used in place of the list SnapshotList used to keep: slicing it
+    and adding a list to it give a list, and it is equal to a list holding
+    equal listings in the same order.
+    """
+
+    def __init__(
+        self,
+        listings: Iterable[T] = (),
+        maxlen: int | None = None,
+    ) -> None:
+        """Constructor for the ListingBuffer class
+
+        Args:
+            listings (Iterable[T]): The initial listings. If there are more
+                than maxlen, the first ones are evicted. Defaults to no
+                listings.
+            maxlen (int | None): The maximum number of listings to keep, or
+                None for no limit. Defaults to None.
+        """
+        super().__init__(listings, maxlen)
+
+    @overload
+    def __getitem__(self, key: SupportsIndex) -> T: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> list[T]: ...
+
+    def __getitem__(self, key: Any) -> Any:
+        """Returns the listing at an index, or the listings of a slice.
+
+        Args:
+            key (Any): The index of the listing, or a slice.
+
+        Returns:
+            Any: The listing at the index, or a list of the listings of the
+                slice
+        """
+        if isinstance(key, slice):
+            return list(self)[key]
+        return super().__getitem__(key)
+
+    def __add__(self, other: Sequence[T]) -> list[T]:  # type: ignore
+        """Concatenates the listings with a sequence of listings.
+
+        Args:
+            other (Sequence[T]): The listings to add after these.
+
+        Returns:
+            list[T]: The listings of both, in order
+        """
+        return [*self, *other]
+
+    def __radd__(self, other: Sequence[T]) -> list[T]:
+        """Concatenates a sequence of listings with the listings.
+
+        Args:
+            other (Sequence[T]): The listings to add before these.
+
+        Returns:
+            list[T]: The listings of both, in order
+        """
+        return [*other, *self]
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the buffer against a list or a deque, element by element,
+        as a list would be compared.
+
+        Args:
+            other (object): The object to compare to
+
+        Returns:
+            bool: Whether both contain equal listings in the same order
+        """
+        if not isinstance(other, (deque, list)):
+            return False
+        if len(self) != len(other):
+            return False
+        return all(mine == theirs for mine, theirs in zip(self, other))
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    def __overflow(self, incoming: int) -> int:
+        """Calculates how many listings have to be evicted to make room.
+
+        Args:
+            incoming (int): The number of listings about to be added.
+
+        Returns:
+            int: The number of listings that will be evicted.
+        """
+        if self.maxlen is None:
+            return 0
+        return max(len(self) + incoming - self.maxlen, 0)
+
+    def append_list(self, new_list: Sequence[T]) -> list[T]:
+        """Appends listings to the end of the buffer, evicting from the start.
+
+        Args:
+            new_list (Sequence[T]): The listings to append.
+
+        Returns:
+            list[T]: The listings that were evicted from the start, including
+                new ones if there are more than maxlen of them.
+        """
+        overflow = self.__overflow(len(new_list))
+        evicted = [self[index] for index in range(min(overflow, len(self)))]
+        evicted += new_list[: overflow - len(evicted)]
+        self.extend(new_list)
+        return evicted
+
+    def prepend_list(self, new_list: Sequence[T]) -> list[T]:
+        """Prepends listings to the start of the buffer, evicting from the end.
+
+        Args:
+            new_list (Sequence[T]): The listings to prepend, in order.
+
+        Returns:
+            list[T]: The listings that were evicted from the end, including
+                new ones if there are more than maxlen of them.
+        """
+        overflow = self.__overflow(len(new_list))
+        evicted = list(new_list[len(new_list) + len(self) - overflow :])
+        evicted += [
+            self[index]
+            for index in range(max(len(self) - overflow, 0), len(self))
+        ]
+        self.extendleft(reversed(new_list))
+        return evicted
+
+    def insert_list(self, new_list: Sequence[T], start_index: int) -> list[T]:
+        """Inserts listings at the given index, evicting from the start.
+
+        Only the listings after the start index are moved, so inserting close
+        to either end is cheap.
+
+        Args:
+            new_list (Sequence[T]): The listings to insert, in order.
+            start_index (int): The index to insert the listings at.
+
+        Returns:
+            list[T]: The listings that were evicted from the start, including
+                new ones if there are more than maxlen of them.
+        """
+        start_index = min(max(start_index, 0), len(self))
+        if start_index == 0:
+            return self.prepend_list(new_list)
+        tail = [self.pop() for _ in range(len(self) - start_index)]
+        tail.reverse()
+        return self.append_list([*new_list, *tail])
+
+    def remove_indices(self, indices: Iterable[int]) -> list[T]:
+        """Removes the listings at the given indices in a single pass.
+
+        Args:
+            indices (Iterable[int]): The indices of the listings to remove.
+
+        Returns:
+            list[T]: The listings that were removed, in order.
+        """
+        index_set = set(indices)
+        if not index_set:
+            return []
+        kept: list[T] = []
+        removed: list[T] = []
+        for index, listing in enumerate(self):
+            (removed if index in index_set else kept).append(listing)
+        self.clear()
+        self.extend(kept)
+        return removed
+
+    def remove_listings(self, listings: Iterable[T]) -> list[T]:
+        """Removes the given listings, compared by identity, in a single pass.
+
+        Args:
+            listings (Iterable[T]): The listings to remove.
+
+        Returns:
+            list[T]: The listings that were removed, in order.
+        """
+        listing_ids = {id(listing) for listing in listings}
+        if not listing_ids:
+            return []
+        kept: list[T] = []
+        removed: list[T] = []
+        for listing in self:
+            (removed if id(listing) in listing_ids else kept).append(listing)
+        self.clear()
+        self.extend(kept)
+        return removed
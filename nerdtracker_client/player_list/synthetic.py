@@ -0,0 +1,249 @@
+import random
+import string
+from typing import Iterator, NamedTuple, Sequence
+
+from nerdtracker_client.player_list.listing import Listing
+from nerdtracker_client.player_list.snapshot_list import SnapshotList
+
+# Characters the OCR unit commonly mistakes for one another.
+OCR_CONFUSIONS: dict[str, str] = {
+    "0": "O",
+    "O": "0",
+    "o": "0",
+    "1": "l",
+    "l": "1",
+    "I": "l",
+    "i": "l",
+    "5": "S",
+    "S": "5",
+    "8": "B",
+    "B": "8",
+    "2": "Z",
+    "Z": "2",
+    "6": "G",
+    "G": "6",
+    "m": "n",
+    "n": "m",
+    "e": "c",
+    "c": "e",
+}
+
+
+class SyntheticFrame(NamedTuple):
+    """A simulated OCR snapshot along with what was actually on screen"""
+
+    rows: tuple[str | None, ...]
+    truth: tuple[str, ...]
+
+
+class OCRNoise:
+    """OCRNoise class models the mistakes the OCR unit makes when reading a
+    player name: swapping characters for similar looking ones, cutting the
+    name short, and failing to read the row at all.
+    """
+
+    def __init__(
+        self,
+        substitution_rate: float = 0.0,
+        truncation_rate: float = 0.0,
+        empty_rate: float = 0.0,
+    ) -> None:
+        """Constructor for the OCRNoise class
+
+        Args:
+            substitution_rate (float): Probability of each character being
+                swapped for a similar looking one. Defaults to 0.
+            truncation_rate (float): Probability of a name being cut short.
+                Defaults to 0.
+            empty_rate (float): Probability of a row not being read at all.
+                Defaults to 0.
+        """
+        self.substitution_rate = substitution_rate
+        self.truncation_rate = truncation_rate
+        self.empty_rate = empty_rate
+
+    def __repr__(self) -> str:
+        out_str = (
+            "OCRNoise("
+            + f"Substitution: {self.substitution_rate}, "
+            + f"Truncation: {self.truncation_rate}, "
+            + f"Empty: {self.empty_rate}"
+            + ")"
+        )
+        return out_str
+
+    @staticmethod
+    def uniform(rate: float) -> "OCRNoise":
+        """Creates a noise model with a single overall noise rate.
+
+        Args:
+            rate (float): The substitution rate. Truncations and empty rows
+                happen half as often.
+
+        Returns:
+            OCRNoise: The noise model.
+        """
+        return OCRNoise(rate, rate / 2.0, rate / 2.0)
+
+    def apply(self, name: str, rng: random.Random) -> str | None:
+        """Reads a name the way the OCR unit would.
+
+        Args:
+            name (str): The name on screen.
+            rng (random.Random): The random number generator to use.
+
+        Returns:
+            str | None: The name as read, or None if the row was not read.
+        """
+        if rng.random() < self.empty_rate:
+            return None if rng.random() < 0.5 else ""
+
+        characters = list(name)
+        for index, character in enumerate(characters):
+            if rng.random() < self.substitution_rate:
+                characters[index] = OCR_CONFUSIONS.get(
+                    character, rng.choice(string.ascii_letters)
+                )
+        if (len(characters) > 3) and (rng.random() < self.truncation_rate):
+            characters = characters[
+                : rng.randint(len(characters) // 2, len(characters) - 1)
+            ]
+        return "".join(characters)
+
+
+def random_player_name(rng: random.Random) -> str:
+    """Creates a random activision user string, such as Player#1234567.
+
+    Args:
+        rng (random.Random): The random number generator to use.
+
+    Returns:
+        str: The user string
+    """
+    name_length = rng.randint(5, 12)
+    name = rng.choice(string.ascii_letters) + "".join(
+        rng.choice(string.ascii_letters + string.digits)
+        for _ in range(name_length - 1)
+    )
+    return f"{name}#{rng.randint(1_000_000, 9_999_999)}"
+
+
+class LobbySimulator:
+    """LobbySimulator class simulates a scoreboard being scrolled through while
+    players join and leave, and produces the snapshots the OCR unit would read
+    from it along with the ground truth.
+    """
+
+    def __init__(
+        self,
+        lobby_size: int = 12,
+        visible_rows: int = 6,
+        join_rate: float = 0.0,
+        leave_rate: float = 0.0,
+        noise: OCRNoise | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Constructor for the LobbySimulator class
+
+        Args:
+            lobby_size (int): Number of players in the lobby at the start.
+                Defaults to 12.
+            visible_rows (int): Number of scoreboard rows visible at once.
+                Defaults to 6.
+            join_rate (float): Probability of a player joining, at the end of
+                the scoreboard, on each frame. Defaults to 0.
+            leave_rate (float): Probability of a player leaving on each frame.
+                Defaults to 0.
+            noise (OCRNoise | None): The OCR noise model. Defaults to None,
+                which reads every name perfectly.
+            seed (int | None): Seed for the random number generator, to make
+                simulations reproducible. Defaults to None.
+        """
+        self.rng = random.Random(seed)
+        self.visible_rows = visible_rows
+        self.join_rate = join_rate
+        self.leave_rate = leave_rate
+        self.noise = noise if noise is not None else OCRNoise()
+        self.lobby: list[str] = [
+            random_player_name(self.rng) for _ in range(lobby_size)
+        ]
+        self.offset = 0
+        self.seen: set[str] = set()
+
+    def __repr__(self) -> str:
+        out_str = (
+            "LobbySimulator("
+            + f"Lobby: {len(self.lobby)}, "
+            + f"Visible: {self.visible_rows}, "
+            + f"Offset: {self.offset}, "
+            + f"{self.noise!r}"
+            + ")"
+        )
+        return out_str
+
+    def step(self) -> SyntheticFrame:
+        """Advances the simulation by one frame.
+
+        Players may join or leave, then the scoreboard scrolls by at most one
+        row, and the visible rows are read through the noise model.
+
+        Returns:
+            SyntheticFrame: The snapshot read, and the names actually visible.
+        """
+        if self.rng.random() < self.join_rate:
+            self.lobby.append(random_player_name(self.rng))
+        if (len(self.lobby) > 1) and (self.rng.random() < self.leave_rate):
+            self.lobby.pop(self.rng.randrange(len(self.lobby)))
+
+        max_offset = max(len(self.lobby) - self.visible_rows, 0)
+        self.offset += self.rng.choice((-1, 0, 1))
+        self.offset = min(max(self.offset, 0), max_offset)
+
+        truth = tuple(self.lobby[self.offset : self.offset + self.visible_rows])
+        self.seen.update(truth)
+        rows = tuple(self.noise.apply(name, self.rng) for name in truth)
+        return SyntheticFrame(rows, truth)
+
+    @property
+    def visible_lobby(self) -> list[str]:
+        """The players still in the lobby that have been on screen at least
+        once, in scoreboard order. This is the most a SnapshotList can know.
+
+        Returns:
+            list[str]: The players in the lobby that have been on screen
+        """
+        return [name for name in self.lobby if name in self.seen]
+
+    def frames(self, count: int) -> Iterator[SyntheticFrame]:
+        """Generates a sequence of frames.
+
+        Args:
+            count (int): The number of frames to generate.
+
+        Yields:
+            SyntheticFrame: The frames, in order.
+        """
+        for _ in range(count):
+            yield self.step()
+
+
+def reconciliation_accuracy(
+    snapshot_list: SnapshotList, truth: Sequence[str]
+) -> float:
+    """Measures how much of the lobby a SnapshotList has reconstructed.
+
+    Args:
+        snapshot_list (SnapshotList): The list fed with the simulated frames.
+        truth (Sequence[str]): The names actually in the lobby.
+
+    Returns:
+        float: The fraction of the names in the lobby that match a listing in
+            the list, between 0 and 1.
+    """
+    if not truth:
+        return 1.0
+    listings = [
+        listing for listing in snapshot_list.list if not listing.is_empty
+    ]
+    found = sum(1 for name in truth if Listing(name) in listings)
+    return found / len(truth)
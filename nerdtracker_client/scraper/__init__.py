@@ -1,7 +1,26 @@
-from nerdtracker_client.scraper.tracker_gg_scraper import (
-    create_scraper,
-    parse_tracker_html,
-    retrieve_page_from_tracker,
-    retrieve_stats,
-    retrieve_stats_multiple,
-)
+from typing import TYPE_CHECKING
+
+from nerdtracker_client.lazy import lazy_exports
+
+# The scraper pulls in cloudscraper and bs4, so it is only imported when one
+# of its functions is first accessed.
+_EXPORTS = {
+    "nerdtracker_client.scraper.tracker_gg_scraper": [
+        "create_scraper",
+        "parse_tracker_html",
+        "retrieve_page_from_tracker",
+        "retrieve_stats",
+        "retrieve_stats_multiple",
+    ],
+}
+__all__ = [name for names in _EXPORTS.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from nerdtracker_client.scraper.tracker_gg_scraper import (
+        create_scraper,
+        parse_tracker_html,
+        retrieve_page_from_tracker,
+        retrieve_stats,
+        retrieve_stats_multiple,
+    )
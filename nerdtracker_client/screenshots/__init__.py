@@ -0,0 +1,105 @@
+from typing import TYPE_CHECKING
+
+from nerdtracker_client.lazy import lazy_exports
+
+# The screenshot modules pull in mss, numpy and requests, so they are only
+# imported when first accessed.
+_EXPORTS = {
+    "nerdtracker_client.screenshots.buffers": ["FrameRing"],
+    "nerdtracker_client.screenshots.change_detection": ["ChangeDetector"],
+    "nerdtracker_client.screenshots.encoders": [
+        "EncodeStats",
+        "FrameEncoder",
+        "JpegEncoder",
+        "PngEncoder",
+        "WebpEncoder",
+        "ZlibEncoder",
+        "ZstdEncoder",
+        "create_encoder",
+    ],
+    "nerdtracker_client.screenshots.pipeline": [
+        "CapturePipeline",
+        "DropOldestQueue",
+    ],
+    "nerdtracker_client.screenshots.rate": [
+        "AdaptiveRate",
+        "ScoreboardDetector",
+    ],
+    "nerdtracker_client.screenshots.regions": [
+        "PRESETS",
+        "Region",
+        "parse_regions",
+    ],
+    "nerdtracker_client.screenshots.scheduler": ["AsyncScheduler"],
+    "nerdtracker_client.screenshots.screenshotter": ["Screenshotter"],
+    "nerdtracker_client.screenshots.synthetic": ["SyntheticScreen"],
+    "nerdtracker_client.screenshots.tiles": ["TileReassembler", "TileTracker"],
+    "nerdtracker_client.screenshots.transport": [
+        "HttpxTransport",
+        "RequestsTransport",
+        "Transport",
+        "create_transport",
+    ],
+    "nerdtracker_client.screenshots.wire": [
+        "DecodedFrame",
+        "FrameBundle",
+        "FrameHeader",
+        "FramePayload",
+        "decode_frame",
+        "decode_frames",
+        "encode_frame",
+        "frame_to_array",
+    ],
+}
+__all__ = [name for names in _EXPORTS.values() for name in names]
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from nerdtracker_client.screenshots.buffers import FrameRing
+    from nerdtracker_client.screenshots.change_detection import ChangeDetector
+    from nerdtracker_client.screenshots.encoders import (
+        EncodeStats,
+        FrameEncoder,
+        JpegEncoder,
+        PngEncoder,
+        WebpEncoder,
+        ZlibEncoder,
+        ZstdEncoder,
+        create_encoder,
+    )
+    from nerdtracker_client.screenshots.pipeline import (
+        CapturePipeline,
+        DropOldestQueue,
+    )
+    from nerdtracker_client.screenshots.rate import (
+        AdaptiveRate,
+        ScoreboardDetector,
+    )
+    from nerdtracker_client.screenshots.regions import (
+        PRESETS,
+        Region,
+        parse_regions,
+    )
+    from nerdtracker_client.screenshots.scheduler import AsyncScheduler
+    from nerdtracker_client.screenshots.screenshotter import Screenshotter
+    from nerdtracker_client.screenshots.synthetic import SyntheticScreen
+    from nerdtracker_client.screenshots.tiles import (
+        TileReassembler,
+        TileTracker,
+    )
+    from nerdtracker_client.screenshots.transport import (
+        HttpxTransport,
+        RequestsTransport,
+        Transport,
+        create_transport,
+    )
+    from nerdtracker_client.screenshots.wire import (
+        DecodedFrame,
+        FrameBundle,
+        FrameHeader,
+        FramePayload,
+        decode_frame,
+        decode_frames,
+        encode_frame,
+        frame_to_array,
+    )
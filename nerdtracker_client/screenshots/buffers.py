@@ -0,0 +1,209 @@
+import collections
+import threading
+from typing import TYPE_CHECKING
+
+from nerdtracker_client.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = lazy_module("numpy")
+
+BGR = "bgr"
+GRAY = "gray"
+PIXEL_FORMATS = [BGR, GRAY]
+
+# BT.601 luma weights of the blue, green and red channels, out of 256.
+GRAY_WEIGHTS = (29, 150, 77)
+
+
+def converted_shape(
+    height: int, width: int, pixel_format: str = BGR, downscale: int = 1
+) -> tuple[int, ...]:
+    """The shape of a frame once converted.
+
+    Args:
+        height (int): Height of the captured frame, in pixels.
+        width (int): Width of the captured frame, in pixels.
+        pixel_format (str): Either bgr or gray. Defaults to bgr.
+        downscale (int): Only one pixel in downscale is kept along each axis.
+            Defaults to 1.
+
+    Raises:
+        ValueError: If the pixel format is unknown, or downscale is less than
+            1.
+
+    Returns:
+        tuple[int, ...]: Height, width, then 3 channels for bgr
+    """
+    if pixel_format not in PIXEL_FORMATS:
+        raise ValueError(f"Unknown pixel format {pixel_format!r}.")
+    if downscale < 1:
+        raise ValueError("downscale must be at least 1.")
+    shape = (-(-height // downscale), -(-width // downscale))
+    return shape + (3,) if pixel_format == BGR else shape
+
+
+def convert_frame(
+    source: "npt.NDArray[np.uint8]",
+    out: "npt.NDArray[np.uint8]",
+    pixel_format: str = BGR,
+    downscale: int = 1,
+    scratch: "tuple[npt.NDArray, npt.NDArray] | None" = None,
+) -> "npt.NDArray[np.uint8]":
+    """Converts a captured BGRA frame into a C-contiguous array, in place.
+
+    Args:
+        source (npt.NDArray[np.uint8]): The captured frame, height x width x
+            4 BGRA, such as a view of an mss screenshot.
+        out (npt.NDArray[np.uint8]): The array to write to, of the shape given
+            by converted_shape.
+        pixel_format (str): Either bgr, dropping the alpha channel, or gray,
+            the luma of the pixels. Defaults to bgr.
+        downscale (int): Only one pixel in downscale is kept along each axis.
+            Defaults to 1.
+        scratch (tuple[npt.NDArray, npt.NDArray] | None): Two uint16 arrays
+            of the shape of out, to compute the luma in, so that gray needs
+            no allocation. Defaults to None, which allocates them.
+
+    Returns:
+        npt.NDArray[np.uint8]: out
+    """
+    pixels = source[::downscale, ::downscale] if downscale > 1 else source
+    if pixel_format == BGR:
+        # A channel at a time is several times faster than copying the
+        # pixels, whose innermost axis is only 3 channels long.
+        for channel in range(3):
+            np.copyto(out[:, :, channel], pixels[:, :, channel])
+        return out
+    if scratch is None:
+        scratch = (
+            np.empty(out.shape, dtype=np.uint16),
+            np.empty(out.shape, dtype=np.uint16),
+        )
+    total, term = scratch
+    blue, green, red = GRAY_WEIGHTS
+    np.multiply(pixels[:, :, 0], blue, out=total, dtype=np.uint16)
+    np.multiply(pixels[:, :, 1], green, out=term, dtype=np.uint16)
+    np.add(total, term, out=total)
+    np.multiply(pixels[:, :, 2], red, out=term, dtype=np.uint16)
+    np.add(total, term, out=total)
+    # Rounded, the weights summing to 256 keep it within 255.
+    np.add(total, 128, out=total)
+    np.right_shift(total, 8, out=total)
+    np.copyto(out, total, casting="unsafe")
+    return out
+
+
+class FrameRing:
+    """FrameRing class converts captured frames of one area into a ring of
+    preallocated, C-contiguous buffers, instead of allocating every frame. A
+    buffer is reused once released, after the upload of its frame finished.
+    When every buffer is still in use, a new array is allocated instead, so
+    capturing never waits.
+
+    Converting is not thread-safe, releasing is.
+    """
+
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        size: int = 4,
+        pixel_format: str = BGR,
+        downscale: int = 1,
+    ) -> None:
+        """Constructor for the FrameRing class
+
+        Args:
+            height (int): Height of the captured frames, in pixels.
+            width (int): Width of the captured frames, in pixels.
+            size (int): Number of buffers, at least the number of frames in
+                flight at once. Defaults to 4.
+            pixel_format (str): Either bgr or gray, see convert_frame.
+                Defaults to bgr.
+            downscale (int): Only one pixel in downscale is kept along each
+                axis. Defaults to 1.
+        """
+        self.pixel_format = pixel_format
+        self.downscale = downscale
+        self.shape = converted_shape(height, width, pixel_format, downscale)
+        self.buffers = [
+            np.empty(self.shape, dtype=np.uint8) for _ in range(size)
+        ]
+        self.buffered = 0
+        self.allocated = 0
+        self._indices = {
+            id(buffer): index for index, buffer in enumerate(self.buffers)
+        }
+        self._free = collections.deque(range(size))
+        self._lock = threading.Lock()
+        self._scratch = (
+            (
+                np.empty(self.shape, dtype=np.uint16),
+                np.empty(self.shape, dtype=np.uint16),
+            )
+            if pixel_format == GRAY
+            else None
+        )
+
+    def __repr__(self) -> str:
+        out_str = (
+            "FrameRing("
+            + f"Shape: {self.shape}, "
+            + f"Free: {self.free}/{len(self.buffers)}, "
+            + f"Buffered: {self.buffered}, "
+            + f"Allocated: {self.allocated}"
+            + ")"
+        )
+        return out_str
+
+    @property
+    def free(self) -> int:
+        """The number of buffers free to be reused
+
+        Returns:
+            int: The number of buffers not holding a frame in use
+        """
+        with self._lock:
+            return len(self._free)
+
+    def convert(
+        self, source: "npt.NDArray[np.uint8]"
+    ) -> "npt.NDArray[np.uint8]":
+        """Converts a captured frame into the next free buffer.
+
+        Args:
+            source (npt.NDArray[np.uint8]): The captured frame, height x width
+                x 4 BGRA.
+
+        Returns:
+            npt.NDArray[np.uint8]: The converted frame, in a buffer of the
+                ring until released, or a new array if none was free
+        """
+        with self._lock:
+            index = self._free.popleft() if self._free else None
+        if index is None:
+            self.allocated += 1
+            out = np.empty(self.shape, dtype=np.uint8)
+        else:
+            self.buffered += 1
+            out = self.buffers[index]
+        return convert_frame(
+            source, out, self.pixel_format, self.downscale, self._scratch
+        )
+
+    def release(self, frame: "npt.NDArray[np.uint8]") -> None:
+        """Makes the buffer of a converted frame free to be reused. Frames
+        that are not buffers of the ring, or already free, are ignored.
+
+        Args:
+            frame (npt.NDArray[np.uint8]): The frame, returned by convert.
+        """
+        index = self._indices.get(id(frame))
+        if index is None:
+            return
+        with self._lock:
+            if index not in self._free:
+                self._free.append(index)
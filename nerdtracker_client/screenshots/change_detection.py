@@ -0,0 +1,134 @@
+from typing import TYPE_CHECKING, Sequence
+
+from nerdtracker_client.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = lazy_module("numpy")
+
+
+def mean_absolute_difference(
+    previous: "npt.NDArray[np.uint8]", current: "npt.NDArray[np.uint8]"
+) -> float:
+    """Mean absolute difference between two frames of the same shape.
+
+    Args:
+        previous (npt.NDArray[np.uint8]): The first frame.
+        current (npt.NDArray[np.uint8]): The second frame.
+
+    Returns:
+        float: The mean absolute difference per pixel channel, from 0 to 255
+    """
+    difference = np.subtract(current, previous, dtype=np.int16)
+    return float(np.abs(difference).mean())
+
+
+class ChangeDetector:
+    """ChangeDetector class decides whether a frame changed enough since the
+    last one sent to be worth sending. Frames are compared with the mean
+    absolute difference of a strided view, one pixel in stride x stride,
+    which is cheap next to encoding and uploading them.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        stride: int = 8,
+        max_skipped: int | None = None,
+    ) -> None:
+        """Constructor for the ChangeDetector class
+
+        Args:
+            threshold (float): Minimum mean absolute difference, from 0 to
+                255, for a frame to count as changed. Defaults to 1.0.
+            stride (int): Only one pixel in stride is compared along each
+                axis. Defaults to 8.
+            max_skipped (int | None): Number of frames skipped in a row after
+                which a frame is sent regardless, so the server keeps hearing
+                from the client. Defaults to None, which never forces a
+                frame.
+        """
+        self.threshold = threshold
+        self.stride = stride
+        self.max_skipped = max_skipped
+        self.checked = 0
+        self.skipped = 0
+        self.bytes_saved = 0
+        self._skipped_in_a_row = 0
+        self._reference: list["npt.NDArray[np.uint8]"] | None = None
+
+    def __repr__(self) -> str:
+        out_str = (
+            "ChangeDetector("
+            + f"Threshold: {self.threshold}, "
+            + f"Checked: {self.checked}, "
+            + f"Skipped: {self.skipped}, "
+            + f"Bytes Saved: {self.bytes_saved}"
+            + ")"
+        )
+        return out_str
+
+    def sample(self, frame: "npt.NDArray[np.uint8]") -> "npt.NDArray[np.uint8]":
+        """Copies the strided view of a frame that is compared.
+
+        Args:
+            frame (npt.NDArray[np.uint8]): The frame.
+
+        Returns:
+            npt.NDArray[np.uint8]: One pixel in stride along each axis
+        """
+        return frame[:: self.stride, :: self.stride].copy()
+
+    def difference(self, frames: "Sequence[npt.NDArray[np.uint8]]") -> float:
+        """The largest difference between frames and the last frames sent.
+
+        Args:
+            frames (Sequence[npt.NDArray[np.uint8]]): The frames, such as the
+                screenshot of each region.
+
+        Returns:
+            float: The largest mean absolute difference of any frame, infinite
+                if nothing was sent yet or the frames changed shape
+        """
+        # Read once, since reset may be called from another thread.
+        references = self._reference
+        if (references is None) or (len(frames) != len(references)):
+            return float("inf")
+        largest = 0.0
+        for frame, reference in zip(frames, references):
+            sample = frame[:: self.stride, :: self.stride]
+            if sample.shape != reference.shape:
+                return float("inf")
+            largest = max(largest, mean_absolute_difference(reference, sample))
+        return largest
+
+    def check(self, frames: "Sequence[npt.NDArray[np.uint8]]") -> bool:
+        """Checks whether frames changed enough to be sent, counting them as
+        skipped otherwise. Changed frames become the reference for the next
+        check.
+
+        Args:
+            frames (Sequence[npt.NDArray[np.uint8]]): The frames, such as the
+                screenshot of each region.
+
+        Returns:
+            bool: Whether the frames should be sent
+        """
+        self.checked += 1
+        forced = (self.max_skipped is not None) and (
+            self._skipped_in_a_row >= self.max_skipped
+        )
+        if forced or (self.difference(frames) >= self.threshold):
+            self._reference = [self.sample(frame) for frame in frames]
+            self._skipped_in_a_row = 0
+            return True
+        self.skipped += 1
+        self._skipped_in_a_row += 1
+        self.bytes_saved += sum(frame.nbytes for frame in frames)
+        return False
+
+    def reset(self) -> None:
+        """Forgets the last frames sent, so the next frames are sent"""
+        self._reference = None
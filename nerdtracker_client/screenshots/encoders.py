@@ -0,0 +1,494 @@
+import io
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from nerdtracker_client.lazy import lazy_module
+from nerdtracker_client.screenshots.wire import (
+    JPEG,
+    LAYOUTS,
+    PNG,
+    RAW,
+    WEBP,
+    ZLIB,
+    ZSTD,
+    DecodedFrame,
+    FrameHeader,
+    FramePayload,
+    byte_view,
+    frame_to_array,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    from PIL import Image
+else:
+    np = lazy_module("numpy")
+    Image = lazy_module("PIL.Image")
+
+# Pillow raw modes reading each channel layout straight from a numpy buffer,
+# keyed by layout. The alpha channel of BGRA frames is skipped.
+PILLOW_MODES = {
+    "GRAY": ("L", "L"),
+    "BGR": ("RGB", "BGR"),
+    "BGRA": ("RGB", "BGRX"),
+}
+
+
+class EncodedPayload(NamedTuple):
+    """The payload of a frame, along with what it decodes to"""
+
+    data: memoryview
+    dtype: str
+    layout: str
+    shape: tuple[int, ...]
+
+
+class FrameEncoder:
+    """FrameEncoder class encodes frames for the wire. This base class sends
+    the raw pixels. Subclasses compress them, and are selected by name
+    through create_encoder.
+    """
+
+    name = RAW
+    lossless = True
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+    def encode(self, frame: "npt.NDArray") -> EncodedPayload:
+        """Encodes a frame.
+
+        Args:
+            frame (npt.NDArray): The frame, as a height x width (x channels)
+                array.
+
+        Returns:
+            EncodedPayload: The payload and what it decodes to.
+        """
+        contiguous_frame = np.ascontiguousarray(frame)
+        return EncodedPayload(
+            byte_view(contiguous_frame),
+            contiguous_frame.dtype.str,
+            layout_of(frame),
+            tuple(contiguous_frame.shape),
+        )
+
+    def decode(self, payload: memoryview, header: FrameHeader) -> "npt.NDArray":
+        """Decodes a payload produced by encode.
+
+        Args:
+            payload (memoryview): The payload.
+            header (FrameHeader): The header sent with the payload.
+
+        Returns:
+            npt.NDArray: The frame.
+        """
+        return frame_to_array(DecodedFrame(header, payload))
+
+
+class PillowEncoder(FrameEncoder):
+    """PillowEncoder class compresses 8-bit frames into an image format
+    through Pillow. The alpha channel is dropped, and frames decode to BGR,
+    or GRAY for single channel frames.
+    """
+
+    name = PNG
+    image_format = "PNG"
+
+    def __init__(self, **save_options: Any) -> None:
+        """Constructor for the PillowEncoder class
+
+        Args:
+            **save_options (Any): Options passed to Image.save, such as
+                quality.
+        """
+        self.save_options = save_options
+
+    def __repr__(self) -> str:
+        options = ", ".join(
+            f"{key}={value}" for key, value in self.save_options.items()
+        )
+        return f"{type(self).__name__}({options})"
+
+    def encode(self, frame: "npt.NDArray") -> EncodedPayload:
+        """Encodes a frame into an image.
+
+        Args:
+            frame (npt.NDArray): The 8-bit GRAY, BGR or BGRA frame.
+
+        Raises:
+            ValueError: If the frame is not 8-bit GRAY, BGR or BGRA.
+
+        Returns:
+            EncodedPayload: The image and what it decodes to.
+        """
+        layout = layout_of(frame)
+        if (frame.dtype != np.uint8) or (layout not in PILLOW_MODES):
+            raise ValueError(f"Cannot encode a {frame.dtype} {layout} frame.")
+        mode, raw_mode = PILLOW_MODES[layout]
+        height, width = frame.shape[:2]
+        image = Image.frombuffer(
+            mode,
+            (width, height),
+            np.ascontiguousarray(frame),
+            "raw",
+            raw_mode,
+            0,
+            1,
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, self.image_format, **self.save_options)
+        decoded_layout = "GRAY" if mode == "L" else "BGR"
+        shape = (height, width) if mode == "L" else (height, width, 3)
+        return EncodedPayload(
+            buffer.getbuffer(), np.dtype(np.uint8).str, decoded_layout, shape
+        )
+
+    def decode(self, payload: memoryview, header: FrameHeader) -> "npt.NDArray":
+        """Decodes an image produced by encode.
+
+        Args:
+            payload (memoryview): The image.
+            header (FrameHeader): The header sent with the image.
+
+        Returns:
+            npt.NDArray: The frame, as GRAY or BGR.
+        """
+        with Image.open(io.BytesIO(payload)) as image:
+            pixels = np.asarray(image)
+        if pixels.ndim == 3:
+            # Pillow decodes to RGB.
+            pixels = np.ascontiguousarray(pixels[:, :, 2::-1])
+        return pixels
+
+
+class JpegEncoder(PillowEncoder):
+    """JpegEncoder class compresses frames into lossy JPEG images"""
+
+    name = JPEG
+    image_format = "JPEG"
+    lossless = False
+
+    def __init__(self, quality: int = 85) -> None:
+        """Constructor for the JpegEncoder class
+
+        Args:
+            quality (int): JPEG quality, from 1 to 95. Defaults to 85.
+        """
+        super().__init__(quality=quality)
+
+
+class WebpEncoder(PillowEncoder):
+    """WebpEncoder class compresses frames into WebP images, lossy unless
+    asked otherwise.
+    """
+
+    name = WEBP
+    image_format = "WEBP"
+
+    def __init__(self, quality: int = 80, lossless: bool = False) -> None:
+        """Constructor for the WebpEncoder class
+
+        Args:
+            quality (int): WebP quality, from 0 to 100. For lossless images,
+                the compression effort instead. Defaults to 80.
+            lossless (bool): Whether to compress losslessly. Defaults to
+                False.
+        """
+        super().__init__(quality=quality, lossless=lossless)
+        self.lossless = lossless
+
+
+class PngEncoder(PillowEncoder):
+    """PngEncoder class compresses frames into lossless PNG images"""
+
+    name = PNG
+    image_format = "PNG"
+
+    def __init__(self, compress_level: int = 1) -> None:
+        """Constructor for the PngEncoder class
+
+        Args:
+            compress_level (int): zlib compression level, from 0 to 9.
+                Defaults to 1, the fastest.
+        """
+        super().__init__(compress_level=compress_level)
+
+
+class ZlibEncoder(FrameEncoder):
+    """ZlibEncoder class compresses the raw pixel buffer losslessly with
+    zlib.
+    """
+
+    name = ZLIB
+
+    def __init__(self, level: int = 1) -> None:
+        """Constructor for the ZlibEncoder class
+
+        Args:
+            level (int): Compression level, from 0 to 9. Defaults to 1, the
+                fastest.
+        """
+        self.level = level
+
+    def __repr__(self) -> str:
+        return f"ZlibEncoder(level={self.level})"
+
+    def compress(self, data: memoryview) -> bytes:
+        """Compresses a buffer.
+
+        Args:
+            data (memoryview): The buffer.
+
+        Returns:
+            bytes: The compressed buffer
+        """
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: memoryview) -> bytes:
+        """Decompresses a buffer produced by compress.
+
+        Args:
+            data (memoryview): The compressed buffer.
+
+        Returns:
+            bytes: The buffer
+        """
+        return zlib.decompress(data)
+
+    def encode(self, frame: "npt.NDArray") -> EncodedPayload:
+        """Compresses the raw pixels of a frame.
+
+        Args:
+            frame (npt.NDArray): The frame.
+
+        Returns:
+            EncodedPayload: The compressed pixels and what they decode to.
+        """
+        raw = super().encode(frame)
+        return raw._replace(data=memoryview(self.compress(raw.data)))
+
+    def decode(self, payload: memoryview, header: FrameHeader) -> "npt.NDArray":
+        """Decompresses the raw pixels of a frame.
+
+        Args:
+            payload (memoryview): The compressed pixels.
+            header (FrameHeader): The header sent with the pixels.
+
+        Returns:
+            npt.NDArray: The frame.
+        """
+        return np.frombuffer(
+            self.decompress(payload), dtype=header.dtype
+        ).reshape(header.shape)
+
+
+class ZstdEncoder(ZlibEncoder):
+    """ZstdEncoder class compresses the raw pixel buffer losslessly with
+    Zstandard. Requires the optional zstandard package.
+    """
+
+    name = ZSTD
+
+    def __init__(self, level: int = 1) -> None:
+        """Constructor for the ZstdEncoder class
+
+        Args:
+            level (int): Compression level, from 1 to 22. Defaults to 1.
+
+        Raises:
+            ImportError: If the zstandard package is not installed.
+        """
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError(
+                "The zstd encoder requires the zstandard package."
+            ) from error
+        super().__init__(level)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def __repr__(self) -> str:
+        return f"ZstdEncoder(level={self.level})"
+
+    def compress(self, data: memoryview) -> bytes:
+        """Compresses a buffer.
+
+        Args:
+            data (memoryview): The buffer.
+
+        Returns:
+            bytes: The compressed buffer
+        """
+        return self._compressor.compress(data)
+
+    def decompress(self, data: memoryview) -> bytes:
+        """Decompresses a buffer produced by compress.
+
+        Args:
+            data (memoryview): The compressed buffer.
+
+        Returns:
+            bytes: The buffer
+        """
+        return self._decompressor.decompress(data)
+
+
+ENCODERS: dict[str, type[FrameEncoder]] = {
+    RAW: FrameEncoder,
+    JPEG: JpegEncoder,
+    WEBP: WebpEncoder,
+    PNG: PngEncoder,
+    ZLIB: ZlibEncoder,
+    ZSTD: ZstdEncoder,
+}
+
+
+class EncodeStats:
+    """EncodeStats class keeps running totals of how well and how fast frames
+    are encoded.
+    """
+
+    def __init__(self) -> None:
+        """Constructor for the EncodeStats class"""
+        self.frames = 0
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.encode_seconds = 0.0
+
+    def __repr__(self) -> str:
+        out_str = (
+            "EncodeStats("
+            + f"Frames: {self.frames}, "
+            + f"Ratio: {self.compression_ratio:.1f}, "
+            + f"Latency: {self.mean_latency_ms:.1f}ms"
+            + ")"
+        )
+        return out_str
+
+    @property
+    def compression_ratio(self) -> float:
+        """How many times smaller the encoded frames are than the raw ones
+
+        Returns:
+            float: The raw size divided by the encoded size
+        """
+        if self.encoded_bytes == 0:
+            return 1.0
+        return self.raw_bytes / self.encoded_bytes
+
+    @property
+    def mean_latency_ms(self) -> float:
+        """The mean time taken to encode a frame
+
+        Returns:
+            float: The mean time taken to encode a frame, in milliseconds
+        """
+        if self.frames == 0:
+            return 0.0
+        return self.encode_seconds / self.frames * 1e3
+
+    def record(
+        self, raw_bytes: int, encoded_bytes: int, seconds: float
+    ) -> None:
+        """Adds an encoded frame to the totals.
+
+        Args:
+            raw_bytes (int): The size of the raw frame.
+            encoded_bytes (int): The size of the encoded frame.
+            seconds (float): The time taken to encode the frame.
+        """
+        self.frames += 1
+        self.raw_bytes += raw_bytes
+        self.encoded_bytes += encoded_bytes
+        self.encode_seconds += seconds
+
+
+def layout_of(frame: "npt.NDArray") -> str:
+    """Infers the channel layout of a frame from its number of channels.
+
+    Args:
+        frame (npt.NDArray): The frame.
+
+    Returns:
+        str: GRAY, BGR or BGRA, or an empty string if unknown.
+    """
+    channels = 1 if frame.ndim < 3 else frame.shape[2]
+    return LAYOUTS.get(channels, "")
+
+
+def create_encoder(name: str = RAW, **options: Any) -> FrameEncoder:
+    """Creates an encoder by name, such as from a deployment setting.
+
+    Args:
+        name (str): One of raw, jpeg, webp, png, zlib or zstd. Defaults to
+            raw.
+        **options (Any): Options passed to the encoder, such as quality.
+
+    Raises:
+        ValueError: If there is no encoder with that name.
+
+    Returns:
+        FrameEncoder: The encoder.
+    """
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown encoder {name!r}.")
+    return ENCODERS[name](**options)
+
+
+def encode(
+    frame: "npt.NDArray",
+    encoder: FrameEncoder | None = None,
+    frame_id: int = 0,
+    timestamp: float | None = None,
+    stats: EncodeStats | None = None,
+) -> FramePayload:
+    """Encodes a frame and wraps it for the wire.
+
+    Args:
+        frame (npt.NDArray): The frame.
+        encoder (FrameEncoder | None): The encoder to use. Defaults to None,
+            which sends the raw pixels.
+        frame_id (int): Increasing identifier of the frame. Defaults to 0.
+        timestamp (float | None): When the frame was captured, or None to use
+            the current time. Defaults to None.
+        stats (EncodeStats | None): Totals to add the frame to. Defaults to
+            None.
+
+    Returns:
+        FramePayload: The frame, ready to be sent.
+    """
+    encoder = encoder if encoder is not None else FrameEncoder()
+    started = time.perf_counter()
+    encoded = encoder.encode(frame)
+    if stats is not None:
+        stats.record(
+            frame.nbytes, encoded.data.nbytes, time.perf_counter() - started
+        )
+    header = FrameHeader(
+        encoding=encoder.name,
+        dtype=encoded.dtype,
+        layout=encoded.layout,
+        shape=encoded.shape,
+        frame_id=frame_id,
+        timestamp=time.time() if timestamp is None else timestamp,
+        payload_length=encoded.data.nbytes,
+    )
+    return FramePayload(header, encoded.data)
+
+
+def decode(frame: DecodedFrame) -> "npt.NDArray":
+    """Decodes the pixels of a frame read back with wire.decode_frame,
+    whatever its encoding.
+
+    Args:
+        frame (DecodedFrame): The frame.
+
+    Returns:
+        npt.NDArray: The pixels.
+    """
+    decoder = create_encoder(frame.header.encoding)
+    return decoder.decode(frame.payload, frame.header)
@@ -0,0 +1,294 @@
+import collections
+import concurrent.futures
+import threading
+from typing import Any, Callable, NamedTuple
+
+
+class QueueClosed(Exception):
+    """Raised when getting from a DropOldestQueue that is closed and empty"""
+
+
+class StageMetrics(NamedTuple):
+    """The state of the queue feeding a stage of a pipeline"""
+
+    depth: int
+    max_depth: int
+    dropped: int
+    processed: int
+
+
+class DropOldestQueue:
+    """DropOldestQueue class is a bounded, thread-safe FIFO queue that never
+    blocks producers: putting an item in a full queue drops the oldest one
+    instead, so consumers always get the most recent items.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        on_drop: Callable[[Any], None] | None = None,
+    ) -> None:
+        """Constructor for the DropOldestQueue class
+
+        Args:
+            maxsize (int): Maximum number of items held.
+            on_drop (Callable[[Any], None] | None): Function called, by the
+                producer, with each item dropped. Defaults to None.
+
+        Raises:
+            ValueError: If maxsize is less than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self.max_depth = 0
+        self.dropped = 0
+        self.processed = 0
+        self.closed = False
+        self._items: collections.deque[Any] = collections.deque()
+        self._not_empty = threading.Condition()
+
+    def __repr__(self) -> str:
+        out_str = (
+            "DropOldestQueue("
+            + f"Depth: {len(self)}/{self.maxsize}, "
+            + f"Dropped: {self.dropped}"
+            + ")"
+        )
+        return out_str
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any) -> None:
+        """Adds an item, dropping the oldest one if the queue is full.
+
+        Args:
+            item (Any): The item.
+
+        Raises:
+            QueueClosed: If the queue is closed.
+        """
+        dropped: list[Any] = []
+        with self._not_empty:
+            if self.closed:
+                raise QueueClosed("Cannot put in a closed queue.")
+            while len(self._items) >= self.maxsize:
+                dropped.append(self._items.popleft())
+            self._items.append(item)
+            self.dropped += len(dropped)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._not_empty.notify()
+        if self.on_drop is not None:
+            for dropped_item in dropped:
+                self.on_drop(dropped_item)
+
+    def get(self, timeout: float | None = None) -> Any:
+        """Removes and returns the oldest item, waiting for one if empty.
+
+        Args:
+            timeout (float | None): Maximum time to wait, in seconds. Defaults
+                to None, which waits until an item is put or the queue is
+                closed.
+
+        Raises:
+            QueueClosed: If the queue is closed and empty.
+            TimeoutError: If no item was put in time.
+
+        Returns:
+            Any: The oldest item
+        """
+        with self._not_empty:
+            if not self._not_empty.wait_for(
+                lambda: self._items or self.closed, timeout
+            ):
+                raise TimeoutError("No item was put in time.")
+            if not self._items:
+                raise QueueClosed("The queue is closed.")
+            self.processed += 1
+            return self._items.popleft()
+
+    def close(self) -> None:
+        """Closes the queue. Items already in it can still be got, after
+        which getting raises QueueClosed."""
+        with self._not_empty:
+            self.closed = True
+            self._not_empty.notify_all()
+
+    def metrics(self) -> StageMetrics:
+        """The state of the queue.
+
+        Returns:
+            StageMetrics: The current and maximum depth, and the number of
+                items dropped and got so far.
+        """
+        with self._not_empty:
+            return StageMetrics(
+                len(self._items), self.max_depth, self.dropped, self.processed
+            )
+
+
+class CapturePipeline:
+    """CapturePipeline class encodes and uploads captures on their own
+    threads, so that capturing never waits for them. Captures go through an
+    encode queue to a single encode thread, which keeps their order, then
+    through an upload queue to the upload workers. Both queues are bounded
+    and drop their oldest item when full, so a slow server delays nothing
+    and the newest captures are always the ones sent.
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[Any], Any],
+        upload: Callable[[Any], Any],
+        upload_workers: int = 1,
+        encode_queue_size: int = 2,
+        upload_queue_size: int = 2,
+        on_drop: Callable[[Any], None] | None = None,
+    ) -> None:
+        """Constructor for the CapturePipeline class
+
+        Args:
+            encode (Callable[[Any], Any]): Function encoding a capture into
+                what to upload. Always called from the same thread, in order.
+            upload (Callable[[Any], Any]): Function uploading an encoded
+                capture, returning the result of its future.
+            upload_workers (int): Number of threads uploading at the same
+                time. With more than one, uploads can complete out of order.
+                Defaults to 1.
+            encode_queue_size (int): Maximum number of captures waiting to be
+                encoded. Defaults to 2.
+            upload_queue_size (int): Maximum number of encoded captures
+                waiting to be uploaded. Defaults to 2.
+            on_drop (Callable[[Any], None] | None): Function called, on the
+                encode thread, with each encoded capture dropped before it
+                was uploaded. Defaults to None.
+        """
+        self.encode = encode
+        self.upload = upload
+        self.on_drop = on_drop
+        self.submitted = 0
+        self.errors = 0
+        self._encode_queue = DropOldestQueue(
+            encode_queue_size, self._drop_capture
+        )
+        self._upload_queue = DropOldestQueue(
+            upload_queue_size, self._drop_encoded
+        )
+        self._errors_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(
+                target=self._encode_loop, name="capture-encoder", daemon=True
+            )
+        ] + [
+            threading.Thread(
+                target=self._upload_loop,
+                name=f"capture-uploader-{index}",
+                daemon=True,
+            )
+            for index in range(upload_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __repr__(self) -> str:
+        out_str = (
+            "CapturePipeline("
+            + f"Submitted: {self.submitted}, "
+            + f"Encode: {self._encode_queue.metrics()}, "
+            + f"Upload: {self._upload_queue.metrics()}"
+            + ")"
+        )
+        return out_str
+
+    def submit(self, capture: Any) -> concurrent.futures.Future:
+        """Queues a capture to be encoded and uploaded. Never blocks.
+
+        Args:
+            capture (Any): The capture.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the result of the upload,
+                or is cancelled if the capture is dropped.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self.submitted += 1
+        self._encode_queue.put((capture, future))
+        return future
+
+    def metrics(self) -> dict[str, StageMetrics]:
+        """The state of the queue feeding each stage.
+
+        Returns:
+            dict[str, StageMetrics]: The metrics of the encode and upload
+                queues
+        """
+        return {
+            "encode": self._encode_queue.metrics(),
+            "upload": self._upload_queue.metrics(),
+        }
+
+    def close(self, wait: bool = True) -> None:
+        """Stops accepting captures. The ones already queued are still
+        encoded and uploaded.
+
+        Args:
+            wait (bool): Whether to wait for them. Defaults to True.
+        """
+        self._encode_queue.close()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _drop_capture(
+        self, item: tuple[Any, concurrent.futures.Future]
+    ) -> None:
+        item[1].cancel()
+
+    def _drop_encoded(
+        self, item: tuple[Any, concurrent.futures.Future]
+    ) -> None:
+        encoded, future = item
+        future.cancel()
+        if self.on_drop is not None:
+            self.on_drop(encoded)
+
+    def _encode_loop(self) -> None:
+        while True:
+            try:
+                capture, future = self._encode_queue.get()
+            except QueueClosed:
+                break
+            if future.cancelled():
+                continue
+            try:
+                encoded = self.encode(capture)
+            except Exception as exc:
+                self._count_error()
+                try:
+                    future.set_exception(exc)
+                except concurrent.futures.InvalidStateError:
+                    # Cancelled while encoding.
+                    pass
+                continue
+            self._upload_queue.put((encoded, future))
+        self._upload_queue.close()
+
+    def _upload_loop(self) -> None:
+        while True:
+            try:
+                encoded, future = self._upload_queue.get()
+            except QueueClosed:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.upload(encoded))
+            except Exception as exc:
+                self._count_error()
+                future.set_exception(exc)
+
+    def _count_error(self) -> None:
+        with self._errors_lock:
+            self.errors += 1
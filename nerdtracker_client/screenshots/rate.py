@@ -0,0 +1,247 @@
+import threading
+from typing import TYPE_CHECKING, Sequence
+
+from nerdtracker_client.lazy import lazy_module
+from nerdtracker_client.screenshots.change_detection import ChangeDetector
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = lazy_module("numpy")
+
+
+class ScoreboardDetector:
+    """ScoreboardDetector class guesses whether a frame shows the scoreboard,
+    which is light text over a mostly dark panel. A frame is a scoreboard if
+    most of a strided sample of its pixels is dark, and a small part of it is
+    light, unlike gameplay, menus or a black screen.
+    """
+
+    def __init__(
+        self,
+        stride: int = 4,
+        dark_level: int = 64,
+        text_level: int = 160,
+        min_dark_fraction: float = 0.5,
+        min_text_fraction: float = 0.02,
+        max_text_fraction: float = 0.4,
+    ) -> None:
+        """Constructor for the ScoreboardDetector class
+
+        Args:
+            stride (int): Only one pixel in stride is sampled along each axis.
+                Defaults to 4.
+            dark_level (int): Pixels with every channel below this level are
+                dark. Defaults to 64.
+            text_level (int): Pixels with every channel at or above this level
+                are light, like text. Defaults to 160.
+            min_dark_fraction (float): Minimum fraction of dark pixels.
+                Defaults to 0.5.
+            min_text_fraction (float): Minimum fraction of light pixels.
+                Defaults to 0.02.
+            max_text_fraction (float): Maximum fraction of light pixels.
+                Defaults to 0.4.
+        """
+        self.stride = stride
+        self.dark_level = dark_level
+        self.text_level = text_level
+        self.min_dark_fraction = min_dark_fraction
+        self.min_text_fraction = min_text_fraction
+        self.max_text_fraction = max_text_fraction
+
+    def __repr__(self) -> str:
+        out_str = (
+            "ScoreboardDetector("
+            + f"Stride: {self.stride}, "
+            + f"Dark: <{self.dark_level}, "
+            + f"Text: >={self.text_level}"
+            + ")"
+        )
+        return out_str
+
+    def fractions(self, frame: "npt.NDArray[np.uint8]") -> tuple[float, float]:
+        """The fractions of dark and light pixels of a frame.
+
+        Args:
+            frame (npt.NDArray[np.uint8]): The frame, gray or with 3 or 4
+                channels.
+
+        Returns:
+            tuple[float, float]: The fraction of dark pixels, then of light
+                pixels, of the sample
+        """
+        sample = frame[:: self.stride, :: self.stride]
+        if sample.size == 0:
+            return 0.0, 0.0
+        if sample.ndim == 2:
+            return (
+                float((sample < self.dark_level).mean()),
+                float((sample >= self.text_level).mean()),
+            )
+        sample = sample[:, :, :3]
+        dark = (sample < self.dark_level).all(axis=2).mean()
+        light = (sample >= self.text_level).all(axis=2).mean()
+        return float(dark), float(light)
+
+    def detect(self, frames: "Sequence[npt.NDArray[np.uint8]]") -> bool:
+        """Checks whether any frame shows the scoreboard.
+
+        Args:
+            frames (Sequence[npt.NDArray[np.uint8]]): The frames, such as the
+                screenshot of each region.
+
+        Returns:
+            bool: Whether any frame looks like a scoreboard
+        """
+        for frame in frames:
+            dark, light = self.fractions(frame)
+            if (dark >= self.min_dark_fraction) and (
+                self.min_text_fraction <= light <= self.max_text_fraction
+            ):
+                return True
+        return False
+
+
+class AdaptiveRate:
+    """AdaptiveRate class picks the time between two screenshots. It drops to
+    the minimum interval as soon as frames change or show the scoreboard, and
+    doubles it, up to the maximum, for every static frame. Independently, it
+    doubles the interval for every upload that is slow or fails, and halves
+    it back for every one that is fast, so an overloaded server is given
+    room. The interval used is the longest of the two.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 0.25,
+        max_interval: float = 4.0,
+        backoff: float = 2.0,
+        slow_latency: float = 1.0,
+        change_detector: ChangeDetector | None = None,
+        scoreboard_detector: ScoreboardDetector | None = None,
+    ) -> None:
+        """Constructor for the AdaptiveRate class
+
+        Args:
+            min_interval (float): Shortest time between two screenshots, in
+                seconds. Defaults to 0.25.
+            max_interval (float): Longest time between two screenshots, in
+                seconds. Defaults to 4.
+            backoff (float): Factor the interval is multiplied by, for every
+                static frame or slow upload. Defaults to 2.
+            slow_latency (float): Uploads taking longer than this, in
+                seconds, are slow. Defaults to 1.
+            change_detector (ChangeDetector | None): Decides whether frames
+                changed, when the screenshotter has no change detector of its
+                own. Defaults to None, which uses ChangeDetector().
+            scoreboard_detector (ScoreboardDetector | None): Decides whether
+                frames show the scoreboard. Defaults to None, which uses
+                ScoreboardDetector().
+
+        Raises:
+            ValueError: If the intervals are not positive and in order, or
+                the backoff is not more than 1.
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(
+                "The intervals must be positive, min_interval first."
+            )
+        if backoff <= 1:
+            raise ValueError("backoff must be more than 1.")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.slow_latency = slow_latency
+        self.change_detector = (
+            change_detector if change_detector is not None else ChangeDetector()
+        )
+        self.scoreboard_detector = (
+            scoreboard_detector
+            if scoreboard_detector is not None
+            else ScoreboardDetector()
+        )
+        self.activity_interval = min_interval
+        self.server_interval = min_interval
+        self.active_frames = 0
+        self.static_frames = 0
+        self.slow_uploads = 0
+        self.failed_uploads = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        out_str = (
+            "AdaptiveRate("
+            + f"Interval: {self.interval}s, "
+            + f"Active: {self.active_frames}, "
+            + f"Static: {self.static_frames}, "
+            + f"Slow: {self.slow_uploads}, "
+            + f"Failed: {self.failed_uploads}"
+            + ")"
+        )
+        return out_str
+
+    @property
+    def interval(self) -> float:
+        """The time to wait before the next screenshot
+
+        Returns:
+            float: The longest of the activity and server intervals, in
+                seconds
+        """
+        with self._lock:
+            return max(self.activity_interval, self.server_interval)
+
+    def record_frames(
+        self,
+        frames: "Sequence[npt.NDArray[np.uint8]]",
+        changed: bool | None = None,
+    ) -> bool:
+        """Adapts the interval to the activity on screen.
+
+        Args:
+            frames (Sequence[npt.NDArray[np.uint8]]): The frames just taken,
+                such as the screenshot of each region.
+            changed (bool | None): Whether the frames changed, if already
+                known. Defaults to None, which checks them with the change
+                detector.
+
+        Returns:
+            bool: Whether the frames were active, changed or showing the
+                scoreboard
+        """
+        if changed is None:
+            changed = self.change_detector.check(frames)
+        active = changed or self.scoreboard_detector.detect(frames)
+        with self._lock:
+            if active:
+                self.active_frames += 1
+                self.activity_interval = self.min_interval
+            else:
+                self.static_frames += 1
+                self.activity_interval = min(
+                    self.activity_interval * self.backoff, self.max_interval
+                )
+        return active
+
+    def record_upload(self, latency: float, succeeded: bool = True) -> None:
+        """Adapts the interval to how the server is coping.
+
+        Args:
+            latency (float): Time the upload took, in seconds.
+            succeeded (bool): Whether the server accepted the upload. Defaults
+                to True.
+        """
+        with self._lock:
+            if not succeeded:
+                self.failed_uploads += 1
+            elif latency > self.slow_latency:
+                self.slow_uploads += 1
+            else:
+                self.server_interval = max(
+                    self.server_interval / self.backoff, self.min_interval
+                )
+                return
+            self.server_interval = min(
+                self.server_interval * self.backoff, self.max_interval
+            )
@@ -0,0 +1,124 @@
+from typing import Any, NamedTuple, Sequence
+
+
+class Region(NamedTuple):
+    """A named area of the monitor, in fractions of its width and height so
+    that it applies to any resolution"""
+
+    name: str
+    left: float
+    top: float
+    width: float
+    height: float
+
+    def to_monitor(self, monitor: dict[str, Any]) -> dict[str, int]:
+        """Converts the region to pixels within a monitor, in the format
+        mss.grab takes.
+
+        Args:
+            monitor (dict[str, Any]): The monitor, from mss.mss().monitors.
+
+        Returns:
+            dict[str, int]: The left, top, width and height of the region, in
+                pixels.
+        """
+        left = round(self.left * monitor["width"])
+        top = round(self.top * monitor["height"])
+        right = round((self.left + self.width) * monitor["width"])
+        bottom = round((self.top + self.height) * monitor["height"])
+        return {
+            "left": monitor["left"] + left,
+            "top": monitor["top"] + top,
+            "width": max(right - left, 1),
+            "height": max(bottom - top, 1),
+        }
+
+
+# Presets of regions, measured on the Modern Warfare scoreboard, which scales
+# with the resolution.
+PRESETS: dict[str, list[Region]] = {
+    "full": [Region("full", 0.0, 0.0, 1.0, 1.0)],
+    "scoreboard": [Region("scoreboard", 0.1, 0.15, 0.8, 0.7)],
+    "player_names": [
+        Region("friendly_names", 0.12, 0.22, 0.2, 0.3),
+        Region("enemy_names", 0.12, 0.55, 0.2, 0.3),
+    ],
+}
+
+
+def resolve_regions(regions: str | Sequence[Region]) -> list[Region]:
+    """Resolves a preset name or a sequence of regions into regions, checking
+    that every region lies within the monitor.
+
+    Args:
+        regions (str | Sequence[Region]): The name of a preset, from PRESETS,
+            or the regions.
+
+    Raises:
+        ValueError: If the preset does not exist, there are no regions, or a
+            region does not lie within the monitor.
+
+    Returns:
+        list[Region]: The regions.
+    """
+    if isinstance(regions, str):
+        if regions not in PRESETS:
+            raise ValueError(f"Unknown region preset: {regions}")
+        regions = PRESETS[regions]
+    if not regions:
+        raise ValueError("At least one region is required.")
+    for region in regions:
+        if not (
+            (0.0 <= region.left < 1.0)
+            and (0.0 <= region.top < 1.0)
+            and (0.0 < region.width <= 1.0 - region.left)
+            and (0.0 < region.height <= 1.0 - region.top)
+        ):
+            raise ValueError(
+                f"Region does not lie within the monitor: {region}"
+            )
+    return list(regions)
+
+
+def format_regions(regions: Sequence[Region], monitor: dict[str, Any]) -> str:
+    """Describes where regions were captured, in pixels relative to the
+    monitor, as sent alongside the frames of a bundle.
+
+    Args:
+        regions (Sequence[Region]): The regions, in the order of the frames.
+        monitor (dict[str, Any]): The monitor they were captured from.
+
+    Returns:
+        str: name=left,top,width,height for every region, separated by
+            semicolons
+    """
+    areas = []
+    for region in regions:
+        area = region.to_monitor(monitor)
+        areas.append(
+            f"{region.name}={area['left'] - monitor['left']},"
+            + f"{area['top'] - monitor['top']},"
+            + f"{area['width']},{area['height']}"
+        )
+    return ";".join(areas)
+
+
+def parse_regions(description: str) -> dict[str, tuple[int, int, int, int]]:
+    """Parses a description produced by format_regions.
+
+    Args:
+        description (str): The description.
+
+    Raises:
+        ValueError: If the description is malformed.
+
+    Returns:
+        dict[str, tuple[int, int, int, int]]: The left, top, width and height
+            of each region, in pixels relative to the monitor, in order.
+    """
+    areas: dict[str, tuple[int, int, int, int]] = {}
+    for entry in description.split(";"):
+        name, _, values = entry.partition("=")
+        left, top, width, height = (int(value) for value in values.split(","))
+        areas[name] = (left, top, width, height)
+    return areas
@@ -0,0 +1,125 @@
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable
+
+
+class AsyncScheduler:
+    """AsyncScheduler class calls a coroutine function at an interval on the
+    running event loop, without any thread. Each deadline is one interval
+    after the previous one on the monotonic clock, so a late tick does not
+    delay the next ones, and the interval can be changed between ticks.
+    A tick that is late by less than an interval runs straight away, while
+    ticks whose deadline passed a whole interval or more ago, while the
+    previous one was running, are skipped and counted as missed instead of
+    run in a burst.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        clock: Callable[[], float] | None = None,
+        sleep: Callable[[float], Awaitable[Any]] | None = None,
+    ) -> None:
+        """Constructor for the AsyncScheduler class
+
+        Args:
+            interval (float): Time between two ticks, in seconds. Must be
+                positive.
+            clock (Callable[[], float] | None): Function returning the current
+                time in seconds. Defaults to None, which uses time.monotonic.
+            sleep (Callable[[float], Awaitable[Any]] | None): Coroutine
+                function sleeping for a number of seconds. Defaults to None,
+                which uses asyncio.sleep.
+
+        Raises:
+            ValueError: If the interval is not positive.
+        """
+        self.interval = interval
+        self.clock = clock if clock is not None else time.monotonic
+        self.sleep = sleep if sleep is not None else asyncio.sleep
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.max_lateness = 0.0
+        self.running = False
+        self._stopping = False
+
+    def __repr__(self) -> str:
+        out_str = (
+            "AsyncScheduler("
+            + f"Interval: {self.interval}s, "
+            + f"Ticks: {self.ticks}, "
+            + f"Missed: {self.missed_ticks}"
+            + ")"
+        )
+        return out_str
+
+    @property
+    def interval(self) -> float:
+        """The time between two ticks, read after every tick
+
+        Returns:
+            float: The time between two ticks, in seconds
+        """
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval: float) -> None:
+        """Sets the time between two ticks, from the next tick on.
+
+        Args:
+            interval (float): The time between two ticks, in seconds.
+
+        Raises:
+            ValueError: If the interval is not positive.
+        """
+        if not interval > 0:
+            raise ValueError("The interval must be positive.")
+        self._interval = interval
+
+    async def run(
+        self,
+        callback: Callable[[], Awaitable[Any]],
+        ticks: int | None = None,
+    ) -> None:
+        """Calls a coroutine function at every tick, until stopped, cancelled
+        or after a number of ticks. The first tick is immediate.
+
+        Args:
+            callback (Callable[[], Awaitable[Any]]): The coroutine function.
+            ticks (int | None): Number of ticks to run, or None to run until
+                stopped or cancelled. Defaults to None.
+        """
+        self.running = True
+        self._stopping = False
+        deadline = self.clock()
+        ran = 0
+        try:
+            while not self._stopping and ((ticks is None) or (ran < ticks)):
+                delay = deadline - self.clock()
+                if delay > 0:
+                    await self.sleep(delay)
+                    if self._stopping:
+                        break
+                self.max_lateness = max(
+                    self.max_lateness, self.clock() - deadline
+                )
+                await callback()
+                self.ticks += 1
+                ran += 1
+                # Read after every tick, as the interval may be adapted.
+                interval = self.interval
+                deadline += interval
+                # Only the ticks a whole interval late are missed, the
+                # current one runs straight away.
+                missed = math.floor((self.clock() - deadline) / interval)
+                if missed > 0:
+                    self.missed_ticks += missed
+                    deadline += missed * interval
+        finally:
+            self.running = False
+
+    def stop(self) -> None:
+        """Stops running after the current tick or sleep. To stop straight
+        away, cancel the task running the scheduler instead."""
+        self._stopping = True
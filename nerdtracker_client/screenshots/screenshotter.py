@@ -1,11 +1,65 @@
+import asyncio
+import concurrent.futures
 import time
-from threading import Timer
+from threading import RLock, Timer
 from types import TracebackType
+from typing import TYPE_CHECKING, Any, NamedTuple, Sequence
 
-import mss
-import numpy as np
-import numpy.typing as npt
-import requests
+from nerdtracker_client.lazy import lazy_module
+from nerdtracker_client.screenshots.buffers import (
+    BGR,
+    FrameRing,
+    convert_frame,
+    converted_shape,
+)
+from nerdtracker_client.screenshots.change_detection import ChangeDetector
+from nerdtracker_client.screenshots.encoders import (
+    EncodeStats,
+    FrameEncoder,
+    encode,
+)
+from nerdtracker_client.screenshots.pipeline import CapturePipeline
+from nerdtracker_client.screenshots.rate import AdaptiveRate
+from nerdtracker_client.screenshots.regions import (
+    Region,
+    format_regions,
+    resolve_regions,
+)
+from nerdtracker_client.screenshots.scheduler import AsyncScheduler
+from nerdtracker_client.screenshots.tiles import (
+    TileTracker,
+    encode_tile_update,
+)
+from nerdtracker_client.screenshots.transport import (
+    RequestsTransport,
+    Transport,
+)
+from nerdtracker_client.screenshots.wire import (
+    CONTENT_TYPE,
+    FrameBundle,
+    FramePayload,
+)
+
+if TYPE_CHECKING:
+    import mss
+    import numpy as np
+    import numpy.typing as npt
+else:
+    # Only loaded when the first Screenshotter is created.
+    mss = lazy_module("mss")
+    np = lazy_module("numpy")
+
+# HTTP header describing where the frames of a bundle were captured, see
+# regions.format_regions.
+REGIONS_HEADER = "X-Nerdtracker-Regions"
+
+
+class Upload(NamedTuple):
+    """An encoded screenshot, ready to be posted"""
+
+    body: FramePayload | FrameBundle
+    headers: dict[str, str]
+    frame_id: int
 
 
 class Screenshotter:
@@ -24,6 +78,19 @@ class Screenshotter:
         time_interval: int | float = 0.5,
         start_immediately: bool = False,
         timeout: int | float = 10,
+        sct: Any | None = None,
+        encoder: FrameEncoder | None = None,
+        regions: str | Sequence[Region] | None = None,
+        change_detector: ChangeDetector | None = None,
+        tile_size: int | None = None,
+        keyframe_interval: int = 20,
+        upload_workers: int = 1,
+        queue_size: int = 2,
+        transport: Transport | None = None,
+        rate: AdaptiveRate | None = None,
+        pixel_format: str = BGR,
+        downscale: int = 1,
+        frame_buffers: int | None = None,
     ) -> None:
         """Constructor for the Screenshotter class
 
@@ -37,18 +104,122 @@ class Screenshotter:
             start_immediately (bool): Whether or not to start the
                 screenshotting immediately. Defaults to False. If True, the
                 screenshotting will start immediately upon instantiation.
-            timeout (int | float): The timeout for the requests.post
+            timeout (int | float): The timeout for each upload
+            sct (Any | None): The screen capture object to take screenshots
+                with, which must provide monitors, grab and close like
+                mss.mss(). Defaults to None, which uses mss.mss().
+            encoder (FrameEncoder | None): The encoder compressing the
+                screenshots, see encoders.create_encoder. Defaults to None,
+                which sends the raw pixels.
+            regions (str | Sequence[Region] | None): The regions of the
+                monitor to capture, or the name of a preset from
+                regions.PRESETS. Defaults to None, which captures the whole
+                monitor.
+            change_detector (ChangeDetector | None): Decides whether a
+                screenshot changed enough since the last one sent to be sent.
+                Defaults to None, which sends every screenshot.
+            tile_size (int | None): The size of the tiles in which to split
+                the screenshots, to only send the tiles that changed since the
+                last keyframe, see tiles.TileTracker. Defaults to None, which
+                sends whole screenshots.
+            keyframe_interval (int): With tiles, the number of deltas after
+                which a whole screenshot is sent again. Defaults to 20.
+            upload_workers (int): Number of screenshots uploaded at the same
+                time. With more than one, they can reach the server out of
+                order, including tile deltas before their keyframe. Defaults
+                to 1.
+            queue_size (int): Maximum number of screenshots waiting to be
+                encoded, and waiting to be uploaded. Past it, the oldest are
+                dropped. Defaults to 2.
+            transport (Transport | None): Posts the screenshots over
+                persistent connections, see transport.create_transport.
+                Defaults to None, which uses a requests session pooling a
+                connection per upload worker.
+            rate (AdaptiveRate | None): Adapts the time interval to the
+                activity on screen and to the server, starting from its
+                minimum interval. Defaults to None, which keeps time_interval.
+            pixel_format (str): Either bgr, or gray to send the luma only,
+                a third of the pixels. Defaults to bgr.
+            downscale (int): Only one pixel in downscale is kept along each
+                axis of the screenshots. Defaults to 1.
+            frame_buffers (int | None): Number of preallocated buffers per
+                region, which screenshots are converted into and reused from
+                once uploaded. Defaults to None, which has enough for every
+                screenshot the pipeline can hold. 0 allocates every
+                screenshot.
         """
-        self.sct = mss.mss()
+        self.sct = sct if sct is not None else mss.mss()
         self.server_address = server_address
         self.monitor = self.sct.monitors[monitor_index]
         self.size = (self.monitor["width"], self.monitor["height"])
-        self.shape = (self.monitor["height"], self.monitor["width"], 3)
-        self.time_interval = float(time_interval)
+        # Raises for an unknown pixel format or downscale.
+        self.shape = converted_shape(
+            self.monitor["height"],
+            self.monitor["width"],
+            pixel_format,
+            downscale,
+        )
+        self.regions = resolve_regions(regions) if regions is not None else None
+        self.region_areas = [
+            region.to_monitor(self.monitor) for region in self.regions or []
+        ]
+        self.rate = rate
+        self.pixel_format = pixel_format
+        self.downscale = downscale
+        self.time_interval = (
+            float(time_interval) if rate is None else rate.interval
+        )
         self._timer: Timer | None = None
         self._is_running: bool = False
+        self._timer_lock = RLock()
         self.next_call = time.time()
         self.timeout = float(timeout)
+        self.frame_id = 0
+        self.scheduler = AsyncScheduler(self.time_interval)
+        self.encoder = encoder if encoder is not None else FrameEncoder()
+        self.encode_stats = EncodeStats()
+        self.change_detector = change_detector
+        self.tile_trackers = (
+            [
+                TileTracker(tile_size, keyframe_interval)
+                for _ in self.region_areas or [self.monitor]
+            ]
+            if tile_size is not None
+            else None
+        )
+        self.transport = (
+            transport
+            if transport is not None
+            else RequestsTransport(upload_workers)
+        )
+        # Encoding and uploading happen on their own threads, so that a slow
+        # server does not delay the next capture.
+        self.pipeline = CapturePipeline(
+            self.encode_upload,
+            self.post,
+            upload_workers,
+            queue_size,
+            queue_size,
+            on_drop=self._drop_upload,
+        )
+        if frame_buffers is None:
+            # Queued to be encoded, encoding, queued to be uploaded,
+            # uploading and being captured.
+            frame_buffers = 2 * queue_size + upload_workers + 2
+        self.frame_rings = (
+            [
+                FrameRing(
+                    area["height"],
+                    area["width"],
+                    frame_buffers,
+                    pixel_format,
+                    downscale,
+                )
+                for area in self.region_areas or [self.monitor]
+            ]
+            if frame_buffers
+            else None
+        )
         if start_immediately:
             self.timer_start()
 
@@ -61,26 +232,34 @@ class Screenshotter:
         """
         self._is_running = False
         self.process_screenshot()
-        self.timer_start()
+        with self._timer_lock:
+            # Unless the timer was stopped while processing the screenshot.
+            if self._timer is not None:
+                self.timer_start()
 
     def timer_start(self) -> None:
         """Starts the timer"""
-        if not self._is_running:
-            self.next_call += self.time_interval
-            # In case the processing takes longer than the time interval, this
-            # ensures the time left is at least 0
-            time_left = max(self.next_call - time.time(), 0.0)
-            if time_left == 0.0:
-                self.next_call = time.time()
-            self._timer = Timer(time_left, self._run)
-            self._timer.start()
-            self._is_running = True
+        with self._timer_lock:
+            if not self._is_running:
+                self.next_call += self.time_interval
+                # In case the processing takes longer than the time interval,
+                # this ensures the time left is at least 0
+                time_left = max(self.next_call - time.time(), 0.0)
+                if time_left == 0.0:
+                    self.next_call = time.time()
+                # Flagged before starting, as a timer with no time left can
+                # run straight away.
+                self._is_running = True
+                self._timer = Timer(time_left, self._run)
+                self._timer.start()
 
     def timer_stop(self) -> None:
         """Stops the timer"""
-        if self._timer is not None:
-            self._timer.cancel()
-        self._is_running = False
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._is_running = False
 
     def __exit__(
         self,
@@ -88,32 +267,90 @@ class Screenshotter:
         exc_value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        """Upon closing, close mss.mss() and stop the timer, if it is running.
+        """Upon closing, stop the timer or scheduler, if running, wait for the
+        screenshots queued to be sent and close mss.mss().
 
         Args:
             exc_type (type[BaseException] | None): Exception type, unused
             exc_value (BaseException | None): Exception value, unused
             traceback (TracebackType | None): Traceback, unused
         """
-        self.sct.close()
         self.timer_stop()
+        self.scheduler.stop()
+        self.pipeline.close()
+        self.transport.close()
+        self.sct.close()
 
-    def take_screenshot(self) -> npt.NDArray[np.uint8]:
+    def take_screenshot(self) -> "npt.NDArray[np.uint8]":
         """Takes a screenshot of the given monitor
 
         Returns:
             npt.NDArray[np.uint8]: The screenshot as a numpy array, without the
                 alpha channel
         """
-        grab = self.sct.grab(self.monitor)
-        frame = np.array(grab)
-        # Remove the alpha channel, which is always 255
-        cut_frame = frame[:, :, :-1]
-        return cut_frame
+        return self.grab(self.monitor)
+
+    def take_regions(self) -> "list[npt.NDArray[np.uint8]]":
+        """Takes a screenshot of each region only, which is much less to
+        capture than the whole monitor.
+
+        The screenshots are converted into buffers of the frame rings, which
+        are only reused once released by release_screenshots.
+
+        Returns:
+            list[npt.NDArray[np.uint8]]: The screenshot of each region, in
+                order, without the alpha channel. The whole monitor if no
+                regions were given.
+        """
+        areas = self.region_areas or [self.monitor]
+        if self.frame_rings is None:
+            return [self.grab(area) for area in areas]
+        return [
+            self.grab(area, frame_ring)
+            for area, frame_ring in zip(areas, self.frame_rings)
+        ]
+
+    def release_screenshots(
+        self, screenshots: "Sequence[npt.NDArray[np.uint8]]"
+    ) -> None:
+        """Lets the buffers of screenshots taken by take_regions be reused,
+        once nothing reads them anymore.
+
+        Args:
+            screenshots (Sequence[npt.NDArray[np.uint8]]): The screenshot of
+                each region, in order.
+        """
+        for frame_ring, screenshot in zip(self.frame_rings or [], screenshots):
+            frame_ring.release(screenshot)
+
+    def grab(
+        self, area: dict[str, int], frame_ring: FrameRing | None = None
+    ) -> "npt.NDArray[np.uint8]":
+        """Takes a screenshot of an area of the screen
 
-    def send_screenshot(
-        self, screenshot: npt.NDArray[np.uint8]
-    ) -> requests.Response:
+        Args:
+            area (dict[str, int]): The left, top, width and height of the
+                area, in pixels.
+            frame_ring (FrameRing | None): The ring to convert the screenshot
+                into. Defaults to None, which allocates it.
+
+        Returns:
+            npt.NDArray[np.uint8]: The screenshot as a C-contiguous numpy
+                array, without the alpha channel, which is always 255
+        """
+        # A view of the pixels captured, without copying them.
+        frame = np.asarray(self.sct.grab(area))
+        if frame_ring is not None:
+            return frame_ring.convert(frame)
+        out = np.empty(
+            converted_shape(
+                area["height"], area["width"], self.pixel_format, self.downscale
+            ),
+            dtype=np.uint8,
+        )
+        return convert_frame(frame, out, self.pixel_format, self.downscale)
+
+    def send_screenshot(self, screenshot: "npt.NDArray[np.uint8]") -> Any:
         """Sends the screenshot to the server for processing.
 
         Args:
@@ -121,15 +358,265 @@ class Screenshotter:
                 server.
 
         Returns:
-            requests.Response: The response from the server.
+            Any: The response from the server, see transport.
+        """
+        body = self.encode_screenshot(screenshot)
+        return self.post(
+            Upload(body, {"Content-Type": CONTENT_TYPE}, self.frame_id)
+        )
+
+    def encode_screenshot(
+        self, screenshot: "npt.NDArray[np.uint8]"
+    ) -> FramePayload:
+        """Encodes the screenshot into the body sent to the server: a small
+        binary header followed by the pixels, compressed by the encoder, see
+        wire.decode_frame and encoders.decode.
+
+        Args:
+            screenshot (npt.NDArray[np.uint8]): The screenshot to encode.
+
+        Returns:
+            FramePayload: The encoded screenshot, whose payload is not copied
+                again when sent.
         """
-        array_string = np.array_str(screenshot)
-        response = requests.post(
-            self.server_address, data=array_string, timeout=self.timeout
+        self.frame_id += 1
+        return encode(
+            screenshot, self.encoder, self.frame_id, stats=self.encode_stats
         )
+
+    def send_regions(
+        self, screenshots: "Sequence[npt.NDArray[np.uint8]]"
+    ) -> Any:
+        """Sends the screenshots of the regions to the server, as one body.
+
+        Args:
+            screenshots (Sequence[npt.NDArray[np.uint8]]): The screenshot of
+                each region, in order.
+
+        Returns:
+            Any: The response from the server, see transport.
+        """
+        body = self.encode_regions(screenshots)
+        return self.post(Upload(body, self.regions_headers(), self.frame_id))
+
+    def regions_headers(self) -> dict[str, str]:
+        """The HTTP headers of a body holding the screenshots of the regions
+
+        Returns:
+            dict[str, str]: The content type, and where the regions were
+                captured if any were given
+        """
+        headers = {"Content-Type": CONTENT_TYPE}
+        if self.regions is not None:
+            headers[REGIONS_HEADER] = format_regions(self.regions, self.monitor)
+        return headers
+
+    def encode_regions(
+        self, screenshots: "Sequence[npt.NDArray[np.uint8]]"
+    ) -> FrameBundle:
+        """Encodes the screenshots of the regions into a single body, one
+        frame per region, all with the same frame id, see wire.decode_frames.
+        With tiles, a region is either a keyframe or a delta of two frames,
+        see tiles.TileReassembler.
+
+        Args:
+            screenshots (Sequence[npt.NDArray[np.uint8]]): The screenshot of
+                each region, in order.
+
+        Returns:
+            FrameBundle: The encoded screenshots.
+        """
+        self.frame_id += 1
+        timestamp = time.time()
+        if self.tile_trackers is None:
+            return FrameBundle(
+                [
+                    encode(
+                        screenshot,
+                        self.encoder,
+                        self.frame_id,
+                        timestamp,
+                        self.encode_stats,
+                    )
+                    for screenshot in screenshots
+                ]
+            )
+        frames: list[FramePayload] = []
+        for screenshot, tile_tracker in zip(screenshots, self.tile_trackers):
+            frames.extend(
+                encode_tile_update(
+                    tile_tracker.update(screenshot, self.frame_id),
+                    self.encoder,
+                    self.frame_id,
+                    timestamp,
+                    self.encode_stats,
+                )
+            )
+        return FrameBundle(frames)
+
+    def encode_upload(
+        self, screenshots: "Sequence[npt.NDArray[np.uint8]]"
+    ) -> Upload:
+        """Encodes the screenshots taken by take_regions into what to upload:
+        a single frame for a whole screenshot, a bundle otherwise.
+
+        Args:
+            screenshots (Sequence[npt.NDArray[np.uint8]]): The screenshot of
+                each region, in order.
+
+        Returns:
+            Upload: The body and headers to post.
+        """
+        if (self.regions is None) and (self.tile_trackers is None):
+            body: FramePayload | FrameBundle = self.encode_screenshot(
+                screenshots[0]
+            )
+            headers = {"Content-Type": CONTENT_TYPE}
+        else:
+            body = self.encode_regions(screenshots)
+            headers = self.regions_headers()
+        return Upload(body, headers, self.frame_id)
+
+    def post(self, upload: Upload) -> Any:
+        """Posts an encoded upload to the server. If the server does not
+        accept a keyframe, the next frame is a keyframe again, and if it does
+        not accept the newest frames, the next frames are sent even if
+        unchanged.
+
+        Args:
+            upload (Upload): The body and headers to post.
+
+        Returns:
+            Any: The response from the server, see transport.
+        """
+        started = time.perf_counter()
+        try:
+            response = self.transport.post(
+                self.server_address, upload.body, upload.headers, self.timeout
+            )
+        except Exception:
+            self._drop_upload(upload)
+            self._record_upload(started, False)
+            raise
+        succeeded = response.status_code < 400
+        if not succeeded:
+            self._drop_upload(upload)
+        self._record_upload(started, succeeded)
         return response
 
-    def process_screenshot(self) -> None:
-        screenshot = self.take_screenshot()
-        response = self.send_screenshot(screenshot)
-        print(response.text)
+    def warm_up(self) -> int:
+        """Opens the connections to the server ahead of the first upload.
+
+        Returns:
+            int: The number of connections opened
+        """
+        return self.transport.warm_up(self.server_address, self.timeout)
+
+    def process_screenshot(self) -> "concurrent.futures.Future | None":
+        """Takes a screenshot, of the regions if any were given, and queues it
+        to be encoded and uploaded by the pipeline, unless the change detector
+        finds it unchanged. Never waits for the encoding or upload.
+
+        Returns:
+            concurrent.futures.Future | None: Resolves to the response from
+                the server, or is cancelled if the screenshot is dropped. None
+                if the screenshot was skipped.
+        """
+        return self.queue_screenshots(self.take_regions())
+
+    async def process_screenshot_async(
+        self,
+    ) -> "concurrent.futures.Future | None":
+        """Like process_screenshot, as a coroutine: the capture runs in the
+        default executor, so the event loop is never blocked by it.
+
+        Returns:
+            concurrent.futures.Future | None: Resolves to the response from
+                the server, or is cancelled if the screenshot is dropped, see
+                asyncio.wrap_future to await it. None if the screenshot was
+                skipped.
+        """
+        screenshots = await asyncio.to_thread(self.take_regions)
+        return self.queue_screenshots(screenshots)
+
+    def queue_screenshots(
+        self, screenshots: "Sequence[npt.NDArray[np.uint8]]"
+    ) -> "concurrent.futures.Future | None":
+        """Queues screenshots taken by take_regions to be encoded and
+        uploaded by the pipeline, unless the change detector finds them
+        unchanged. With an adaptive rate, they also set the next interval.
+
+        Args:
+            screenshots (Sequence[npt.NDArray[np.uint8]]): The screenshot of
+                each region, in order.
+
+        Returns:
+            concurrent.futures.Future | None: Resolves to the response from
+                the server, or is cancelled if the screenshots are dropped.
+                None if they were skipped.
+        """
+        changed = (
+            self.change_detector.check(screenshots)
+            if self.change_detector is not None
+            else None
+        )
+        if self.rate is not None:
+            self.rate.record_frames(screenshots, changed)
+            self._adapt_interval()
+        if changed is False:
+            self.release_screenshots(screenshots)
+            return None
+        future = self.pipeline.submit(screenshots)
+        # Even if dropped, which cancels the future.
+        future.add_done_callback(
+            lambda _: self.release_screenshots(screenshots)
+        )
+        future.add_done_callback(print_response)
+        return future
+
+    async def run_async(self, ticks: int | None = None) -> None:
+        """Takes screenshots every time interval on the running event loop,
+        instead of with a timer thread per screenshot, until the scheduler is
+        stopped, the task is cancelled, or after a number of screenshots.
+
+        Args:
+            ticks (int | None): Number of screenshots to take, or None to run
+                until stopped or cancelled. Defaults to None.
+        """
+        await self.scheduler.run(self.process_screenshot_async, ticks)
+
+    def _adapt_interval(self) -> None:
+        # Used by the timer from the next screenshot, and the scheduler from
+        # the next tick.
+        if self.rate is not None:
+            self.time_interval = self.scheduler.interval = self.rate.interval
+
+    def _record_upload(self, started: float, succeeded: bool) -> None:
+        if self.rate is not None:
+            self.rate.record_upload(time.perf_counter() - started, succeeded)
+            self._adapt_interval()
+
+    def _drop_upload(self, upload: Upload) -> None:
+        # The deltas that follow a dropped or failed keyframe would reference
+        # a keyframe the server never got.
+        for tile_tracker in self.tile_trackers or []:
+            if tile_tracker.keyframe_id == upload.frame_id:
+                tile_tracker.request_keyframe()
+        # Frames are only skipped as unchanged since the newest frames sent,
+        # which the server never got if they were these.
+        if (self.change_detector is not None) and (
+            upload.frame_id == self.frame_id
+        ):
+            self.change_detector.reset()
+
+
+def print_response(future: "concurrent.futures.Future") -> None:
+    """Prints the response to a screenshot, or the error sending it.
+
+    Args:
+        future (concurrent.futures.Future): The screenshot being sent.
+    """
+    if future.cancelled():
+        return
+    exception = future.exception()
+    print(repr(exception) if exception is not None else future.result().text)
@@ -0,0 +1,132 @@
+from typing import TYPE_CHECKING, Any
+
+from nerdtracker_client.lazy import lazy_module
+
+PATTERNS = ["noise", "scoreboard"]
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = lazy_module("numpy")
+
+
+class SyntheticScreen:
+    """SyntheticScreen class stands in for mss.mss() as the screen capture
+    object of a Screenshotter, producing generated BGRA frames instead of
+    grabbing the screen. Useful for benchmarks and tests on machines without a
+    display.
+    """
+
+    def __init__(
+        self,
+        width: int = 1920,
+        height: int = 1080,
+        monitor_count: int = 1,
+        seed: int | None = 0,
+        pattern: str = "noise",
+    ) -> None:
+        """Constructor for the SyntheticScreen class
+
+        Args:
+            width (int): Width of every monitor, in pixels. Defaults to 1920.
+            height (int): Height of every monitor, in pixels. Defaults to 1080.
+            monitor_count (int): Number of monitors. Defaults to 1.
+            seed (int | None): Seed for the random number generator, to make
+                frames reproducible. Defaults to 0.
+            pattern (str): The background: "noise", random pixels that do not
+                compress, or "scoreboard", light blocks of text-like pixels
+                in rows over a flat dark background, which compresses like a
+                real scoreboard. Defaults to "noise".
+
+        Raises:
+            ValueError: If the pattern is not supported.
+        """
+        if pattern not in PATTERNS:
+            raise ValueError(f"Unsupported pattern: {pattern}")
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        # Like mss, index 0 is the union of every monitor.
+        self.monitors: list[dict[str, int]] = [
+            {
+                "left": 0,
+                "top": 0,
+                "width": width * monitor_count,
+                "height": height,
+            }
+        ] + [
+            {"left": width * index, "top": 0, "width": width, "height": height}
+            for index in range(monitor_count)
+        ]
+        self.pattern = pattern
+        self.frames = 0
+        self.closed = False
+        shape = (height, width * monitor_count, 4)
+        if pattern == "noise":
+            self._background = self.rng.integers(0, 256, shape, dtype=np.uint8)
+        else:
+            self._background = scoreboard_background(shape, self.rng)
+        self._background[:, :, 3] = 255
+
+    def __repr__(self) -> str:
+        out_str = (
+            "SyntheticScreen("
+            + f"{self.width}x{self.height}, "
+            + f"Monitors: {len(self.monitors) - 1}, "
+            + f"Frames: {self.frames}"
+            + ")"
+        )
+        return out_str
+
+    def grab(self, monitor: dict[str, Any]) -> "npt.NDArray[np.uint8]":
+        """Generates the next frame of a monitor.
+
+        Every frame is the same random background, with a band of rows that
+        moves down by one row per frame, so consecutive frames differ a
+        little like a scrolling scoreboard.
+
+        Args:
+            monitor (dict[str, Any]): The monitor to grab, from monitors.
+
+        Returns:
+            npt.NDArray[np.uint8]: The frame as a height x width x 4 BGRA
+                array.
+        """
+        left, top = monitor["left"], monitor["top"]
+        frame = self._background[
+            top : top + monitor["height"], left : left + monitor["width"]
+        ].copy()
+        band_start = self.frames % monitor["height"]
+        frame[band_start : band_start + 8, :, :3] = (
+            255 - frame[band_start : band_start + 8, :, :3]
+        )
+        self.frames += 1
+        return frame
+
+    def close(self) -> None:
+        """Marks the screen as closed, like mss.mss().close()"""
+        self.closed = True
+
+
+def scoreboard_background(
+    shape: tuple[int, int, int], rng: "np.random.Generator"
+) -> "npt.NDArray[np.uint8]":
+    """Generates a background looking like a scoreboard: rows of 2x4 pixel
+    glyph cells, randomly lit, over a flat dark background.
+
+    Args:
+        shape (tuple[int, int, int]): The height, width and channels.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        npt.NDArray[np.uint8]: The background
+    """
+    height, width, channels = shape
+    background = np.full(shape, 24, dtype=np.uint8)
+    cells = rng.random((-(-height // 4), -(-width // 2))) < 0.35
+    lit = np.repeat(np.repeat(cells, 4, axis=0), 2, axis=1)[:height, :width]
+    # Only every other band of 16 rows holds text, like lines of a table.
+    lit &= ((np.arange(height) // 16) % 2 == 1)[:, np.newaxis]
+    background[lit] = 220
+    return background
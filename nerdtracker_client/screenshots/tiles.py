@@ -0,0 +1,354 @@
+import functools
+from typing import TYPE_CHECKING, NamedTuple
+
+from nerdtracker_client.lazy import lazy_module
+from nerdtracker_client.screenshots.encoders import (
+    EncodeStats,
+    FrameEncoder,
+    decode,
+    encode,
+)
+from nerdtracker_client.screenshots.wire import (
+    TILE_MAP,
+    DecodedFrame,
+    FrameHeader,
+    FramePayload,
+    byte_view,
+    frame_to_array,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = lazy_module("numpy")
+
+# Seed of the random odd weights tiles are hashed with. Hashes are only ever
+# compared on the client that computed them, so it only needs to be fixed.
+HASH_SEED = 0x4E54
+
+
+def pad_to_tiles(frame: "npt.NDArray", tile_size: int) -> "npt.NDArray":
+    """Pads a frame with zeros so that its height and width are multiples of
+    the tile size. Frames that already are are made C-contiguous only.
+
+    Args:
+        frame (npt.NDArray): The frame.
+        tile_size (int): The height and width of the tiles, in pixels.
+
+    Returns:
+        npt.NDArray: The padded, C-contiguous frame
+    """
+    height, width = frame.shape[:2]
+    pad_height = -height % tile_size
+    pad_width = -width % tile_size
+    if pad_height or pad_width:
+        padding = [(0, pad_height), (0, pad_width)] + [(0, 0)] * (
+            frame.ndim - 2
+        )
+        return np.pad(frame, padding)
+    return np.ascontiguousarray(frame)
+
+
+def tile_view(frame: "npt.NDArray", tile_size: int) -> "npt.NDArray":
+    """Views a padded frame as a grid of tiles, without copying it.
+
+    Args:
+        frame (npt.NDArray): The frame, padded with pad_to_tiles.
+        tile_size (int): The height and width of the tiles, in pixels.
+
+    Returns:
+        npt.NDArray: The tiles, indexed by tile row, tile column, then pixel
+            row, pixel column and channel
+    """
+    rows = frame.shape[0] // tile_size
+    columns = frame.shape[1] // tile_size
+    tiles = frame.reshape(rows, tile_size, columns, tile_size, *frame.shape[2:])
+    return tiles.swapaxes(1, 2)
+
+
+def tile_hashes(frame: "npt.NDArray", tile_size: int) -> "npt.NDArray":
+    """Hashes every tile of a frame at once.
+
+    Each row of a tile is read as 64-bit words, which are multiplied by
+    random odd weights and summed, wrapping around. Changing any word of a
+    tile always changes its hash, as odd weights are invertible.
+
+    Args:
+        frame (npt.NDArray): The frame.
+        tile_size (int): The height and width of the tiles, in pixels. Must
+            be a multiple of 8.
+
+    Raises:
+        ValueError: If the tile size is not a multiple of 8.
+
+    Returns:
+        npt.NDArray: The hash of each tile, as a tile rows x tile columns
+            array of uint64
+    """
+    if tile_size % 8:
+        raise ValueError("The tile size must be a multiple of 8.")
+    padded = pad_to_tiles(frame, tile_size)
+    rows = padded.shape[0] // tile_size
+    columns = padded.shape[1] // tile_size
+    words = (
+        padded.view(np.uint8)
+        .reshape(rows, tile_size, columns, -1)
+        .view(np.uint64)
+    )
+    return np.einsum(
+        "aibk,ik->ab", words, hash_weights(tile_size, words.shape[3])
+    )
+
+
+@functools.lru_cache
+def hash_weights(tile_size: int, words: int) -> "npt.NDArray[np.uint64]":
+    """The random odd weights of each word of a tile.
+
+    Args:
+        tile_size (int): The number of rows of a tile.
+        words (int): The number of 64-bit words per row of a tile.
+
+    Returns:
+        npt.NDArray[np.uint64]: The weights, as a rows x words array
+    """
+    weights = np.random.default_rng(HASH_SEED).integers(
+        0, 2**63, (tile_size, words), dtype=np.uint64
+    )
+    weights |= np.uint64(1)
+    weights.setflags(write=False)
+    return weights
+
+
+class TileUpdate(NamedTuple):
+    """What to send of a frame: either a whole keyframe, or the tiles that
+    differ from the last keyframe"""
+
+    keyframe: bool
+    keyframe_id: int
+    changed: "npt.NDArray[np.bool_]"
+    pixels: "npt.NDArray"
+
+
+class TileTracker:
+    """TileTracker class splits consecutive frames of the same area into
+    tiles, and decides what to send of each: the whole frame, as a keyframe,
+    or only the tiles that differ from the last keyframe. Every delta only
+    depends on the keyframe, so a lost delta does not affect the next ones.
+    """
+
+    def __init__(
+        self,
+        tile_size: int = 32,
+        keyframe_interval: int = 20,
+        max_changed_fraction: float = 0.5,
+    ) -> None:
+        """Constructor for the TileTracker class
+
+        Args:
+            tile_size (int): The height and width of the tiles, in pixels.
+                Must be a multiple of 8. Defaults to 32.
+            keyframe_interval (int): Number of deltas after which a keyframe
+                is sent. Defaults to 20.
+            max_changed_fraction (float): Fraction of changed tiles above
+                which a keyframe is sent instead of a delta. Defaults to 0.5.
+
+        Raises:
+            ValueError: If the tile size is not a multiple of 8.
+        """
+        if tile_size % 8:
+            raise ValueError("The tile size must be a multiple of 8.")
+        self.tile_size = tile_size
+        self.keyframe_interval = keyframe_interval
+        self.max_changed_fraction = max_changed_fraction
+        self.keyframe_id = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.tiles_sent = 0
+        self.bytes_saved = 0
+        self._keyframe_hashes: "npt.NDArray[np.uint64] | None" = None
+        self._deltas_since_keyframe = 0
+
+    def __repr__(self) -> str:
+        out_str = (
+            "TileTracker("
+            + f"Tile Size: {self.tile_size}, "
+            + f"Keyframes: {self.keyframes}, "
+            + f"Deltas: {self.deltas}, "
+            + f"Bytes Saved: {self.bytes_saved}"
+            + ")"
+        )
+        return out_str
+
+    def request_keyframe(self) -> None:
+        """Makes the next frame a keyframe, such as when the server lost the
+        last one"""
+        self._keyframe_hashes = None
+
+    def update(self, frame: "npt.NDArray", frame_id: int) -> TileUpdate:
+        """Decides what to send of a frame.
+
+        Args:
+            frame (npt.NDArray): The frame.
+            frame_id (int): The id of the frame, referenced by the deltas
+                that follow if it becomes a keyframe.
+
+        Returns:
+            TileUpdate: The frame as a keyframe, or its changed tiles.
+        """
+        padded = pad_to_tiles(frame, self.tile_size)
+        hashes = tile_hashes(padded, self.tile_size)
+        if (
+            (self._keyframe_hashes is None)
+            or (self._keyframe_hashes.shape != hashes.shape)
+            or (self._deltas_since_keyframe >= self.keyframe_interval)
+        ):
+            return self._keyframe(frame, frame_id, hashes)
+        changed = hashes != self._keyframe_hashes
+        if changed.mean() > self.max_changed_fraction:
+            return self._keyframe(frame, frame_id, hashes)
+        changed_tiles = tile_view(padded, self.tile_size)[changed]
+        pixels = changed_tiles.reshape(-1, *changed_tiles.shape[2:])
+        self._deltas_since_keyframe += 1
+        self.deltas += 1
+        self.tiles_sent += len(changed_tiles)
+        self.bytes_saved += frame.nbytes - pixels.nbytes
+        return TileUpdate(False, self.keyframe_id, changed, pixels)
+
+    def _keyframe(
+        self,
+        frame: "npt.NDArray",
+        frame_id: int,
+        hashes: "npt.NDArray[np.uint64]",
+    ) -> TileUpdate:
+        self._keyframe_hashes = hashes
+        self._deltas_since_keyframe = 0
+        self.keyframe_id = frame_id
+        self.keyframes += 1
+        self.tiles_sent += hashes.size
+        changed = np.ones(hashes.shape, dtype=np.bool_)
+        return TileUpdate(True, frame_id, changed, frame)
+
+
+def encode_tile_update(
+    update: TileUpdate,
+    encoder: FrameEncoder | None = None,
+    frame_id: int = 0,
+    timestamp: float | None = None,
+    stats: EncodeStats | None = None,
+) -> list[FramePayload]:
+    """Encodes what to send of a frame. A keyframe is a single frame. A delta
+    is two: the tile map, whose frame id is that of the keyframe, then the
+    changed tiles stacked vertically.
+
+    Args:
+        update (TileUpdate): What to send of the frame.
+        encoder (FrameEncoder | None): The encoder to use for the pixels.
+            Defaults to None, which sends the raw pixels.
+        frame_id (int): Increasing identifier of the frame. Defaults to 0.
+        timestamp (float | None): When the frame was captured, or None to use
+            the current time. Defaults to None.
+        stats (EncodeStats | None): Totals to add the pixels to. Defaults to
+            None.
+
+    Returns:
+        list[FramePayload]: The frames to send, in order.
+    """
+    if update.keyframe:
+        return [encode(update.pixels, encoder, frame_id, timestamp, stats)]
+    tile_map = np.ascontiguousarray(update.changed, dtype=np.uint8)
+    header = FrameHeader(
+        encoding=FrameEncoder.name,
+        dtype=tile_map.dtype.str,
+        layout=TILE_MAP,
+        shape=tile_map.shape,
+        frame_id=update.keyframe_id,
+        timestamp=0.0,
+        payload_length=tile_map.nbytes,
+    )
+    # Image encoders cannot encode an empty image.
+    tiles_encoder = encoder if len(update.pixels) else FrameEncoder()
+    return [
+        FramePayload(header, byte_view(tile_map)),
+        encode(update.pixels, tiles_encoder, frame_id, timestamp, stats),
+    ]
+
+
+class TileReassembler:
+    """TileReassembler class rebuilds, on the server, the frames sent as
+    keyframes and deltas by TileTracker. It keeps the last keyframe of each
+    region, by position in the body.
+    """
+
+    def __init__(self) -> None:
+        """Constructor for the TileReassembler class"""
+        self.keyframe_ids: dict[int, int] = {}
+        self._keyframes: dict[int, "npt.NDArray"] = {}
+        self._shapes: dict[int, tuple[int, ...]] = {}
+
+    def __repr__(self) -> str:
+        return f"TileReassembler(Keyframes: {self.keyframe_ids})"
+
+    def apply(self, frames: list[DecodedFrame]) -> list["npt.NDArray"]:
+        """Rebuilds the frames of a body, as returned by wire.decode_frames.
+
+        Args:
+            frames (list[DecodedFrame]): The frames of the body.
+
+        Raises:
+            ValueError: If a delta does not follow the keyframe it references,
+                or a tile map is not followed by its tiles.
+
+        Returns:
+            list[npt.NDArray]: The full frame of each region, in order.
+        """
+        rebuilt: list["npt.NDArray"] = []
+        position = 0
+        while position < len(frames):
+            frame = frames[position]
+            region = len(rebuilt)
+            if frame.header.layout != TILE_MAP:
+                rebuilt.append(self._store_keyframe(region, frame))
+                position += 1
+                continue
+            if position + 1 >= len(frames):
+                raise ValueError("Tile map is not followed by its tiles.")
+            rebuilt.append(
+                self._apply_delta(region, frame, frames[position + 1])
+            )
+            position += 2
+        return rebuilt
+
+    def _store_keyframe(
+        self, region: int, frame: DecodedFrame
+    ) -> "npt.NDArray":
+        pixels = decode(frame)
+        self.keyframe_ids[region] = frame.header.frame_id
+        self._shapes[region] = pixels.shape
+        self._keyframes[region] = pixels
+        return pixels
+
+    def _apply_delta(
+        self, region: int, tile_map: DecodedFrame, tiles: DecodedFrame
+    ) -> "npt.NDArray":
+        keyframe_id = tile_map.header.frame_id
+        if self.keyframe_ids.get(region) != keyframe_id:
+            raise ValueError(
+                f"Delta of region {region} references keyframe "
+                + f"{keyframe_id}, but the last keyframe is "
+                + f"{self.keyframe_ids.get(region)}."
+            )
+        changed = frame_to_array(tile_map).astype(np.bool_)
+        keyframe = self._keyframes[region]
+        if not changed.any():
+            return keyframe
+        pixels = decode(tiles)
+        tile_size = pixels.shape[1]
+        padded = pad_to_tiles(keyframe, tile_size)
+        if np.shares_memory(padded, keyframe):
+            padded = padded.copy()
+        tile_view(padded, tile_size)[changed] = pixels.reshape(
+            -1, tile_size, *pixels.shape[1:]
+        )
+        height, width = self._shapes[region][:2]
+        return padded[:height, :width]
@@ -0,0 +1,296 @@
+import concurrent.futures
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, cast
+
+from nerdtracker_client.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import requests
+    import requests.adapters
+else:
+    requests = lazy_module("requests")
+
+
+class Transport:
+    """Transport class posts frames to the server over a pool of persistent
+    connections, so that frames after the first do not pay for connection
+    setup. This base class only defines the interface, see create_transport.
+    """
+
+    name = ""
+
+    def __init__(self, pool_size: int = 1) -> None:
+        """Constructor for the Transport class
+
+        Args:
+            pool_size (int): Maximum number of connections kept open, at
+                least the number of uploads running at the same time.
+                Defaults to 1.
+        """
+        self.pool_size = pool_size
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(Pool Size: {self.pool_size})"
+
+    def post(
+        self,
+        url: str,
+        body: Iterable[bytes | memoryview],
+        headers: dict[str, str],
+        timeout: float,
+    ) -> Any:
+        """Posts a body.
+
+        Args:
+            url (str): The address of the server.
+            body (Iterable[bytes | memoryview]): The body, such as a
+                FramePayload or FrameBundle, which has a length.
+            headers (dict[str, str]): The HTTP headers.
+            timeout (float): The timeout, in seconds.
+
+        Raises:
+            NotImplementedError: Always, subclasses post.
+
+        Returns:
+            Any: The response from the server, with status_code and text.
+        """
+        raise NotImplementedError
+
+    def head(self, url: str, timeout: float) -> Any:
+        """Sends a HEAD request.
+
+        Args:
+            url (str): The address of the server.
+            timeout (float): The timeout, in seconds.
+
+        Raises:
+            NotImplementedError: Always, subclasses send requests.
+
+        Returns:
+            Any: The response from the server.
+        """
+        raise NotImplementedError
+
+    def warm_up(self, url: str, timeout: float = 5.0) -> int:
+        """Opens the connections of the pool ahead of the first frames, by
+        sending as many HEAD requests at the same time. Each response is held
+        until all of them arrived, so that no request reuses the connection
+        of another. Any response, even an error status, leaves its
+        connection open.
+
+        Args:
+            url (str): The address of the server.
+            timeout (float): The timeout of each request, in seconds. Defaults
+                to 5 seconds.
+
+        Returns:
+            int: The number of connections opened
+        """
+        barrier = threading.Barrier(self.pool_size)
+
+        def open_connection() -> None:
+            try:
+                response = self.head(url, timeout)
+            except Exception:
+                barrier.abort()
+                raise
+            try:
+                barrier.wait(timeout)
+            except threading.BrokenBarrierError:
+                pass
+            finally:
+                self._release(response)
+
+        with concurrent.futures.ThreadPoolExecutor(self.pool_size) as executor:
+            futures = [
+                executor.submit(open_connection) for _ in range(self.pool_size)
+            ]
+        return sum(future.exception() is None for future in futures)
+
+    def close(self) -> None:
+        """Closes the connections"""
+
+    def _release(self, response: Any) -> None:
+        # Returns the connection of a response from head to the pool.
+        pass
+
+
+class RequestsTransport(Transport):
+    """RequestsTransport class posts frames through a requests.Session, which
+    keeps HTTP/1.1 connections alive between frames.
+    """
+
+    name = "requests"
+
+    def __init__(self, pool_size: int = 1) -> None:
+        """Constructor for the RequestsTransport class
+
+        Args:
+            pool_size (int): Maximum number of connections kept open, at
+                least the number of uploads running at the same time.
+                Defaults to 1.
+        """
+        super().__init__(pool_size)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(
+        self,
+        url: str,
+        body: Iterable[bytes | memoryview],
+        headers: dict[str, str],
+        timeout: float,
+    ) -> "requests.Response":
+        """Posts a body.
+
+        Args:
+            url (str): The address of the server.
+            body (Iterable[bytes | memoryview]): The body, such as a
+                FramePayload or FrameBundle, which has a length.
+            headers (dict[str, str]): The HTTP headers.
+            timeout (float): The timeout, in seconds.
+
+        Returns:
+            requests.Response: The response from the server.
+        """
+        # requests streams the chunks, memoryviews too, without joining them.
+        return self.session.post(
+            url,
+            data=cast(Iterable[bytes], body),
+            headers=headers,
+            timeout=timeout,
+        )
+
+    def head(self, url: str, timeout: float) -> "requests.Response":
+        """Sends a HEAD request.
+
+        Args:
+            url (str): The address of the server.
+            timeout (float): The timeout, in seconds.
+
+        Returns:
+            requests.Response: The response from the server, holding its
+                connection until closed.
+        """
+        return self.session.head(url, timeout=timeout, stream=True)
+
+    def close(self) -> None:
+        """Closes the connections"""
+        self.session.close()
+
+    def _release(self, response: "requests.Response") -> None:
+        # Reading the response to its end returns its connection to the
+        # pool, where closing it first would close the connection.
+        response.content
+        response.close()
+
+
+class HttpxTransport(Transport):
+    """HttpxTransport class posts frames through an httpx.Client, which can
+    multiplex the uploads over a single HTTP/2 connection. Requires the
+    optional httpx package, and h2 for HTTP/2.
+
+    Unlike RequestsTransport, which streams the frames from their buffers,
+    post joins the body into bytes first, copying every frame once.
+    """
+
+    name = "httpx"
+
+    def __init__(self, pool_size: int = 1, http2: bool = True) -> None:
+        """Constructor for the HttpxTransport class
+
+        Args:
+            pool_size (int): Maximum number of connections kept open.
+                Defaults to 1.
+            http2 (bool): Whether to use HTTP/2 when the server supports it.
+                Defaults to True.
+
+        Raises:
+            ImportError: If the httpx package is not installed.
+        """
+        try:
+            import httpx
+        except ImportError as error:
+            raise ImportError(
+                "The httpx transport requires the httpx package."
+            ) from error
+        super().__init__(pool_size)
+        self.http2 = http2
+        self.client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+        )
+
+    def post(
+        self,
+        url: str,
+        body: Iterable[bytes | memoryview],
+        headers: dict[str, str],
+        timeout: float,
+    ) -> Any:
+        """Posts a body.
+
+        Args:
+            url (str): The address of the server.
+            body (Iterable[bytes | memoryview]): The body, such as a
+                FramePayload or FrameBundle, which has a length.
+            headers (dict[str, str]): The HTTP headers.
+            timeout (float): The timeout, in seconds.
+
+        Returns:
+            Any: The httpx.Response from the server.
+        """
+        # httpx only sends a Content-Length for bytes content.
+        return self.client.post(
+            url,
+            content=b"".join(body),
+            headers=headers,
+            timeout=timeout,
+        )
+
+    def head(self, url: str, timeout: float) -> Any:
+        """Sends a HEAD request.
+
+        Args:
+            url (str): The address of the server.
+            timeout (float): The timeout, in seconds.
+
+        Returns:
+            Any: The httpx.Response from the server.
+        """
+        return self.client.head(url, timeout=timeout)
+
+    def close(self) -> None:
+        """Closes the connections"""
+        self.client.close()
+
+
+TRANSPORTS: dict[str, type[Transport]] = {
+    RequestsTransport.name: RequestsTransport,
+    HttpxTransport.name: HttpxTransport,
+}
+
+
+def create_transport(name: str = "requests", **options: Any) -> Transport:
+    """Creates a transport by name, such as from a deployment setting.
+
+    Args:
+        name (str): Either requests or httpx. Defaults to requests.
+        **options (Any): Options passed to the transport, such as pool_size.
+
+    Raises:
+        ValueError: If there is no transport with that name.
+
+    Returns:
+        Transport: The transport.
+    """
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {name!r}.")
+    return TRANSPORTS[name](**options)
@@ -0,0 +1,329 @@
+import struct
+import time
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Sequence
+
+from nerdtracker_client.lazy import lazy_module
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+else:
+    np = lazy_module("numpy")
+
+# Frame layout: a fixed-size header followed by the payload. The header holds
+# the magic, format version, payload encoding, numpy dtype string, channel
+# layout, number of dimensions, shape (unused dimensions are 0), frame id,
+# capture timestamp and payload length.
+MAGIC = b"NTFR"
+VERSION = 1
+FRAME_HEADER = struct.Struct("<4sBB4s4sB3IQdQ")
+CONTENT_TYPE = "application/x-nerdtracker-frame"
+
+# Payload encodings, stored in the header by index, so new ones are only ever
+# appended. A raw payload is the C-contiguous pixel buffer, the others are
+# compressed, see encoders.
+RAW = "raw"
+JPEG = "jpeg"
+WEBP = "webp"
+PNG = "png"
+ZLIB = "zlib"
+ZSTD = "zstd"
+ENCODINGS = [RAW, JPEG, WEBP, PNG, ZLIB, ZSTD]
+
+# Channel layouts, keyed by number of channels.
+LAYOUTS = {1: "GRAY", 3: "BGR", 4: "BGRA"}
+# Layout of a tile map, which says which tiles of a keyframe the next frame
+# replaces, see tiles.
+TILE_MAP = "TMAP"
+
+
+class FrameHeader(NamedTuple):
+    """The metadata sent ahead of the pixels of a frame"""
+
+    encoding: str
+    dtype: str
+    layout: str
+    shape: tuple[int, ...]
+    frame_id: int
+    timestamp: float
+    payload_length: int
+
+    def pack(self) -> bytes:
+        """Packs the header into its wire representation.
+
+        Returns:
+            bytes: The packed header
+        """
+        padded_shape = self.shape + (0,) * (3 - len(self.shape))
+        return FRAME_HEADER.pack(
+            MAGIC,
+            VERSION,
+            ENCODINGS.index(self.encoding),
+            self.dtype.encode("ascii"),
+            self.layout.encode("ascii"),
+            len(self.shape),
+            *padded_shape,
+            self.frame_id,
+            self.timestamp,
+            self.payload_length,
+        )
+
+    @staticmethod
+    def unpack(buffer: bytes | bytearray | memoryview) -> "FrameHeader":
+        """Unpacks a header from the start of a buffer.
+
+        Args:
+            buffer (bytes | bytearray | memoryview): The buffer starting with
+                a packed header.
+
+        Raises:
+            ValueError: If the buffer does not start with a valid header.
+
+        Returns:
+            FrameHeader: The unpacked header.
+        """
+        if len(buffer) < FRAME_HEADER.size:
+            raise ValueError("Buffer is too short to hold a frame header.")
+        (
+            magic,
+            version,
+            encoding_index,
+            dtype,
+            layout,
+            ndim,
+            *shape,
+            frame_id,
+            timestamp,
+            payload_length,
+        ) = FRAME_HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Buffer does not hold a frame.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported frame version {version}.")
+        if encoding_index >= len(ENCODINGS):
+            raise ValueError(f"Unsupported frame encoding {encoding_index}.")
+        return FrameHeader(
+            encoding=ENCODINGS[encoding_index],
+            dtype=dtype.rstrip(b"\x00").decode("ascii"),
+            layout=layout.rstrip(b"\x00").decode("ascii"),
+            shape=tuple(shape[:ndim]),
+            frame_id=frame_id,
+            timestamp=timestamp,
+            payload_length=payload_length,
+        )
+
+
+class FramePayload:
+    """FramePayload class is a frame ready to be sent: the packed header and
+    a memoryview of the payload, kept as separate parts so that the payload is
+    never copied. Iterating over it yields the parts, and its length is the
+    total number of bytes, so it can be passed directly as the body of a
+    requests.post.
+    """
+
+    def __init__(self, header: FrameHeader, payload: memoryview) -> None:
+        """Constructor for the FramePayload class
+
+        Args:
+            header (FrameHeader): The header of the frame.
+            payload (memoryview): The payload, as a flat byte view.
+        """
+        self.header = header
+        self.payload = payload
+        self.packed_header = header.pack()
+
+    def __repr__(self) -> str:
+        out_str = (
+            "FramePayload("
+            + f"Frame: {self.header.frame_id}, "
+            + f"Encoding: {self.header.encoding}, "
+            + f"Shape: {self.header.shape}, "
+            + f"Bytes: {len(self)}"
+            + ")"
+        )
+        return out_str
+
+    def __len__(self) -> int:
+        return len(self.packed_header) + self.payload.nbytes
+
+    def __iter__(self) -> Iterator[bytes | memoryview]:
+        yield self.packed_header
+        yield self.payload
+
+    def tobytes(self) -> bytes:
+        """Joins the header and payload into a single bytes object. This
+        copies the payload, so only use it when a single buffer is required.
+
+        Returns:
+            bytes: The frame, as sent on the wire
+        """
+        return self.packed_header + self.payload.tobytes()
+
+
+class FrameBundle:
+    """FrameBundle class is several frames sent as one body, such as the
+    regions of a single screenshot, one after the other. Like FramePayload,
+    iterating over it yields the parts without copying the payloads.
+    """
+
+    def __init__(self, frames: Sequence[FramePayload]) -> None:
+        """Constructor for the FrameBundle class
+
+        Args:
+            frames (Sequence[FramePayload]): The frames, in order.
+        """
+        self.frames = list(frames)
+
+    def __repr__(self) -> str:
+        out_str = (
+            "FrameBundle("
+            + f"Frames: {len(self.frames)}, "
+            + f"Bytes: {len(self)}"
+            + ")"
+        )
+        return out_str
+
+    def __len__(self) -> int:
+        return sum(len(frame) for frame in self.frames)
+
+    def __iter__(self) -> Iterator[bytes | memoryview]:
+        for frame in self.frames:
+            yield from frame
+
+    def tobytes(self) -> bytes:
+        """Joins the frames into a single bytes object, copying the payloads.
+
+        Returns:
+            bytes: The frames, as sent on the wire
+        """
+        return b"".join(frame.tobytes() for frame in self.frames)
+
+
+class DecodedFrame(NamedTuple):
+    """A frame read back from its wire representation"""
+
+    header: FrameHeader
+    payload: memoryview
+
+
+def encode_frame(
+    frame: "npt.NDArray",
+    frame_id: int = 0,
+    timestamp: float | None = None,
+    layout: str | None = None,
+) -> FramePayload:
+    """Wraps a frame for the wire without serializing its pixels.
+
+    The payload is a memoryview of the pixel buffer. A frame that is not
+    C-contiguous, such as a BGRA screenshot with its alpha channel sliced
+    off, is copied once into a contiguous buffer first.
+
+    Args:
+        frame (npt.NDArray): The frame, as a height x width (x channels)
+            array.
+        frame_id (int): Increasing identifier of the frame. Defaults to 0.
+        timestamp (float | None): When the frame was captured, or None to use
+            the current time. Defaults to None.
+        layout (str | None): The channel layout, or None to infer it from the
+            number of channels: GRAY, BGR or BGRA. Defaults to None.
+
+    Raises:
+        ValueError: If the frame has more than 3 dimensions.
+
+    Returns:
+        FramePayload: The frame, ready to be sent.
+    """
+    if frame.ndim > 3:
+        raise ValueError("Frames can have at most 3 dimensions.")
+    contiguous_frame = np.ascontiguousarray(frame)
+    if layout is None:
+        channels = 1 if frame.ndim < 3 else frame.shape[2]
+        layout = LAYOUTS.get(channels, "")
+    header = FrameHeader(
+        encoding=RAW,
+        dtype=contiguous_frame.dtype.str,
+        layout=layout,
+        shape=tuple(contiguous_frame.shape),
+        frame_id=frame_id,
+        timestamp=time.time() if timestamp is None else timestamp,
+        payload_length=contiguous_frame.nbytes,
+    )
+    return FramePayload(header, byte_view(contiguous_frame))
+
+
+def byte_view(array: "npt.NDArray") -> memoryview:
+    """Views the buffer of a C-contiguous array as flat bytes, without
+    copying it. Unlike memoryview.cast, this also works for empty arrays.
+
+    Args:
+        array (npt.NDArray): The C-contiguous array.
+
+    Returns:
+        memoryview: The bytes of the array
+    """
+    return array.reshape(-1).view(np.uint8).data
+
+
+def decode_frame(buffer: bytes | bytearray | memoryview) -> DecodedFrame:
+    """Splits a frame received from the wire into its header and payload,
+    without copying the payload.
+
+    Args:
+        buffer (bytes | bytearray | memoryview): The frame, as received.
+
+    Raises:
+        ValueError: If the buffer does not hold a complete frame.
+
+    Returns:
+        DecodedFrame: The header and a view of the payload.
+    """
+    header = FrameHeader.unpack(buffer)
+    end = FRAME_HEADER.size + header.payload_length
+    if len(buffer) < end:
+        raise ValueError("Buffer is too short to hold the frame payload.")
+    return DecodedFrame(header, memoryview(buffer)[FRAME_HEADER.size : end])
+
+
+def decode_frames(buffer: bytes | bytearray | memoryview) -> list[DecodedFrame]:
+    """Splits a body holding any number of frames, such as a FrameBundle or a
+    single FramePayload, without copying the payloads.
+
+    Args:
+        buffer (bytes | bytearray | memoryview): The frames, as received.
+
+    Raises:
+        ValueError: If the buffer does not hold complete frames.
+
+    Returns:
+        list[DecodedFrame]: The header and a view of the payload of each
+            frame, in order.
+    """
+    view = memoryview(buffer)
+    frames: list[DecodedFrame] = []
+    while view:
+        frame = decode_frame(view)
+        frames.append(frame)
+        view = view[FRAME_HEADER.size + frame.header.payload_length :]
+    return frames
+
+
+def frame_to_array(frame: DecodedFrame) -> "npt.NDArray":
+    """Views the payload of a raw frame as a numpy array, without copying it.
+
+    Args:
+        frame (DecodedFrame): The frame, as returned by decode_frame.
+
+    Raises:
+        ValueError: If the payload is not raw pixels.
+
+    Returns:
+        npt.NDArray: The pixels, read-only if the buffer was bytes.
+    """
+    if frame.header.encoding != RAW:
+        raise ValueError(
+            f"Cannot view a {frame.header.encoding} payload, "
+            + "use encoders.decode instead."
+        )
+    return np.frombuffer(frame.payload, dtype=frame.header.dtype).reshape(
+        frame.header.shape
+    )
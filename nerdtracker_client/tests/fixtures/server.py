@@ -0,0 +1,158 @@
+import http.server
+import threading
+import time
+from types import TracebackType
+from typing import Any, Iterator, NamedTuple
+
+import pytest
+
+from nerdtracker_client.screenshots.wire import DecodedFrame, decode_frames
+
+
+class ReceivedBody(NamedTuple):
+    """A body posted to the StandInServer"""
+
+    headers: dict[str, str]
+    frames: list[DecodedFrame]
+    connection: int
+
+
+class StandInServer:
+    """StandInServer class is a local HTTP/1.1 server standing in for
+    NerdTracker_Server, for tests and benchmarks. It keeps connections alive,
+    decodes the frames posted to it, and counts the connections opened, so
+    that connection reuse can be checked.
+    """
+
+    def __init__(self, latency: float = 0.0, port: int = 0) -> None:
+        """Constructor for the StandInServer class
+
+        Args:
+            latency (float): Time, in seconds, the server waits before
+                answering each post, like a server processing the frames.
+                Defaults to 0.
+            port (int): The port to listen on. Defaults to 0, which picks a
+                free port.
+        """
+        self.latency = latency
+        self.bodies: list[ReceivedBody] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", port), self._handler_class()
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        out_str = (
+            "StandInServer("
+            + f"{self.address}, "
+            + f"Bodies: {len(self.bodies)}, "
+            + f"Connections: {self.connections}"
+            + ")"
+        )
+        return out_str
+
+    def __enter__(self) -> "StandInServer":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Upon closing, stop the server.
+
+        Args:
+            exc_type (type[BaseException] | None): Exception type, unused
+            exc_value (BaseException | None): Exception value, unused
+            traceback (TracebackType | None): Traceback, unused
+        """
+        self.close()
+
+    @property
+    def address(self) -> str:
+        """The address to post to
+
+        Returns:
+            str: The URL of the server
+        """
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def close(self) -> None:
+        """Stops the server"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self) -> type[http.server.BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # The headers and content are written separately, which waits
+            # for the delayed ACK of the client on a kept alive connection.
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+                    self.connection_number = server.connections
+
+            def do_HEAD(self) -> None:
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_POST(self) -> None:
+                length = self.headers["Content-Length"]
+                if length is None:
+                    # The body has no end without a length, such as when it
+                    # is chunked, which the frames are never sent as.
+                    self.close_connection = True
+                    self._respond(411, "Content-Length required")
+                    return
+                body = self.rfile.read(int(length))
+                if server.latency:
+                    time.sleep(server.latency)
+                try:
+                    frames = decode_frames(body)
+                except ValueError as exc:
+                    self._respond(400, str(exc))
+                    return
+                with server._lock:
+                    server.bodies.append(
+                        ReceivedBody(
+                            dict(self.headers), frames, self.connection_number
+                        )
+                    )
+                self._respond(200, f"{len(frames)} frames")
+
+            def _respond(self, status: int, text: str) -> None:
+                content = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def stand_in_server() -> Iterator[StandInServer]:
+    """Runs a StandInServer for the duration of a test
+
+    Yields:
+        StandInServer: The running server
+    """
+    with StandInServer() as server:
+        yield server
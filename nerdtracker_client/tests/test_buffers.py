@@ -0,0 +1,175 @@
+import time
+
+import numpy as np
+import pytest
+
+from nerdtracker_client.screenshots import (
+    FrameRing,
+    Screenshotter,
+    SyntheticScreen,
+)
+from nerdtracker_client.screenshots.buffers import (
+    convert_frame,
+    converted_shape,
+)
+
+
+def make_source(height: int = 9, width: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+
+
+class TestConvertFrame:
+    def test_bgr(self) -> None:
+        """Tests that converting to bgr drops the alpha channel into a
+        contiguous array"""
+
+        source = make_source()
+        out = np.empty(converted_shape(9, 7), dtype=np.uint8)
+
+        converted = convert_frame(source, out)
+
+        assert converted is out
+        assert converted.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(converted, source[:, :, :3])
+
+    def test_gray(self) -> None:
+        """Tests that converting to gray gives the luma of the pixels"""
+
+        source = make_source()
+        out = np.empty(converted_shape(9, 7, "gray"), dtype=np.uint8)
+        luma = source[:, :, :3].astype(float) @ [0.114, 0.587, 0.299]
+
+        convert_frame(source, out, "gray")
+
+        assert out.shape == (9, 7)
+        assert np.abs(out - luma).max() <= 1.0
+
+    def test_gray_extremes(self) -> None:
+        """Tests that black and white stay black and white"""
+
+        source = np.zeros((2, 2, 4), dtype=np.uint8)
+        source[1] = 255
+        out = np.empty((2, 2), dtype=np.uint8)
+
+        convert_frame(source, out, "gray")
+
+        np.testing.assert_array_equal(out, [[0, 0], [255, 255]])
+
+    def test_downscale(self) -> None:
+        """Tests that downscaling keeps one pixel in downscale, rounding the
+        size up"""
+
+        source = make_source()
+        out = np.empty(converted_shape(9, 7, "bgr", 2), dtype=np.uint8)
+
+        convert_frame(source, out, "bgr", 2)
+
+        assert out.shape == (5, 4, 3)
+        np.testing.assert_array_equal(out, source[::2, ::2, :3])
+
+    def test_invalid(self) -> None:
+        """Tests that unknown formats and downscales are rejected"""
+
+        with pytest.raises(ValueError):
+            converted_shape(9, 7, "rgb")
+        with pytest.raises(ValueError):
+            converted_shape(9, 7, downscale=0)
+
+
+class TestFrameRing:
+    def test_reuses_released(self) -> None:
+        """Tests that buffers are reused once released, and that new arrays
+        are allocated while every buffer is in use"""
+
+        ring = FrameRing(9, 7, size=2)
+        source = make_source()
+
+        first = ring.convert(source)
+        second = ring.convert(source)
+        third = ring.convert(source)
+        ring.release(third)
+        ring.release(first)
+        fourth = ring.convert(source)
+
+        assert first is ring.buffers[0]
+        assert second is ring.buffers[1]
+        assert all(third is not buffer for buffer in ring.buffers)
+        assert fourth is first
+        assert (ring.buffered, ring.allocated) == (3, 1)
+
+    def test_release_twice(self) -> None:
+        """Tests that releasing a buffer twice frees it once"""
+
+        ring = FrameRing(9, 7, size=2)
+        frame = ring.convert(make_source())
+
+        ring.release(frame)
+        ring.release(frame)
+
+        assert ring.convert(make_source()) is ring.buffers[1]
+        assert ring.convert(make_source()) is frame
+        assert ring.allocated == 0
+
+
+class TestScreenshotterFrameRings:
+    def test_buffers_reused_after_upload(self) -> None:
+        """Tests that screenshots are taken into the rings, and their buffers
+        reused once uploaded"""
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(64, 32),
+            regions="player_names",
+            frame_buffers=4,
+        )
+        screenshotter.pipeline.upload = lambda upload: None
+
+        frame_rings = screenshotter.frame_rings
+        assert frame_rings is not None
+
+        for _ in range(20):
+            future = screenshotter.process_screenshot()
+            assert future is not None
+            future.exception(timeout=5)
+            # The buffers are released by a callback of the future.
+            deadline = time.monotonic() + 5
+            while (
+                any(frame_ring.free < 4 for frame_ring in frame_rings)
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.001)
+        screenshotter.__exit__(None, None, None)
+
+        for frame_ring in frame_rings:
+            assert frame_ring.buffered == 20
+            assert frame_ring.allocated == 0
+
+    def test_gray_downscaled(self) -> None:
+        """Tests that screenshots can be taken gray and downscaled"""
+
+        screen = SyntheticScreen(64, 32)
+        screenshotter = Screenshotter(
+            "http://localhost", sct=screen, pixel_format="gray", downscale=2
+        )
+
+        (screenshot,) = screenshotter.take_regions()
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshot.shape == screenshotter.shape == (16, 32)
+        assert screenshotter.take_screenshot().shape == (16, 32)
+
+    def test_without_rings(self) -> None:
+        """Tests that no buffers allocates every screenshot"""
+
+        screenshotter = Screenshotter(
+            "http://localhost", sct=SyntheticScreen(64, 32), frame_buffers=0
+        )
+
+        first = screenshotter.take_regions()[0]
+        second = screenshotter.take_regions()[0]
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.frame_rings is None
+        assert first is not second
+        assert first.flags["C_CONTIGUOUS"]
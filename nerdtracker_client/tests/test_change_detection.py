@@ -0,0 +1,167 @@
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from nerdtracker_client.screenshots import (
+    ChangeDetector,
+    Screenshotter,
+    SyntheticScreen,
+    Transport,
+)
+from nerdtracker_client.screenshots.change_detection import (
+    mean_absolute_difference,
+)
+
+
+def frame(value: int, shape: tuple[int, ...] = (64, 64, 3)) -> np.ndarray:
+    """Creates a flat frame
+
+    Args:
+        value (int): The value of every pixel channel
+        shape (tuple[int, ...]): The shape. Defaults to (64, 64, 3).
+
+    Returns:
+        np.ndarray: The frame
+    """
+    return np.full(shape, value, dtype=np.uint8)
+
+
+class Response(NamedTuple):
+    status_code: int
+
+
+class TestChangeDetector:
+    def test_mean_absolute_difference(self) -> None:
+        """Tests that differences do not wrap around like uint8"""
+
+        assert mean_absolute_difference(frame(10), frame(0)) == 10.0
+        assert mean_absolute_difference(frame(0), frame(10)) == 10.0
+
+    def test_first_frame_is_sent(self) -> None:
+        """Tests that the first frame is always sent"""
+
+        detector = ChangeDetector()
+
+        assert detector.check([frame(0)])
+        assert detector.skipped == 0
+
+    def test_threshold(self) -> None:
+        """Tests that frames are only sent once they differ enough from the
+        last frame sent, with counters for the skipped ones"""
+
+        detector = ChangeDetector(threshold=4.0)
+        detector.check([frame(0)])
+
+        assert not detector.check([frame(3)])
+        assert detector.check([frame(4)])
+        assert not detector.check([frame(6)])
+        assert detector.checked == 4
+        assert detector.skipped == 2
+        assert detector.bytes_saved == 2 * 64 * 64 * 3
+
+    def test_slow_drift_is_sent(self) -> None:
+        """Tests that small changes add up against the last frame sent"""
+
+        detector = ChangeDetector(threshold=4.0)
+        detector.check([frame(0)])
+
+        sent = [detector.check([frame(value)]) for value in range(1, 9)]
+
+        assert sent == [False, False, False, True, False, False, False, True]
+
+    def test_strided(self) -> None:
+        """Tests that only one pixel in stride is compared"""
+
+        detector = ChangeDetector(threshold=1.0, stride=8)
+        detector.check([frame(0)])
+        changed = frame(0)
+        changed[1::8, 1::8] = 255
+
+        assert not detector.check([changed])
+
+    def test_any_region_changed(self) -> None:
+        """Tests that frames are sent when any of the regions changed"""
+
+        detector = ChangeDetector()
+        detector.check([frame(0), frame(0)])
+
+        assert detector.check([frame(0), frame(50)])
+
+    def test_shape_change_is_sent(self) -> None:
+        """Tests that frames of another shape are always sent"""
+
+        detector = ChangeDetector()
+        detector.check([frame(0)])
+
+        assert detector.check([frame(0, (32, 64, 3))])
+        assert detector.check([frame(0), frame(0)])
+
+    def test_max_skipped(self) -> None:
+        """Tests that a frame is forced after max_skipped skipped frames"""
+
+        detector = ChangeDetector(max_skipped=2)
+
+        sent = [detector.check([frame(0)]) for _ in range(7)]
+
+        assert sent == [True, False, False, True, False, False, True]
+
+    def test_reset(self) -> None:
+        """Tests that the frame after a reset is sent"""
+
+        detector = ChangeDetector()
+        detector.check([frame(0)])
+        detector.reset()
+
+        assert detector.check([frame(0)])
+
+    def test_screenshotter_skips_unchanged(self) -> None:
+        """Tests that the screenshotter skips unchanged screenshots before
+        encoding them"""
+
+        screen = SyntheticScreen(64, 32)
+        detector = ChangeDetector(threshold=255.0)
+        screenshotter = Screenshotter(
+            "http://localhost", sct=screen, change_detector=detector
+        )
+        assert screenshotter.change_detector is detector
+        detector.check([frame(0, (32, 64, 3))])
+
+        assert screenshotter.process_screenshot() is None
+        screenshotter.__exit__(None, None, None)
+
+        assert screen.frames == 1
+        assert screenshotter.frame_id == 0
+        assert detector.bytes_saved == 32 * 64 * 3
+
+    def test_screenshotter_resends_after_failed_upload(self) -> None:
+        """Tests that an unchanged screenshot is still sent when the upload
+        of the last one sent failed"""
+
+        class FailingTransport(Transport):
+            status_codes = [500, 200]
+
+            def post(self, *args: Any) -> Any:
+                return Response(self.status_codes.pop(0))
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(64, 32),
+            change_detector=ChangeDetector(),
+            transport=FailingTransport(),
+        )
+        screenshot = frame(0, (32, 64, 3))
+        screenshotter.take_regions = lambda: [screenshot]  # type: ignore
+
+        futures = []
+        for _ in range(3):
+            future = screenshotter.process_screenshot()
+            if future is not None:
+                future.result(timeout=5)
+            futures.append(future)
+        screenshotter.__exit__(None, None, None)
+
+        assert futures[0] is not None
+        assert futures[0].result().status_code == 500
+        assert futures[1] is not None
+        assert futures[1].result().status_code == 200
+        assert futures[2] is None
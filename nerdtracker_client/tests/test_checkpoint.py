@@ -0,0 +1,207 @@
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list import (
+    ConcurrentSnapshotList,
+    Listing,
+    SnapshotCheckpointer,
+    SnapshotList,
+    VirtualClock,
+    checkpoint,
+    read_checkpoint,
+    restore,
+    save_checkpoint,
+)
+from nerdtracker_client.player_list.checkpoint import write_checkpoint
+from nerdtracker_client.tests.constants import DATE_FLOAT
+
+STATS = ntc_stats.StatColumns(
+    {ntc_stats.KD_RATIO: 1.5, ntc_stats.KILLS: 300.0}  # type: ignore
+)
+
+
+class TestCheckpoint:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Tests that a restored list has the listings, stats and times of the
+        saved one"""
+
+        path = tmp_path / "list.ntck"
+        clock = VirtualClock(DATE_FLOAT)
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [], max_list_length=20, clock=clock
+        )
+        snapshot_list.feed_strings(["Joy#1648235", "", "CycoChris"])
+        snapshot_list.list[0].stats = STATS
+        snapshot_list.list[0].full_match = True
+        save_checkpoint(snapshot_list, path)
+
+        restored = restore(path, clock=clock)
+
+        assert restored.max_list_length == 20
+        assert [str(listing) for listing in restored.list] == [
+            "Joy#1648235",
+            "",
+            "CycoChris",
+        ]
+        assert restored.list[0].stats == STATS
+        assert restored.list[0].full_match
+        assert restored.list[2].last_seen == DATE_FLOAT
+
+    def test_votes_round_trip(self, tmp_path: Path) -> None:
+        """Tests that a restored listing keeps the readings behind its
+        consensus id"""
+
+        path = tmp_path / "list.ntck"
+        snapshot_list = SnapshotList([Listing("Joy#1648235")], 12, 300.0)
+        snapshot_list.list[0].observe("Joy#1648236")
+        save_checkpoint(snapshot_list, path)
+
+        restored = restore(path).list[0]
+        restored.observe("Joy#1648236")
+
+        assert restored.length_votes == {11: 3}
+        assert restored.id_votes[11][10] == {"5": 1, "6": 2}
+        assert restored.listing_id == "Joy#1648236"
+
+    def test_checkpoint_without_votes(self, tmp_path: Path) -> None:
+        """Tests that checkpoints saved before votes were can be restored"""
+
+        path = tmp_path / "list.ntck"
+        write_checkpoint(
+            {
+                "saved_at": DATE_FLOAT,
+                "max_list_length": 12,
+                "max_list_age": 300.0,
+                "listings": [
+                    ["Joy#1648235", False, DATE_FLOAT, DATE_FLOAT, None]
+                ],
+            },
+            path,
+        )
+
+        restored = restore(path, clock=VirtualClock(DATE_FLOAT))
+
+        assert [str(listing) for listing in restored.list] == ["Joy#1648235"]
+        assert restored.list[0].length_votes == {}
+
+    def test_stale_listings_dropped(self, tmp_path: Path) -> None:
+        """Tests that listings not observed within max_list_age, counting the
+        time before restoring, are dropped on restore"""
+
+        path = tmp_path / "list.ntck"
+        clock = VirtualClock(DATE_FLOAT)
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [], max_list_age=300.0, clock=clock
+        )
+        snapshot_list.feed_strings(["AAAAAAAA"])
+        clock.advance(200)
+        snapshot_list.feed_strings(["BBBBBBBB", "CCCCCCCC"])
+        save_checkpoint(snapshot_list, path)
+
+        clock.advance(150)
+        restored = restore(path, clock=clock)
+
+        assert [str(listing) for listing in restored.list] == [
+            "BBBBBBBB",
+            "CCCCCCCC",
+        ]
+
+        clock.advance(300)
+        assert restore(path, clock=clock).list == []
+
+    def test_stale_listings_not_published(self, tmp_path: Path) -> None:
+        """Tests that a restored ConcurrentSnapshotList does not publish the
+        listings dropped on restore"""
+
+        path = tmp_path / "list.ntck"
+        clock = VirtualClock(DATE_FLOAT)
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [], max_list_age=300.0, clock=clock
+        )
+        snapshot_list.feed_strings(["AAAAAAAA"])
+        clock.advance(200)
+        snapshot_list.feed_strings(["BBBBBBBB"])
+        save_checkpoint(snapshot_list, path)
+
+        clock.advance(150)
+        restored = restore(
+            path, list_factory=ConcurrentSnapshotList, clock=clock
+        )
+
+        assert isinstance(restored, ConcurrentSnapshotList)
+        assert [str(listing) for listing in restored.snapshot().listings] == [
+            "BBBBBBBB"
+        ]
+
+    def test_not_a_checkpoint(self, tmp_path: Path) -> None:
+        """Tests that reading another kind of file raises a ValueError"""
+
+        path = tmp_path / "list.ntck"
+        path.write_bytes(b"not a checkpoint")
+
+        with pytest.raises(ValueError):
+            read_checkpoint(path)
+
+
+class TestSnapshotCheckpointer:
+    def test_saves_every_changes(self, tmp_path: Path) -> None:
+        """Tests that a checkpoint is written once enough changes accumulate,
+        and a last one on close"""
+
+        path = tmp_path / "list.ntck"
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [], max_list_length=20
+        )
+        with SnapshotCheckpointer(snapshot_list, path, 3) as checkpointer:
+            snapshot_list.feed_strings(["AAAAAAAA", "BBBBBBBB"])
+            assert checkpointer.checkpoints == 0
+            snapshot_list.feed_strings(["BBBBBBBB", "CCCCCCCC"])
+            checkpointer.wait()
+            assert checkpointer.checkpoints == 1
+            assert len(read_checkpoint(path)["listings"]) == 3
+            snapshot_list.feed_strings(["CCCCCCCC", "DDDDDDDD"])
+
+        assert checkpointer.checkpoints == 2
+        assert len(read_checkpoint(path)["listings"]) == 4
+        assert not path.with_name(path.name + ".tmp").exists()
+
+    def test_votes_captured_before_write(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Tests that readings observed while a checkpoint is written in the
+        background are not part of it"""
+
+        path = tmp_path / "list.ntck"
+        writing = threading.Event()
+        release = threading.Event()
+
+        def slow_write(state: dict[str, Any], file_path: Path) -> None:
+            writing.set()
+            release.wait(5.0)
+            write_checkpoint(state, file_path)
+
+        monkeypatch.setattr(checkpoint, "write_checkpoint", slow_write)
+        snapshot_list = SnapshotList([Listing("Joy#1648235")], 12, 300.0)
+        listing = snapshot_list.list[0]
+        listing.observe("Joy#1648236")
+        with SnapshotCheckpointer(snapshot_list, path) as checkpointer:
+            checkpointer.save()
+            writing.wait(5.0)
+            for index in range(100):
+                listing.observe(f"Joy#16482{index:02d}")
+            release.set()
+            checkpointer.wait()
+
+        (saved,) = read_checkpoint(path)["listings"]
+        assert saved[5] == [
+            [
+                11,
+                2,
+                [{character: 2} for character in "Joy#164823"]
+                + [{"5": 1, "6": 1}],
+            ]
+        ]
@@ -0,0 +1,178 @@
+import io
+import json
+import threading
+from pathlib import Path
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.cli import (
+    CSV_COLUMNS,
+    RateLimiter,
+    RecordWriter,
+    StatsCache,
+    lookup_stream,
+    read_ids,
+)
+
+
+class FakeFetcher:
+    """Returns made-up stats, failing for ids starting with "bad" """
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, user_id: str) -> ntc_stats.StatColumns:
+        with self.lock:
+            self.calls.append(user_id)
+        if user_id.startswith("bad"):
+            raise ConnectionError(user_id)
+        return ntc_stats.StatColumns(
+            {ntc_stats.KD_RATIO: len(user_id)}  # type: ignore
+        )
+
+
+class TestReadIds:
+    def test_chunks(self) -> None:
+        """Tests that ids are read in chunks, skipping blank lines"""
+
+        stream = io.StringIO("a\n\nb\n  c  \nd\ne\n")
+
+        assert list(read_ids(stream, 2)) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+class TestRateLimiter:
+    def test_spacing(self) -> None:
+        """Tests that calls are spaced out to stay within the rate"""
+
+        current_time = [0.0]
+        sleeps: list[float] = []
+
+        def sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            current_time[0] += seconds
+
+        rate_limiter = RateLimiter(4.0, lambda: current_time[0], sleep)
+        for _ in range(3):
+            rate_limiter.wait()
+
+        assert sleeps == [0.25, 0.25]
+
+    def test_no_limit(self) -> None:
+        """Tests that no rate never waits"""
+
+        def sleep(seconds: float) -> None:
+            raise AssertionError(f"Slept for {seconds}s")
+
+        rate_limiter = RateLimiter(None, sleep=sleep)
+
+        rate_limiter.wait()
+
+
+class TestLookupStream:
+    def test_records(self) -> None:
+        """Tests that every id gets a record, with errors reported instead of
+        raised, and duplicates in a chunk only fetched once"""
+
+        fetcher = FakeFetcher()
+
+        records = list(
+            lookup_stream([["abc", "bad1", "abc"], ["de"]], fetcher, 4)
+        )
+
+        by_id = {record["id"]: record for record in records}
+        assert len(records) == 3
+        assert by_id["abc"]["stats"] == {ntc_stats.KD_RATIO: 3}
+        assert by_id["bad1"]["stats"] is None
+        assert "ConnectionError" in str(by_id["bad1"]["error"])
+        assert sorted(fetcher.calls) == ["abc", "bad1", "de"]
+
+    def test_cache_file(self, tmp_path: Path) -> None:
+        """Tests that stats cached by one run are reused by the next"""
+
+        path = tmp_path / "cache.ndjson"
+        cache = StatsCache(path)
+        list(lookup_stream([["abc", "bad1"]], FakeFetcher(), cache=cache))
+        cache.close()
+
+        fetcher = FakeFetcher()
+        cache = StatsCache(path)
+        records = list(lookup_stream([["abc", "bad1"]], fetcher, cache=cache))
+        cache.close()
+
+        assert fetcher.calls == ["bad1"]
+        assert [r["cached"] for r in records if r["id"] == "abc"] == [True]
+
+    def test_empty_stats_not_cached(self, tmp_path: Path) -> None:
+        """Tests that empty stats, as returned when tracker.gg blocks the
+        scraper, are fetched again by the next run"""
+
+        def fetch_stats(user_id: str) -> ntc_stats.StatColumns:
+            return ntc_stats.StatColumns()  # type: ignore
+
+        path = tmp_path / "cache.ndjson"
+        cache = StatsCache(path)
+        list(lookup_stream([["abc"]], fetch_stats, cache=cache))
+        cache.close()
+
+        fetcher = FakeFetcher()
+        cache = StatsCache(path)
+        list(lookup_stream([["abc"]], fetcher, cache=cache))
+        cache.close()
+
+        assert fetcher.calls == ["abc"]
+
+    def test_rolling_window(self) -> None:
+        """Tests that the ids of the next chunks are looked up while a slow
+        lookup of an earlier chunk is still running"""
+
+        later_started = threading.Event()
+
+        def fetch_stats(user_id: str) -> ntc_stats.StatColumns:
+            if user_id == "slow":
+                assert later_started.wait(5.0)
+            else:
+                later_started.set()
+            return ntc_stats.StatColumns()  # type: ignore
+
+        records = list(
+            lookup_stream([["slow"], ["a"], ["b"]], fetch_stats, concurrency=2)
+        )
+
+        assert sorted(record["id"] for record in records) == ["a", "b", "slow"]
+        assert all(record["error"] is None for record in records)
+
+
+class TestRecordWriter:
+    def test_ndjson(self) -> None:
+        """Tests that records are written one JSON object per line"""
+
+        out = io.StringIO()
+        writer = RecordWriter(out)
+        writer.write(
+            {"id": "abc", "stats": None, "cached": False, "error": "boom"}
+        )
+
+        assert json.loads(out.getvalue()) == {
+            "id": "abc",
+            "stats": None,
+            "cached": False,
+            "error": "boom",
+        }
+
+    def test_csv(self) -> None:
+        """Tests that records are written as CSV rows with a header"""
+
+        out = io.StringIO()
+        writer = RecordWriter(out, "csv")
+        writer.write(
+            {
+                "id": "abc",
+                "stats": {ntc_stats.KD_RATIO: "1.5"},  # type: ignore
+                "cached": True,
+                "error": None,
+            }
+        )
+
+        header, row = out.getvalue().splitlines()
+        assert header.split(",") == CSV_COLUMNS
+        assert row.startswith("abc,True,,1.5,")
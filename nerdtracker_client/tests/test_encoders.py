@@ -0,0 +1,170 @@
+import numpy as np
+import pytest
+
+from nerdtracker_client.screenshots import (
+    EncodeStats,
+    FrameEncoder,
+    JpegEncoder,
+    PngEncoder,
+    Screenshotter,
+    SyntheticScreen,
+    WebpEncoder,
+    ZlibEncoder,
+    ZstdEncoder,
+    create_encoder,
+    decode_frame,
+)
+from nerdtracker_client.screenshots.encoders import decode, encode
+
+
+@pytest.fixture
+def screenshot() -> np.ndarray:
+    """A scoreboard-like BGR screenshot, as taken by the Screenshotter
+
+    Returns:
+        np.ndarray: The screenshot
+    """
+    screen = SyntheticScreen(160, 90, pattern="scoreboard")
+    return screen.grab(screen.monitors[1])[:, :, :-1]
+
+
+def round_trip(frame: np.ndarray, encoder: FrameEncoder) -> np.ndarray:
+    """Encodes a frame, sends it through the wire format and decodes it
+
+    Args:
+        frame (np.ndarray): The frame
+        encoder (FrameEncoder): The encoder
+
+    Returns:
+        np.ndarray: The decoded frame
+    """
+    payload = encode(frame, encoder, frame_id=3)
+    decoded = decode_frame(payload.tobytes())
+    assert decoded.header.encoding == encoder.name
+    assert decoded.header.frame_id == 3
+    return decode(decoded)
+
+
+class TestEncoders:
+    @pytest.mark.parametrize(
+        "encoder",
+        [
+            FrameEncoder(),
+            PngEncoder(),
+            ZlibEncoder(),
+            WebpEncoder(lossless=True),
+        ],
+        ids=repr,
+    )
+    def test_lossless_round_trip(
+        self, screenshot: np.ndarray, encoder: FrameEncoder
+    ) -> None:
+        """Tests that lossless encoders decode back to the exact pixels"""
+
+        assert encoder.lossless
+        assert np.array_equal(round_trip(screenshot, encoder), screenshot)
+
+    @pytest.mark.parametrize(
+        "encoder", [JpegEncoder(quality=90), WebpEncoder(quality=90)], ids=repr
+    )
+    def test_lossy_round_trip(
+        self, screenshot: np.ndarray, encoder: FrameEncoder
+    ) -> None:
+        """Tests that lossy encoders decode back to similar pixels, in the
+        same BGR order"""
+
+        decoded = round_trip(screenshot, encoder)
+
+        assert not encoder.lossless
+        assert decoded.shape == screenshot.shape
+        error = np.abs(decoded.astype(int) - screenshot.astype(int))
+        assert error.mean() < 8
+
+    def test_channel_order(self) -> None:
+        """Tests that image encoders keep blue as blue"""
+
+        frame = np.zeros((16, 16, 3), dtype=np.uint8)
+        frame[:, :, 0] = 255
+
+        decoded = round_trip(frame, PngEncoder())
+
+        assert (decoded[:, :, 0] == 255).all()
+        assert (decoded[:, :, 1:] == 0).all()
+
+    def test_bgra_drops_alpha(self, screenshot: np.ndarray) -> None:
+        """Tests that image encoders read BGRA frames without the alpha
+        channel"""
+
+        bgra = np.dstack(
+            [screenshot, np.full(screenshot.shape[:2], 255, np.uint8)]
+        )
+
+        decoded = round_trip(bgra, PngEncoder())
+
+        assert np.array_equal(decoded, screenshot)
+
+    def test_gray(self) -> None:
+        """Tests that single channel frames stay single channel"""
+
+        frame = np.arange(64, dtype=np.uint8).reshape(8, 8)
+
+        assert np.array_equal(round_trip(frame, PngEncoder()), frame)
+
+    def test_image_encoders_reject_other_dtypes(self) -> None:
+        """Tests that image encoders only take 8-bit frames"""
+
+        with pytest.raises(ValueError):
+            PngEncoder().encode(np.zeros((4, 4, 3), dtype=np.float32))
+
+    def test_zstd_round_trip(self, screenshot: np.ndarray) -> None:
+        """Tests the zstd encoder, when zstandard is installed"""
+
+        pytest.importorskip("zstandard")
+
+        assert np.array_equal(round_trip(screenshot, ZstdEncoder()), screenshot)
+
+    def test_create_encoder(self) -> None:
+        """Tests that encoders are created by name with their options"""
+
+        encoder = create_encoder("jpeg", quality=50)
+
+        assert isinstance(encoder, JpegEncoder)
+        assert encoder.save_options == {"quality": 50}
+        assert type(create_encoder()) is FrameEncoder
+        with pytest.raises(ValueError):
+            create_encoder("gif")
+
+
+class TestEncodeStats:
+    def test_record(self) -> None:
+        """Tests the compression ratio and latency of recorded frames"""
+
+        stats = EncodeStats()
+        assert stats.compression_ratio == 1.0
+        assert stats.mean_latency_ms == 0.0
+
+        stats.record(1000, 100, 0.002)
+        stats.record(1000, 300, 0.004)
+
+        assert stats.frames == 2
+        assert stats.compression_ratio == 5.0
+        assert stats.mean_latency_ms == pytest.approx(3.0)
+
+    def test_compressed_screenshots(self) -> None:
+        """Tests that the Screenshotter compresses with its encoder and keeps
+        the stats"""
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(320, 180, pattern="scoreboard"),
+            encoder=PngEncoder(),
+        )
+        screenshot = screenshotter.take_screenshot()
+
+        payload = screenshotter.encode_screenshot(screenshot)
+        screenshotter.__exit__(None, None, None)
+
+        assert payload.header.encoding == "png"
+        assert len(payload) < screenshot.nbytes
+        assert screenshotter.encode_stats.frames == 1
+        assert screenshotter.encode_stats.compression_ratio > 1
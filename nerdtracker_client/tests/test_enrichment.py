@@ -0,0 +1,198 @@
+import threading
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list import (
+    ConcurrentSnapshotList,
+    Listing,
+    SnapshotList,
+    StatsEnricher,
+)
+
+
+class FakeFetcher:
+    """Stand-in for tracker.gg that only answers once released"""
+
+    def __init__(self, stats: ntc_stats.StatColumns) -> None:
+        self.stats = stats
+        self.release = threading.Event()
+        self.calls: list[str] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key: str) -> ntc_stats.StatColumns:
+        with self.lock:
+            self.calls.append(key)
+        self.release.wait(5.0)
+        return self.stats
+
+
+def wait_until_idle(enricher: StatsEnricher) -> None:
+    for _ in range(500):
+        if not enricher.pending:
+            return
+        threading.Event().wait(0.01)
+
+
+class TestStatsEnricher:
+    def test_fetches_existing_and_added_listings(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that listings without stats get them in the background"""
+
+        fetcher = FakeFetcher(fake_stats)
+        snapshot_list = SnapshotList([Listing("PlayerOne#123")], 12, 300.0)
+        with StatsEnricher(snapshot_list, fetcher) as enricher:
+            snapshot_list.new_snapshot(
+                [Listing("PlayerOne#123"), Listing("PlayerTwo#456")]
+            )
+            assert enricher.pending == {"PlayerOne#123", "PlayerTwo#456"}
+
+            fetcher.release.set()
+            wait_until_idle(enricher)
+
+        assert all(
+            listing.stats == fake_stats for listing in snapshot_list.list
+        )
+        assert sorted(fetcher.calls) == ["PlayerOne#123", "PlayerTwo#456"]
+
+    def test_dropped_listing_cancelled(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that the fetch of a dropped listing is cancelled"""
+
+        fetcher = FakeFetcher(fake_stats)
+        snapshot_list: SnapshotList[Listing] = SnapshotList([], 2, 300.0)
+        with StatsEnricher(snapshot_list, fetcher, max_workers=1) as enricher:
+            snapshot_list.new_snapshot(
+                [Listing("AAAAAAAA"), Listing("BBBBBBBB")]
+            )
+            snapshot_list.new_snapshot(
+                [Listing("CCCCCCCC"), Listing("DDDDDDDD")]
+            )
+            assert enricher.pending == {"CCCCCCCC", "DDDDDDDD"}
+
+            fetcher.release.set()
+            wait_until_idle(enricher)
+
+        assert "BBBBBBBB" not in fetcher.calls
+        assert "BBBBBBBB" not in enricher.stats_cache
+
+    def test_cached_stats_reused(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that stats already fetched are attached without a new fetch"""
+
+        fetcher = FakeFetcher(fake_stats)
+        fetcher.release.set()
+        snapshot_list = SnapshotList([Listing("PlayerOne#123")], 12, 300.0)
+        with StatsEnricher(snapshot_list, fetcher) as enricher:
+            wait_until_idle(enricher)
+            snapshot_list.drop(0)
+            snapshot_list.new_snapshot([Listing("PlayerOne#123")])
+
+        assert snapshot_list.list[0].stats == fake_stats
+        assert fetcher.calls == ["PlayerOne#123"]
+
+    def test_stats_kept_on_full_match_upgrade(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that a full match upgrade keeps the stats of the listing it
+        replaces"""
+
+        snapshot_list = SnapshotList(
+            [Listing("PlayerOne#123", stats=fake_stats), Listing("Two#456")],
+            12,
+            300.0,
+        )
+        snapshot_list.new_snapshot(
+            [Listing("PlayerOne#1234", full_match=True), Listing("Two#456")]
+        )
+
+        assert snapshot_list.list[0].full_match
+        assert snapshot_list.list[0].stats == fake_stats
+
+    def test_empty_stats_retried(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that empty stats, as returned when tracker.gg blocks the
+        scraper, are neither cached nor attached, and fetched again"""
+
+        empty: ntc_stats.StatColumns = {}  # type: ignore
+        answers = [empty, empty, fake_stats]
+        calls: list[str] = []
+
+        def fetch_stats(key: str) -> ntc_stats.StatColumns:
+            calls.append(key)
+            return answers[len(calls) - 1]
+
+        snapshot_list = SnapshotList([Listing("PlayerOne#123")], 12, 300.0)
+        with StatsEnricher(snapshot_list, fetch_stats) as enricher:
+            wait_until_idle(enricher)
+
+        assert calls == ["PlayerOne#123"] * 3
+        assert snapshot_list.list[0].stats == fake_stats
+        assert enricher.failures == {}
+
+    def test_failed_fetch_attempts_bounded(self) -> None:
+        """Tests that a fetch that keeps failing is only attempted
+        max_attempts times"""
+
+        calls: list[str] = []
+
+        def fetch_stats(key: str) -> ntc_stats.StatColumns:
+            calls.append(key)
+            raise ConnectionError(key)
+
+        snapshot_list = SnapshotList([Listing("PlayerOne#123")], 12, 300.0)
+        enricher = StatsEnricher(snapshot_list, fetch_stats, max_attempts=2)
+        with enricher:
+            wait_until_idle(enricher)
+            enricher.request(snapshot_list.list[0])
+
+        assert calls == ["PlayerOne#123"] * 2
+        assert not snapshot_list.list[0].has_stats
+        assert enricher.stats_cache == {}
+        assert enricher.failures == {"PlayerOne#123": 2}
+
+    def test_concurrent_list(self, fake_stats: ntc_stats.StatColumns) -> None:
+        """Tests that stats attached to a ConcurrentSnapshotList are published
+        as a new version without changing the listings readers hold, even
+        while another thread feeds it"""
+
+        fetcher = FakeFetcher(fake_stats)
+        snapshot_list = ConcurrentSnapshotList([], 12, 300.0)
+        stop = threading.Event()
+
+        def feed(players: list[str]) -> None:
+            # Every other frame drops the last two players.
+            frame = 0
+            while not stop.is_set():
+                snapshot_list.feed_strings(players[: 6 - 2 * (frame % 2)])
+                frame += 1
+
+        with StatsEnricher(snapshot_list, fetcher) as enricher:
+            snapshot_list.feed_strings([letter * 8 for letter in "ABCDEF"])
+            held = snapshot_list.snapshot()
+            fetcher.release.set()
+            wait_until_idle(enricher)
+            attached = snapshot_list.snapshot()
+
+            feeder = threading.Thread(
+                target=feed, args=([letter * 8 for letter in "GHIJKL"],)
+            )
+            feeder.start()
+            for _ in range(500):
+                if len(enricher.stats_cache) == 12:
+                    break
+                threading.Event().wait(0.01)
+            wait_until_idle(enricher)
+            stop.set()
+            feeder.join()
+
+        assert not any(listing.has_stats for listing in held.listings)
+        assert attached.version > held.version
+        assert all(listing.stats is fake_stats for listing in attached.listings)
+        assert len(snapshot_list.snapshot().listings) >= 4
+        assert all(
+            listing.stats is fake_stats
+            for listing in snapshot_list.snapshot().listings
+        )
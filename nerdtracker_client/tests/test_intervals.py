@@ -0,0 +1,129 @@
+import random
+
+import numpy as np
+import pytest
+
+from nerdtracker_client.intervals import (
+    chunk_bounds,
+    chunks,
+    find_gaps,
+    impute_missing,
+    missing_values,
+    run_boundaries,
+    run_length_encode,
+)
+from nerdtracker_client.util import (
+    identify_chunks,
+    identify_chunks_alternating_indices,
+    identify_missing_values,
+)
+
+
+def random_data(rng: random.Random, length: int) -> list[int | None]:
+    """Creates a mostly increasing list of integers with Nones and drops
+
+    Args:
+        rng (random.Random): The random number generator to use.
+        length (int): The length of the list.
+
+    Returns:
+        list[int | None]: The list, starting with an integer
+    """
+    data: list[int | None] = []
+    value = rng.randint(0, 10)
+    for index in range(length):
+        value += rng.choice((1, 1, 1, 2, 3))
+        if (index > 0) and (rng.random() < 0.3):
+            data.append(None)
+        else:
+            data.append(value)
+    return data
+
+
+def test_run_length_encode() -> None:
+    """Tests the run_length_encode function"""
+
+    values, starts, lengths = run_length_encode(
+        np.array([False, False, True, False])
+    )
+
+    assert values.tolist() == [False, True, False]
+    assert starts.tolist() == [0, 2, 3]
+    assert lengths.tolist() == [2, 1, 1]
+
+
+def test_run_length_encode_empty() -> None:
+    """Tests the run_length_encode function with an empty mask"""
+
+    values, starts, lengths = run_length_encode(np.array([], dtype=bool))
+
+    assert values.size == starts.size == lengths.size == 0
+
+
+def test_run_boundaries() -> None:
+    """Tests the run_boundaries function against the examples of
+    identify_chunks_alternating_indices"""
+
+    data = [1, 2, 3, None, 4, 5, 6, None, None, 7, 8, 9, 10]
+
+    assert run_boundaries(data).tolist() == [3, 4, 7, 9]
+    assert run_boundaries([None] * 10).tolist() == [0]
+    assert run_boundaries(list(range(10))).tolist() == []
+
+
+def test_chunks() -> None:
+    """Tests the chunks and chunk_bounds functions"""
+
+    data = [1, 2, 3, None, None, 4, 5, 6, None, 7, 8, 9, 10]
+
+    assert chunk_bounds(data) == [(0, 3), (5, 8), (9, 13)]
+    assert chunks(data) == [[1, 2, 3], [4, 5, 6], [7, 8, 9, 10]]
+    assert chunks([None] * 10) == []
+
+
+def test_find_gaps() -> None:
+    """Tests the find_gaps function"""
+
+    assert find_gaps([1, 2, 5, 6, 9]).tolist() == [3, 4, 7, 8]
+    assert find_gaps([1, 2, 3]).tolist() == []
+    assert find_gaps([]).tolist() == []
+
+
+def test_impute_missing() -> None:
+    """Tests the impute_missing function"""
+
+    data = [1, 2, None, None, 7, None]
+
+    assert impute_missing(data).tolist() == [1, 2, 3, 4, 7, 8]
+
+
+def test_impute_missing_first_none() -> None:
+    """Tests the impute_missing function if there is a None at the
+    beginning"""
+
+    with pytest.raises(TypeError):
+        impute_missing([None, 1, 2])
+
+
+def test_missing_values() -> None:
+    """Tests the missing_values function against the example of
+    identify_missing_values"""
+
+    data = [1, 2, 3, None, 6, 7, None, 9, 10, None]
+
+    assert missing_values(data).tolist() == [5]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_util(seed: int) -> None:
+    """Tests that the vectorized functions give the same results as the ones
+    in util on random data"""
+
+    rng = random.Random(seed)
+    data = random_data(rng, rng.randint(1, 200))
+
+    assert missing_values(data).tolist() == identify_missing_values(data)
+    assert run_boundaries(data).tolist() == (
+        identify_chunks_alternating_indices(data)
+    )
+    assert chunks(data) == identify_chunks(data)
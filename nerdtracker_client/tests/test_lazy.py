@@ -0,0 +1,121 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from nerdtracker_client.lazy import lazy_exports, lazy_module
+
+HEAVY_MODULES = [
+    "bs4",
+    "cloudscraper",
+    "fuzzywuzzy.fuzz",
+    "mss",
+    "numpy",
+    "requests",
+]
+
+
+def imported_modules(code: str) -> set[str]:
+    """Runs code in a fresh interpreter and returns the heavy modules that
+    were actually executed.
+
+    Args:
+        code (str): The code to run.
+
+    Returns:
+        set[str]: The heavy modules that were executed
+    """
+    script = (
+        code
+        + "\nimport sys, importlib.util"
+        + f"\nfor name in {HEAVY_MODULES!r}:"
+        + "\n    module = sys.modules.get(name)"
+        + "\n    if module is not None and not isinstance("
+        + "module, importlib.util._LazyModule):"
+        + "\n        print(name)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import nerdtracker_client",
+        "import nerdtracker_client.player_list",
+        "from nerdtracker_client.player_list import SnapshotList",
+        "import nerdtracker_client.scraper",
+        "from nerdtracker_client.screenshots import Screenshotter",
+    ],
+)
+def test_import_loads_no_heavy_modules(code: str) -> None:
+    """Tests that importing the package and its subpackages does not load any
+    heavy dependency"""
+
+    assert imported_modules(code) == set()
+
+
+def test_heavy_module_loaded_on_use() -> None:
+    """Tests that a lazily imported dependency loads when first used"""
+
+    code = (
+        "from nerdtracker_client.player_list import Listing\n"
+        + "Listing('Joy#1648235') == Listing('Joy#1648236')"
+    )
+
+    assert imported_modules(code) == {"fuzzywuzzy.fuzz"}
+
+
+def test_lazy_module_missing() -> None:
+    """Tests that a missing module raises straight away"""
+
+    with pytest.raises(ModuleNotFoundError):
+        lazy_module("nerdtracker_client.does_not_exist")
+
+
+def test_lazy_module_thread_safe(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that threads first touching a lazy module at the same time all
+    see it fully executed"""
+
+    (tmp_path / "slow_module.py").write_text(
+        "import time\nSTARTED = True\ntime.sleep(0.2)\nDONE = True\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "slow_module", raising=False)
+    module = lazy_module("slow_module")
+    barrier = threading.Barrier(8)
+    results: list[object] = []
+
+    def touch() -> None:
+        barrier.wait()
+        try:
+            results.append(module.DONE)
+        except AttributeError as error:
+            results.append(error)
+
+    threads = [threading.Thread(target=touch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 8
+
+
+def test_lazy_exports_unknown_name() -> None:
+    """Tests that accessing a name that is not exported raises an
+    AttributeError"""
+
+    getattr_function, _ = lazy_exports("nerdtracker_client", {})
+
+    with pytest.raises(AttributeError):
+        getattr_function("missing")
@@ -81,6 +81,16 @@ class TestListing:
             listing.update_time(None)
             assert listing.listing_time == DATE_FLOAT + 1
 
+    def test_mark_seen(self, listing: Listing) -> None:
+        """Tests the mark_seen method of the listing class"""
+
+        assert listing.last_seen == DATE_FLOAT
+
+        listing.mark_seen(DATE_FLOAT + 10)
+
+        assert listing.last_seen == DATE_FLOAT + 10
+        assert listing.listing_time == DATE_FLOAT
+
     def test_is_empty_property(self, listing: Listing) -> None:
         """Tests the is_empty property of the listing class"""
 
@@ -119,6 +129,94 @@ class TestListing:
         assert listing_true.listing_id == "5"
         assert listing_true.full_match is True
 
+    def test_copy_keeps_stats(self, listing_with_stats: Listing) -> None:
+        """Tests that copying a listing keeps its stats"""
+
+        copied_listing = listing_with_stats.copy()
+
+        assert copied_listing is not listing_with_stats
+        assert copied_listing.stats == listing_with_stats.stats
+        assert copied_listing.listing_time == listing_with_stats.listing_time
+
+    def test_update_keeps_stats(self, listing_with_stats: Listing) -> None:
+        """Tests that updating a listing with one without stats keeps the
+        stats"""
+
+        listing_with_stats.update(Listing("55"))
+        listing_with_stats.update(Listing("55"))
+
+        assert listing_with_stats.listing_id == "55"
+        assert listing_with_stats.has_stats
+
+    def test_update_consensus(self, listing: Listing) -> None:
+        """Tests that updating a listing moves its id to the consensus of the
+        readings instead of the latest one"""
+
+        listing.update(Listing("Joy#1648235"))
+        listing.update(Listing("Joy#1648235"))
+        listing.update(Listing("J0y#1648236"))
+
+        assert listing.listing_id == "Joy#1648235"
+
+    def test_observe_hysteresis(self) -> None:
+        """Tests that the consensus id only changes when another reading has
+        strictly more votes"""
+
+        listing = Listing("Joy#1648235")
+
+        listing.observe("Joy#1648236")
+        assert listing.listing_id == "Joy#1648235"
+
+        listing.observe("Joy#1648236")
+        assert listing.listing_id == "Joy#1648236"
+
+    def test_observe_truncated(self) -> None:
+        """Tests that a truncated reading does not shorten the consensus id
+        until it is the most common length"""
+
+        listing = Listing("Joy#1648235")
+
+        listing.observe("Joy#16")
+        assert listing.listing_id == "Joy#1648235"
+
+        listing.observe("Joy#16")
+        assert listing.listing_id == "Joy#16"
+
+    def test_observe_shifted_readings(self) -> None:
+        """Tests that readings that insert or drop a character do not shift
+        the votes of the readings of the consensus length"""
+
+        listing = Listing("ABCDEFGH")
+
+        for observed_id in ["ABCDEFGH", "ABCDEFGH"]:
+            listing.observe(observed_id)
+        for observed_id in ["ACDEFGH", "ACDEFGH", "ACBCDEFGH", "ACBCDEFGH"]:
+            listing.observe(observed_id)
+
+        assert listing.listing_id == "ABCDEFGH"
+
+    def test_observe_int_id(self) -> None:
+        """Tests that reading a listing whose id is an int keeps its id"""
+
+        listing = Listing(12345)
+
+        listing.observe("12345")
+        assert str(listing) == "12345"
+
+        listing.observe("12346")
+        assert str(listing) == "12345"
+
+    def test_update_full_match_overrides_consensus(
+        self, listing: Listing
+    ) -> None:
+        """Tests that a full match replaces the consensus id outright"""
+
+        listing.update(Listing("5"))
+        listing.update(Listing("6", full_match=True))
+
+        assert listing.listing_id == "6"
+        assert listing.full_match is True
+
 
 class TestEmptyListing:
     def test_init(self, empty_listing: EmptyListing) -> None:
@@ -167,6 +265,13 @@ class TestEmptyListing:
 
         assert empty_listing.listing_time == 0.0
 
+    def test_mark_seen(self, empty_listing: EmptyListing) -> None:
+        """Tests the mark_seen method of the empty listing class"""
+
+        empty_listing.mark_seen(DATE_FLOAT)
+
+        assert empty_listing.last_seen == 0.0
+
     def test_is_empty_property(self, empty_listing: EmptyListing) -> None:
         """Tests the is_empty property of the empty listing class"""
 
@@ -0,0 +1,167 @@
+from typing import cast
+
+import nerdtracker_client.constants.stats as ntc_stats
+from nerdtracker_client.player_list import (
+    ConcurrentSnapshotList,
+    Listing,
+    SnapshotListManager,
+)
+
+
+class TestSnapshotListManager:
+    def test_routes_by_key(self) -> None:
+        """Tests that snapshots are routed to the list for their key"""
+
+        manager = SnapshotListManager()
+        manager.feed_strings("team_a", ["1", "2", "3"])
+        manager.feed_strings("team_b", ["4", "5"])
+
+        assert set(manager) == {"team_a", "team_b"}
+        assert [str(listing) for listing in manager["team_a"].list] == [
+            "1",
+            "2",
+            "3",
+        ]
+        assert [str(listing) for listing in manager["team_b"].list] == [
+            "4",
+            "5",
+        ]
+
+    def test_list_factory_and_kwargs(self) -> None:
+        """Tests that lists are created through the factory with the given
+        keyword arguments"""
+
+        manager = SnapshotListManager(
+            list_factory=ConcurrentSnapshotList, max_list_length=4
+        )
+        snapshot_list = manager.get("monitor_1")
+
+        assert isinstance(snapshot_list, ConcurrentSnapshotList)
+        assert snapshot_list.max_list_length == 4
+
+    def test_stats_shared_across_lists(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that a player seen in two lists shares one stats object"""
+
+        manager = SnapshotListManager()
+        manager.new_snapshot(
+            "session_1", [Listing("PlayerOne#123", stats=fake_stats)]
+        )
+        manager.new_snapshot("session_2", [Listing("PlayerOne#123")])
+
+        first = manager["session_1"].list[0]
+        second = manager["session_2"].list[0]
+        assert second.stats is first.stats
+        assert manager.metrics()["shared_stats"] == 1
+
+    def test_attach_stats(self, fake_stats: ntc_stats.StatColumns) -> None:
+        """Tests that attached stats reach every list"""
+
+        manager = SnapshotListManager()
+        manager.feed_strings("team_a", ["PlayerOne#123", "PlayerTwo#456"])
+        manager.feed_strings("team_b", ["PlayerOne#123"])
+
+        assert manager.attach_stats("PlayerOne#123", fake_stats) == 2
+        assert manager["team_b"].list[0].stats is fake_stats
+
+    def test_budget_evicts_least_recently_used(self) -> None:
+        """Tests that idle lists are evicted once over the listing budget"""
+
+        manager = SnapshotListManager(max_total_listings=5)
+        manager.feed_strings("old", ["1", "2", "3"])
+        manager.feed_strings("recent", ["4", "5"])
+        manager.get("old")
+        manager.feed_strings("new", ["6", "7"])
+
+        assert set(manager) == {"old", "new"}
+        metrics = manager.metrics()
+        assert metrics["evicted_lists"] == 1
+        assert metrics["lists"] == 2
+        assert metrics["listings"] == 5
+        assert metrics["snapshots"] == 3
+        assert metrics["added"] == 7
+
+    def test_listings_shared_across_lists(self) -> None:
+        """Tests that a player seen in two lists starts from the consensus
+        reached in the first list, in a listing of its own"""
+
+        manager = SnapshotListManager()
+        manager.new_snapshot("session_1", [Listing("PlayerOne#123")])
+        for _ in range(2):
+            manager.new_snapshot("session_1", [Listing("PlayerOne#1234")])
+        manager.new_snapshot("session_2", [Listing("PlayerOne#1234")])
+
+        first = manager["session_1"].list[0]
+        second = manager["session_2"].list[0]
+        assert second is not first
+        assert second.length_votes == first.length_votes
+        assert manager.metrics()["shared_listings"] == 2
+
+    def test_shared_listing_expires_per_list(self) -> None:
+        """Tests that a player still seen in one list expires from another
+        list that stopped seeing them"""
+
+        now = [0.0]
+        manager = SnapshotListManager(max_list_age=300.0, clock=lambda: now[0])
+        manager.new_snapshot("team_a", [Listing("PlayerOne#123")])
+        manager.new_snapshot("team_b", [Listing("PlayerOne#123")])
+
+        now[0] = 200.0
+        manager.new_snapshot("team_a", [Listing("PlayerOne#123")])
+        now[0] = 400.0
+        changes = manager.new_snapshot("team_b", [Listing("AAAAAAAA")])
+
+        assert changes.dropped == [Listing("PlayerOne#123")]
+        assert [str(listing) for listing in manager["team_b"].list] == [
+            "AAAAAAAA"
+        ]
+        assert manager["team_a"].list[0].last_seen == 200.0
+
+    def test_concurrent_lists_not_mutated(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that sharing and attaching stats publishes a new version of
+        a ConcurrentSnapshotList, without changing the listings readers
+        hold"""
+
+        manager = SnapshotListManager(list_factory=ConcurrentSnapshotList)
+        manager.new_snapshot("team_a", [Listing("PlayerOne#123")])
+        team_a = cast(ConcurrentSnapshotList, manager["team_a"])
+        held = team_a.snapshot()
+
+        manager.new_snapshot(
+            "team_b", [Listing("PlayerOne#123", stats=fake_stats)]
+        )
+        manager.attach_stats("PlayerOne#123", fake_stats)
+
+        assert not held.listings[0].has_stats
+        assert team_a.changed_since(held.version)
+        assert team_a.snapshot().listings[0].stats is fake_stats
+
+    def test_index_pruned_on_eviction(
+        self, fake_stats: ntc_stats.StatColumns
+    ) -> None:
+        """Tests that the index entries of an evicted list are dropped, unless
+        another list still keeps the listing"""
+
+        manager = SnapshotListManager(max_total_listings=3)
+        manager.new_snapshot(
+            "old",
+            [
+                Listing("PlayerOne#123", stats=fake_stats),
+                Listing("PlayerTwo#456", stats=fake_stats),
+            ],
+        )
+        manager.new_snapshot("new", [Listing("PlayerTwo#456")])
+        manager.new_snapshot(
+            "new", [Listing("PlayerTwo#456"), Listing("PlayerThree#789")]
+        )
+
+        assert set(manager) == {"new"}
+        assert "PlayerOne#123" not in manager.index
+        assert "PlayerTwo#456" in manager.index
+        assert set(manager.index.listings) == {
+            "PlayerTwo#456",
+            "PlayerThree#789",
+        }
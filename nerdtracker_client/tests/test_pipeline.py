@@ -0,0 +1,250 @@
+import threading
+import time
+from typing import Any, NamedTuple
+
+import pytest
+
+from nerdtracker_client.screenshots import (
+    Screenshotter,
+    SyntheticScreen,
+    Transport,
+)
+from nerdtracker_client.screenshots.pipeline import (
+    CapturePipeline,
+    DropOldestQueue,
+    QueueClosed,
+)
+
+
+class Response(NamedTuple):
+    status_code: int
+
+
+class TestDropOldestQueue:
+    def test_drops_oldest(self) -> None:
+        """Tests that putting in a full queue drops the oldest item"""
+
+        dropped: list[int] = []
+        queue = DropOldestQueue(2, dropped.append)
+
+        for item in range(5):
+            queue.put(item)
+
+        assert [queue.get(), queue.get()] == [3, 4]
+        assert dropped == [0, 1, 2]
+        assert queue.metrics() == (0, 2, 3, 2)
+
+    def test_get_timeout(self) -> None:
+        """Tests that getting from an empty queue times out"""
+
+        with pytest.raises(TimeoutError):
+            DropOldestQueue(1).get(timeout=0.01)
+
+    def test_close(self) -> None:
+        """Tests that a closed queue is drained, then raises"""
+
+        queue = DropOldestQueue(2)
+        queue.put("a")
+        queue.close()
+
+        assert queue.get() == "a"
+        with pytest.raises(QueueClosed):
+            queue.get()
+        with pytest.raises(QueueClosed):
+            queue.put("b")
+
+    def test_close_wakes_getters(self) -> None:
+        """Tests that closing wakes up threads waiting for an item"""
+
+        queue = DropOldestQueue(1)
+        errors: list[Exception] = []
+
+        def get() -> None:
+            try:
+                queue.get()
+            except QueueClosed as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=get)
+        thread.start()
+        queue.close()
+        thread.join(timeout=5)
+
+        assert len(errors) == 1
+
+
+class TestCapturePipeline:
+    def test_encodes_then_uploads(self) -> None:
+        """Tests that captures are encoded, in order, then uploaded"""
+
+        encoded: list[int] = []
+
+        def encode(capture: int) -> int:
+            encoded.append(capture)
+            return capture * 10
+
+        pipeline = CapturePipeline(
+            encode,
+            lambda item: item + 1,
+            encode_queue_size=3,
+            upload_queue_size=3,
+        )
+        futures = [pipeline.submit(capture) for capture in range(3)]
+        results = [future.result(timeout=5) for future in futures]
+        pipeline.close()
+
+        assert encoded == [0, 1, 2]
+        assert results == [1, 11, 21]
+        assert pipeline.metrics()["upload"].processed == 3
+
+    def test_slow_upload_drops_oldest(self) -> None:
+        """Tests that a slow upload never blocks submitting, drops the oldest
+        captures and always uploads the newest one"""
+
+        release = threading.Event()
+        uploaded: list[int] = []
+        dropped: list[int] = []
+
+        def upload(item: int) -> int:
+            release.wait(timeout=5)
+            uploaded.append(item)
+            return item
+
+        pipeline = CapturePipeline(
+            lambda capture: capture,
+            upload,
+            encode_queue_size=1,
+            upload_queue_size=1,
+            on_drop=dropped.append,
+        )
+        started = time.perf_counter()
+        futures = [pipeline.submit(capture) for capture in range(20)]
+        submit_seconds = time.perf_counter() - started
+        release.set()
+        pipeline.close()
+
+        assert submit_seconds < 0.5
+        assert uploaded[-1] == 19
+        assert len(uploaded) < 20
+        metrics = pipeline.metrics()
+        assert metrics["encode"].dropped + metrics["upload"].dropped == (
+            20 - len(uploaded)
+        )
+        assert metrics["encode"].max_depth == metrics["upload"].max_depth == 1
+        assert all(item not in uploaded for item in dropped)
+        cancelled = [future for future in futures if future.cancelled()]
+        assert len(cancelled) == 20 - len(uploaded)
+        assert futures[-1].result() == 19
+
+    def test_errors(self) -> None:
+        """Tests that encode and upload errors are set on the futures"""
+
+        def encode(capture: int) -> int:
+            if capture == 0:
+                raise ValueError("encode")
+            return capture
+
+        def upload(item: int) -> int:
+            raise OSError("upload")
+
+        pipeline = CapturePipeline(encode, upload, encode_queue_size=4)
+        futures = [pipeline.submit(capture) for capture in range(2)]
+        pipeline.close()
+
+        with pytest.raises(ValueError):
+            futures[0].result()
+        with pytest.raises(OSError):
+            futures[1].result()
+        assert pipeline.errors == 2
+
+    def test_upload_workers(self) -> None:
+        """Tests that several uploads run at the same time"""
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def upload(item: Any) -> int:
+            return barrier.wait()
+
+        pipeline = CapturePipeline(
+            lambda capture: capture,
+            upload,
+            upload_workers=3,
+            encode_queue_size=3,
+            upload_queue_size=3,
+        )
+        futures = [pipeline.submit(capture) for capture in range(3)]
+        pipeline.close()
+
+        assert sorted(future.result() for future in futures) == [0, 1, 2]
+
+
+class TestScreenshotterPipeline:
+    def test_slow_server_does_not_delay_capture(self) -> None:
+        """Tests that processing screenshots does not wait for the server"""
+
+        release = threading.Event()
+        screenshotter = Screenshotter(
+            "http://localhost", sct=SyntheticScreen(64, 32), queue_size=1
+        )
+        screenshotter.pipeline.upload = lambda upload: release.wait(5)
+
+        started = time.perf_counter()
+        futures = [screenshotter.process_screenshot() for _ in range(10)]
+        capture_seconds = time.perf_counter() - started
+        release.set()
+        screenshotter.__exit__(None, None, None)
+
+        assert capture_seconds < 1.0
+        assert futures[-1] is not None and futures[-1].result()
+        assert any(
+            future is not None and future.cancelled() for future in futures
+        )
+
+    def test_dropped_keyframe_requests_keyframe(self) -> None:
+        """Tests that dropping a keyframe makes the next frame a keyframe"""
+
+        screenshotter = Screenshotter(
+            "http://localhost", sct=SyntheticScreen(64, 32), tile_size=8
+        )
+        assert screenshotter.tile_trackers is not None
+        first = screenshotter.encode_upload(screenshotter.take_regions())
+
+        screenshotter._drop_upload(first)
+        second = screenshotter.encode_upload(screenshotter.take_regions())
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.tile_trackers[0].keyframes == 2
+        assert second.frame_id == 2
+
+    def test_failed_keyframe_requests_keyframe(self) -> None:
+        """Tests that a keyframe the server refuses, or that fails to post,
+        makes the next frame a keyframe, and that a refused delta does not"""
+
+        class FailingTransport(Transport):
+            # Refused keyframe, failed keyframe, keyframe, refused delta.
+            outcomes = [500, None, 200, 500]
+
+            def post(self, *args: Any) -> Any:
+                status_code = self.outcomes.pop(0)
+                if status_code is None:
+                    raise OSError("down")
+                return Response(status_code)
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(64, 32),
+            tile_size=8,
+            transport=FailingTransport(),
+        )
+        assert screenshotter.tile_trackers is not None
+        for _ in range(4):
+            upload = screenshotter.encode_upload(screenshotter.take_regions())
+            try:
+                screenshotter.post(upload)
+            except OSError:
+                pass
+        screenshotter.encode_upload(screenshotter.take_regions())
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.tile_trackers[0].keyframe_id == 3
+        assert screenshotter.tile_trackers[0].keyframes == 3
@@ -1,8 +1,17 @@
+import gc
+import threading
+import weakref
 from datetime import timedelta
 
 from freezegun import freeze_time
 
-from nerdtracker_client.player_list import EmptyListing, Listing, SnapshotList
+from nerdtracker_client.player_list import (
+    ConcurrentSnapshotList,
+    EmptyListing,
+    Listing,
+    ListSnapshot,
+    SnapshotList,
+)
 from nerdtracker_client.tests.constants import DATE_FLOAT, DATE_STRING
 
 
@@ -11,7 +20,7 @@ class TestSnapshotList:
     def test_init(self) -> None:
         """Tests the init method of the snapshot list class"""
 
-        snapshot_list = SnapshotList([], 10, 300.0)
+        snapshot_list: SnapshotList[Listing] = SnapshotList([], 10, 300.0)
 
         assert snapshot_list.list == []
         assert snapshot_list.last_update == DATE_FLOAT
@@ -22,7 +31,7 @@ class TestSnapshotList:
     def test_repr(self) -> None:
         """Tests the repr method of the snapshot list class"""
 
-        snapshot_list = SnapshotList([], 10, 300.0)
+        snapshot_list: SnapshotList[Listing] = SnapshotList([], 10, 300.0)
 
         expected = (
             "SnapshotList(\n"
@@ -148,7 +157,7 @@ class TestSnapshotList:
         initial_snapshot = [listing.copy() for listing in expected_order[:5]]
         new_snapshot = [listing.copy() for listing in expected_order[5:]]
 
-        snapshot_list = SnapshotList(initial_snapshot, 10, 300.0)
+        snapshot_list = SnapshotList(initial_snapshot, 12, 300.0)
         snapshot_list.new_snapshot(new_snapshot)
 
         assert snapshot_list.list == expected_order
@@ -163,7 +172,7 @@ class TestSnapshotList:
         initial_snapshot = [listing.copy() for listing in expected_order[:7]]
         new_snapshot = [listing.copy() for listing in expected_order[5:]]
 
-        snapshot_list = SnapshotList(initial_snapshot, 10, 300.0)
+        snapshot_list = SnapshotList(initial_snapshot, 12, 300.0)
         snapshot_list.new_snapshot(new_snapshot)
 
         assert snapshot_list.list == expected_order
@@ -213,3 +222,504 @@ class TestSnapshotList:
         snapshot_list.new_snapshot(snapshot_without_index_4)
 
         assert snapshot_list.list == expected_order
+
+    def test_max_list_length_evicts_from_start(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that appending beyond max_list_length evicts the oldest
+        listings from the start and reports them as dropped"""
+
+        initial_snapshot = [
+            listing.copy() for listing in ten_listings_no_empty[:4]
+        ]
+        new_snapshot = [listing.copy() for listing in ten_listings_no_empty[4:]]
+
+        snapshot_list = SnapshotList(initial_snapshot, 6, 300.0)
+        changes = snapshot_list.new_snapshot(new_snapshot)
+
+        assert snapshot_list.list == ten_listings_no_empty[4:]
+        assert [str(listing) for listing in changes.dropped] == [
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+        assert [addition.position for addition in changes.added] == list(
+            range(6)
+        )
+
+    def test_max_list_length_prepend_evicts_from_end(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that prepending beyond max_list_length evicts listings from
+        the end"""
+
+        snapshot_list = SnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty[4:]], 6, 300.0
+        )
+        snapshot_list.add_list(
+            [listing.copy() for listing in ten_listings_no_empty[2:4]],
+            append=False,
+        )
+
+        assert snapshot_list.list == ten_listings_no_empty[2:8]
+        assert all(
+            listing not in snapshot_list.list
+            for listing in ten_listings_no_empty[8:]
+        )
+
+    def test_drop_list(self, ten_listings_no_empty: list[Listing]) -> None:
+        """Tests the drop_list method of the snapshot list class"""
+
+        snapshot_list = SnapshotList(ten_listings_no_empty, 10, 300.0)
+        snapshot_list.drop_list([0, 9, 4])
+
+        expected_order = [
+            listing
+            for index, listing in enumerate(ten_listings_no_empty)
+            if index not in (0, 4, 9)
+        ]
+        assert snapshot_list.list == expected_order
+
+    def test_list_semantics(self, ten_listings_no_empty: list[Listing]) -> None:
+        """Tests that the listings can still be sliced, concatenated and
+        compared like the list they used to be kept in"""
+
+        snapshot_list = SnapshotList(ten_listings_no_empty, 10, 300.0)
+
+        assert snapshot_list.list[2:4] == ten_listings_no_empty[2:4]
+        assert snapshot_list.list[-1] == ten_listings_no_empty[-1]
+        assert snapshot_list.list + [] == ten_listings_no_empty
+        assert [] + snapshot_list.list == ten_listings_no_empty
+        assert snapshot_list.list != tuple(ten_listings_no_empty)
+
+    def test_unseen_listings_expire(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that only the listings not observed within max_list_age are
+        dropped, and that the observed ones are kept as they are"""
+
+        with freeze_time(DATE_STRING) as frozen_datetime:
+            snapshot_list = SnapshotList(
+                [listing.copy() for listing in ten_listings_no_empty[:6]],
+                10,
+                300.0,
+            )
+            kept_listing = snapshot_list.list[4]
+
+            frozen_datetime.tick(delta=timedelta(seconds=200))
+            snapshot_list.new_snapshot(
+                [listing.copy() for listing in ten_listings_no_empty[4:8]]
+            )
+            frozen_datetime.tick(delta=timedelta(seconds=200))
+            changes = snapshot_list.new_snapshot(
+                [listing.copy() for listing in ten_listings_no_empty[6:8]]
+            )
+
+        assert snapshot_list.list == ten_listings_no_empty[4:8]
+        assert snapshot_list.list[0] is kept_listing
+        assert [str(listing) for listing in changes.dropped] == [
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+
+    def test_expire_nothing_due(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that expire does nothing before any listing is due"""
+
+        with freeze_time(DATE_STRING):
+            snapshot_list = SnapshotList(ten_listings_no_empty, 10, 300.0)
+            assert snapshot_list.expire() == []
+
+        assert snapshot_list.list == ten_listings_no_empty
+
+    def test_dropped_listings_released(self) -> None:
+        """Tests that listings dropped before they expire are not kept alive
+        by the expiry heap, and that expire skips them"""
+
+        snapshot_list = SnapshotList([Listing("1"), Listing("2")], 10, 300.0)
+        dropped = weakref.ref(snapshot_list.list[0])
+
+        snapshot_list.drop_list([0])
+        gc.collect()
+
+        assert dropped() is None
+        assert snapshot_list.expire(snapshot_list.now() + 301.0) == [
+            Listing("2")
+        ]
+        assert snapshot_list.list == []
+
+    def test_snapshot_longer_than_list(self) -> None:
+        """Tests that the listings of a snapshot longer than the list that do
+        not fit are neither tracked for expiry nor reported"""
+
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [Listing("1")], 3, 300.0
+        )
+        snapshot = [Listing(str(index)) for index in range(10, 15)]
+        evicted = weakref.ref(snapshot[0])
+
+        changes = snapshot_list.new_snapshot(snapshot)
+        del snapshot
+        gc.collect()
+
+        assert evicted() is None
+        assert changes.dropped == [Listing("1")]
+        assert [addition.listing for addition in changes.added] == [
+            Listing("12"),
+            Listing("13"),
+            Listing("14"),
+        ]
+        assert snapshot_list.expire(snapshot_list.now() + 301.0) == [
+            Listing("12"),
+            Listing("13"),
+            Listing("14"),
+        ]
+
+    def test_empty_row_before_first_overlap(self) -> None:
+        """Tests a snapshot where an empty row comes before the first listing
+        that overlaps with the list"""
+
+        snapshot_list = SnapshotList.from_list_of_strings(
+            ["AAAAAAAA", "BBBBBBBB", "CCCCCCCC"]
+        )
+        snapshot_list.new_snapshot(
+            SnapshotList.listings_from_strings(
+                ["ZZZZZZZZ", "", "BBBBBBBB", "CCCCCCCC"]
+            )
+        )
+
+        assert [str(listing) for listing in snapshot_list.list] == [
+            "ZZZZZZZZ",
+            "",
+            "AAAAAAAA",
+            "BBBBBBBB",
+            "CCCCCCCC",
+        ]
+
+
+class TestSnapshotChanges:
+    def test_append_reports_additions(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that appended listings are reported with their positions"""
+
+        initial_snapshot = [
+            listing.copy() for listing in ten_listings_no_empty[:4]
+        ]
+        new_snapshot = [listing.copy() for listing in ten_listings_no_empty[2:]]
+
+        snapshot_list = SnapshotList(initial_snapshot, 10, 300.0)
+        changes = snapshot_list.new_snapshot(new_snapshot)
+
+        assert [addition.position for addition in changes.added] == list(
+            range(4, 10)
+        )
+        assert [str(addition.listing) for addition in changes.added] == [
+            "5",
+            "6",
+            "7",
+            "8",
+            "9",
+            "10",
+        ]
+        assert changes.updated == []
+        assert changes.dropped == []
+        assert snapshot_list.last_changes is changes
+
+    def test_drop_reported(
+        self,
+        ten_listings_no_empty: list[Listing],
+    ) -> None:
+        """Tests that dropped listings are reported"""
+
+        initial_snapshot = [
+            listing.copy() for listing in ten_listings_no_empty[:8]
+        ]
+        snapshot_list = SnapshotList(initial_snapshot, 10, 300.0)
+        new_snapshot = [
+            listing.copy()
+            for index, listing in enumerate(ten_listings_no_empty)
+            if index != 6 and index >= 4
+        ]
+        changes = snapshot_list.new_snapshot(new_snapshot)
+
+        assert [str(listing) for listing in changes.dropped] == ["7"]
+        assert [addition.position for addition in changes.added] == [7, 8]
+
+    def test_full_match_upgrade_reported(self) -> None:
+        """Tests that a full match upgrade is reported as an update"""
+
+        snapshot_list = SnapshotList(
+            [Listing("PlayerOne#123"), Listing("PlayerTwo#456")], 10, 300.0
+        )
+        changes = snapshot_list.new_snapshot(
+            [
+                Listing("PlayerOne#1234", full_match=True),
+                Listing("PlayerTwo#456"),
+            ]
+        )
+
+        assert len(changes.updated) == 1
+        update = changes.updated[0]
+        assert update.old_id == "PlayerOne#123"
+        assert update.new_id == "PlayerOne#1234"
+        assert update.full_match_upgrade is True
+        assert changes.added == []
+        assert changes.dropped == []
+
+    def test_no_changes(self, ten_listings_no_empty: list[Listing]) -> None:
+        """Tests that an identical snapshot produces an empty change-set"""
+
+        snapshot_list = SnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty], 10, 300.0
+        )
+        changes = snapshot_list.new_snapshot(
+            [listing.copy() for listing in ten_listings_no_empty]
+        )
+
+        assert not changes
+        assert len(changes) == 0
+
+
+class TestFeedStrings:
+    def test_identical_frames_skipped(self) -> None:
+        """Tests that identical frames are skipped without reconciling"""
+
+        snapshot_list: SnapshotList[Listing] = SnapshotList([], 12, 300.0)
+        rows = ["1", "2", "3", "", None]
+
+        first_changes = snapshot_list.feed_strings(rows)
+        second_changes = snapshot_list.feed_strings(list(rows))
+
+        assert first_changes is not None
+        assert len(first_changes.added) == 3
+        assert second_changes is None
+        assert snapshot_list.skipped_frames == 1
+        assert [str(listing) for listing in snapshot_list.list] == [
+            "1",
+            "2",
+            "3",
+            "",
+            "",
+        ]
+
+    def test_burst_coalesced(self) -> None:
+        """Tests that changed frames within the debounce window are coalesced
+        and only the latest is applied"""
+
+        with freeze_time(DATE_STRING) as frozen_datetime:
+            snapshot_list: SnapshotList[Listing] = SnapshotList(
+                [], 12, 300.0, debounce_window=1.0
+            )
+            assert snapshot_list.feed_strings(["1", "2", "3"]) is not None
+
+            frozen_datetime.tick(delta=timedelta(seconds=0.25))
+            assert snapshot_list.feed_strings(["2", "3", "4"]) is None
+            frozen_datetime.tick(delta=timedelta(seconds=0.25))
+            assert snapshot_list.feed_strings(["3", "4", "5"]) is None
+            frozen_datetime.tick(delta=timedelta(seconds=0.25))
+            assert snapshot_list.feed_strings(["3", "4", "5"]) is None
+
+            frozen_datetime.tick(delta=timedelta(seconds=0.5))
+            changes = snapshot_list.feed_strings(["3", "4", "5"])
+
+        assert changes is not None
+        assert [str(addition.listing) for addition in changes.added] == [
+            "4",
+            "5",
+        ]
+        assert snapshot_list.coalesced_frames == 1
+        assert snapshot_list.skipped_frames == 2
+        assert [str(listing) for listing in snapshot_list.list] == [
+            "1",
+            "2",
+            "3",
+            "4",
+            "5",
+        ]
+
+    def test_flush(self) -> None:
+        """Tests that flush applies the frame held back by the debounce"""
+
+        with freeze_time(DATE_STRING):
+            snapshot_list: SnapshotList[Listing] = SnapshotList(
+                [], 12, 300.0, debounce_window=1.0
+            )
+            snapshot_list.feed_strings(["1", "2"])
+            snapshot_list.feed_strings(["2", "3"])
+            changes = snapshot_list.flush()
+
+        assert changes is not None
+        assert snapshot_list.flush() is None
+        assert [str(listing) for listing in snapshot_list.list] == [
+            "1",
+            "2",
+            "3",
+        ]
+
+
+class TestConcurrentSnapshotList:
+    def test_publish_bumps_version(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that every published write bumps the version"""
+
+        snapshot_list = ConcurrentSnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty[:4]],
+            10,
+            300.0,
+        )
+        seen_version = snapshot_list.version
+
+        snapshot_list.new_snapshot(
+            [listing.copy() for listing in ten_listings_no_empty[2:6]]
+        )
+
+        assert snapshot_list.changed_since(seen_version)
+        assert snapshot_list.version == seen_version + 1
+        assert list(snapshot_list.snapshot().listings) == (
+            ten_listings_no_empty[:6]
+        )
+        assert len(snapshot_list.snapshot().changes.added) == 2
+
+    def test_unchanged_snapshot_not_published(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that a snapshot that changes nothing is not published"""
+
+        snapshot_list = ConcurrentSnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty[:4]],
+            10,
+            300.0,
+        )
+        seen_version = snapshot_list.version
+
+        snapshot_list.new_snapshot(
+            [listing.copy() for listing in ten_listings_no_empty[:4]]
+        )
+        snapshot_list.feed_strings(["1", "2", "3", "4"])
+        snapshot_list.feed_strings(["1", "2", "3", "4"])
+
+        assert not snapshot_list.changed_since(seen_version)
+
+    def test_published_listings_not_mutated(self) -> None:
+        """Tests that updates never mutate listings that readers hold"""
+
+        snapshot_list = ConcurrentSnapshotList(
+            [Listing("PlayerOne#123"), Listing("PlayerTwo#456")], 10, 300.0
+        )
+        held = snapshot_list.snapshot()
+
+        # The longer reading only wins once it is seen more than the first.
+        for _ in range(2):
+            snapshot_list.new_snapshot(
+                [Listing("PlayerOne#1234"), Listing("PlayerTwo#456")]
+            )
+
+        assert str(held.listings[0]) == "PlayerOne#123"
+        assert str(snapshot_list.snapshot().listings[0]) == "PlayerOne#1234"
+
+    def test_changes_refer_to_published_listings(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that the published change-set holds the published listings,
+        and that listings a write did not touch are published as they are"""
+
+        snapshot_list = ConcurrentSnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty[:4]],
+            10,
+            300.0,
+        )
+        held = snapshot_list.snapshot()
+
+        snapshot_list.new_snapshot(
+            [listing.copy() for listing in ten_listings_no_empty[3:6]]
+        )
+        published = snapshot_list.snapshot()
+
+        assert all(
+            mine is theirs
+            for mine, theirs in zip(held.listings[:3], published.listings)
+        )
+        assert held.listings[3] is not published.listings[3]
+        for addition in published.changes.added:
+            assert addition.listing is published.listings[addition.position]
+
+    def test_expire_published(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that expiring listings outside of a snapshot is published"""
+
+        now = [0.0]
+        snapshot_list = ConcurrentSnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty[:4]],
+            10,
+            300.0,
+            clock=lambda: now[0],
+        )
+        seen_version = snapshot_list.version
+
+        now[0] = 301.0
+        snapshot_list.expire()
+
+        assert snapshot_list.changed_since(seen_version)
+        assert snapshot_list.snapshot().listings == ()
+
+    def test_unchanged_writes_not_published(
+        self, ten_listings_no_empty: list[Listing]
+    ) -> None:
+        """Tests that expiring nothing, or setting the listings already
+        published, is not published"""
+
+        snapshot_list = ConcurrentSnapshotList(
+            [listing.copy() for listing in ten_listings_no_empty[:4]],
+            10,
+            300.0,
+            clock=lambda: 0.0,
+        )
+        seen_version = snapshot_list.version
+
+        snapshot_list.expire()
+        snapshot_list.list = snapshot_list.snapshot().listings
+
+        assert not snapshot_list.changed_since(seen_version)
+
+        snapshot_list.list = snapshot_list.snapshot().listings[1:]
+
+        assert snapshot_list.version == seen_version + 1
+        assert snapshot_list.snapshot().listings == tuple(
+            ten_listings_no_empty[1:4]
+        )
+
+    def test_concurrent_readers(self) -> None:
+        """Tests that readers always see a complete snapshot while a writer
+        keeps updating the list"""
+
+        snapshot_list = ConcurrentSnapshotList([], 12, 300.0)
+        frames = [
+            [str(index + offset) for offset in range(6)] for index in range(50)
+        ]
+        torn_reads: list[ListSnapshot] = []
+        done = threading.Event()
+
+        def read() -> None:
+            while not done.is_set():
+                held = snapshot_list.snapshot()
+                if held.version > 0 and len(held.listings) < 6:
+                    torn_reads.append(held)
+
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for reader in readers:
+            reader.start()
+        for frame in frames:
+            snapshot_list.feed_strings(frame)
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        assert torn_reads == []
+        assert snapshot_list.version > 0
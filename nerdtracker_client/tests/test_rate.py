@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, NamedTuple
+
+import numpy as np
+import pytest
+
+from nerdtracker_client.screenshots import (
+    AdaptiveRate,
+    AsyncScheduler,
+    ChangeDetector,
+    ScoreboardDetector,
+    Screenshotter,
+    SyntheticScreen,
+    Transport,
+)
+
+
+class Response(NamedTuple):
+    status_code: int
+
+
+class TestScoreboardDetector:
+    def test_detect(self) -> None:
+        """Tests that only light text over a dark frame is a scoreboard"""
+
+        detector = ScoreboardDetector()
+        scoreboard = SyntheticScreen(160, 90, pattern="scoreboard")
+        noise = SyntheticScreen(160, 90)
+        monitor = scoreboard.monitors[1]
+
+        assert detector.detect([scoreboard.grab(monitor)])
+        assert not detector.detect([noise.grab(monitor)])
+        assert not detector.detect([np.zeros((90, 160, 3), np.uint8)])
+        assert not detector.detect([np.full((90, 160, 3), 255, np.uint8)])
+
+    def test_any_frame(self) -> None:
+        """Tests that a scoreboard in any of the frames is detected"""
+
+        scoreboard = SyntheticScreen(160, 90, pattern="scoreboard")
+        frames = [
+            np.zeros((90, 160, 3), np.uint8),
+            scoreboard.grab(scoreboard.monitors[1]),
+        ]
+
+        assert ScoreboardDetector().detect(frames)
+        assert not ScoreboardDetector().detect([])
+
+
+class TestAdaptiveRate:
+    def test_static_backs_off(self) -> None:
+        """Tests that static frames back off exponentially up to the maximum,
+        and a changed frame goes straight back to the minimum"""
+
+        rate = AdaptiveRate(0.25, 4.0)
+        frame = np.zeros((16, 16, 3), np.uint8)
+        intervals = []
+
+        for _ in range(6):
+            rate.record_frames([frame])
+            intervals.append(rate.interval)
+        active = rate.record_frames([frame + 100])
+
+        assert intervals == [0.25, 0.5, 1.0, 2.0, 4.0, 4.0]
+        assert active
+        assert rate.interval == 0.25
+        assert (rate.active_frames, rate.static_frames) == (2, 5)
+
+    def test_scoreboard_is_active(self) -> None:
+        """Tests that an unchanged scoreboard keeps the minimum interval"""
+
+        rate = AdaptiveRate(0.25, 4.0)
+        screen = SyntheticScreen(160, 90, pattern="scoreboard")
+        frame = screen.grab(screen.monitors[1])
+
+        for _ in range(3):
+            assert rate.record_frames([frame], changed=False)
+
+        assert rate.interval == 0.25
+
+    def test_server_backs_off(self) -> None:
+        """Tests that slow and failed uploads back off, and fast ones recover
+        gradually"""
+
+        rate = AdaptiveRate(0.25, 4.0, slow_latency=1.0)
+        rate.record_frames([np.zeros((8, 8, 3), np.uint8)])
+
+        rate.record_upload(2.0)
+        rate.record_upload(0.1, succeeded=False)
+        backed_off = rate.interval
+        rate.record_upload(0.1)
+
+        assert backed_off == 1.0
+        assert rate.interval == 0.5
+        assert (rate.slow_uploads, rate.failed_uploads) == (1, 1)
+
+    def test_invalid(self) -> None:
+        """Tests that invalid bounds are rejected"""
+
+        with pytest.raises(ValueError):
+            AdaptiveRate(1.0, 0.5)
+        with pytest.raises(ValueError):
+            AdaptiveRate(backoff=1.0)
+
+
+class TestScreenshotterAdaptiveRate:
+    def test_adapts_interval(self) -> None:
+        """Tests that the screenshotter slows down on a static screen, without
+        uploading it"""
+
+        frame = np.zeros((32, 64, 3), np.uint8)
+        uploads: list[int] = []
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(64, 32),
+            change_detector=ChangeDetector(),
+            rate=AdaptiveRate(0.25, 4.0),
+        )
+        screenshotter.pipeline.upload = lambda upload: uploads.append(
+            upload.frame_id
+        )
+        screenshotter.take_regions = lambda: [frame]  # type: ignore
+
+        for _ in range(4):
+            screenshotter.process_screenshot()
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.time_interval == 2.0
+        assert screenshotter.scheduler.interval == 2.0
+        assert len(uploads) == 1
+
+    def test_failed_uploads(self) -> None:
+        """Tests that uploads the server refuses, or that raise, back off"""
+
+        class FailingTransport(Transport):
+            posts = 0
+
+            def post(self, *args: Any) -> Any:
+                if self.posts:
+                    raise OSError("down")
+                self.posts += 1
+                return Response(500)
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(64, 32),
+            transport=FailingTransport(),
+            rate=AdaptiveRate(0.25, 4.0),
+        )
+        upload = screenshotter.encode_upload(screenshotter.take_regions())
+
+        screenshotter.post(upload)
+        with pytest.raises(OSError):
+            screenshotter.post(upload)
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.rate is not None
+        assert screenshotter.rate.failed_uploads == 2
+        assert screenshotter.time_interval == 1.0
+
+    def test_scheduler_follows_interval(self) -> None:
+        """Tests that the scheduler waits for the adapted interval"""
+
+        now = [0.0]
+        starts: list[float] = []
+
+        async def sleep(seconds: float) -> None:
+            now[0] += seconds
+
+        scheduler = AsyncScheduler(1.0, lambda: now[0], sleep)
+
+        async def callback() -> None:
+            starts.append(now[0])
+            scheduler.interval *= 2
+
+        asyncio.run(scheduler.run(callback, ticks=4))
+
+        assert starts == [0.0, 2.0, 6.0, 14.0]
+        assert scheduler.missed_ticks == 0
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+from nerdtracker_client.player_list import (
+    Listing,
+    SnapshotList,
+    SnapshotRecorder,
+    VirtualClock,
+    read_recording,
+    replay,
+)
+from nerdtracker_client.tests.constants import DATE_FLOAT
+
+
+class TestRecording:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Tests that recorded frames are read back as they were written"""
+
+        path = tmp_path / "session.ntsr"
+        with SnapshotRecorder(path) as recorder:
+            recorder.record(["Joy#1648235", None, ""], DATE_FLOAT)
+            recorder.record(["Ünïcödé", "CycoChris"], DATE_FLOAT + 0.5)
+
+        frames = list(read_recording(path))
+
+        assert [frame.timestamp for frame in frames] == [
+            DATE_FLOAT,
+            DATE_FLOAT + 0.5,
+        ]
+        assert frames[0].rows == ("Joy#1648235", None, "")
+        assert frames[1].rows == ("Ünïcödé", "CycoChris")
+
+    def test_append_to_existing(self, tmp_path: Path) -> None:
+        """Tests that a second recorder appends to an existing recording"""
+
+        path = tmp_path / "session.ntsr"
+        with SnapshotRecorder(path) as recorder:
+            recorder.record(["1"], DATE_FLOAT)
+        with SnapshotRecorder(path) as recorder:
+            recorder.record(["2"], DATE_FLOAT + 1)
+
+        assert [frame.rows for frame in read_recording(path)] == [
+            ("1",),
+            ("2",),
+        ]
+
+    def test_truncated_frame_ignored(self, tmp_path: Path) -> None:
+        """Tests that a frame cut short by a crash is ignored"""
+
+        path = tmp_path / "session.ntsr"
+        with SnapshotRecorder(path) as recorder:
+            recorder.record(["1", "2"], DATE_FLOAT)
+            recorder.record(["3", "4"], DATE_FLOAT + 1)
+        path.write_bytes(path.read_bytes()[:-2])
+
+        assert [frame.rows for frame in read_recording(path)] == [("1", "2")]
+
+    def test_not_a_recording(self, tmp_path: Path) -> None:
+        """Tests that reading another kind of file raises a ValueError"""
+
+        path = tmp_path / "not_a_recording.txt"
+        path.write_bytes(b"hello")
+
+        with pytest.raises(ValueError):
+            list(read_recording(path))
+
+
+class TestReplay:
+    def test_virtual_clock(self) -> None:
+        """Tests that a SnapshotList follows an injected clock"""
+
+        clock = VirtualClock(100.0)
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [], 12, 300.0, clock=clock
+        )
+        snapshot_list.feed_strings(["1", "2"])
+        clock.advance(301.0)
+        snapshot_list.feed_strings(["3", "4"])
+
+        assert snapshot_list.last_update == 401.0
+        assert [str(listing) for listing in snapshot_list.list] == ["3", "4"]
+
+    def test_replay(self, tmp_path: Path) -> None:
+        """Tests that a replay reproduces the recorded session"""
+
+        path = tmp_path / "session.ntsr"
+        with SnapshotRecorder(path) as recorder:
+            for index in range(20):
+                rows = [str(row) for row in range(index // 2, index // 2 + 4)]
+                recorder.record(rows, DATE_FLOAT + index * 0.5)
+
+        result = replay(path, max_list_length=20)
+
+        assert result.frames == 20
+        assert result.skipped_frames == 10
+        assert result.applied_frames == 10
+        assert result.recorded_duration == 9.5
+        assert result.frames_per_second > 0
+        assert [str(listing) for listing in result.snapshot_list.list] == [
+            str(row) for row in range(13)
+        ]
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from nerdtracker_client.screenshots import (
+    PRESETS,
+    Region,
+    Screenshotter,
+    SyntheticScreen,
+    decode_frames,
+    frame_to_array,
+    parse_regions,
+)
+from nerdtracker_client.screenshots.regions import (
+    format_regions,
+    resolve_regions,
+)
+
+MONITOR = {"left": 1920, "top": 0, "width": 2560, "height": 1440}
+
+
+class TestRegion:
+    def test_to_monitor(self) -> None:
+        """Tests that regions scale with the resolution of the monitor"""
+
+        region = Region("names", 0.25, 0.5, 0.5, 0.25)
+
+        assert region.to_monitor(MONITOR) == {
+            "left": 1920 + 640,
+            "top": 720,
+            "width": 1280,
+            "height": 360,
+        }
+        assert region.to_monitor(
+            {"left": 0, "top": 0, "width": 1920, "height": 1080}
+        ) == {"left": 480, "top": 540, "width": 960, "height": 270}
+
+    def test_resolve_presets(self) -> None:
+        """Tests that presets are resolved by name and all lie within the
+        monitor"""
+
+        for name, regions in PRESETS.items():
+            assert resolve_regions(name) == regions
+
+    @pytest.mark.parametrize(
+        "regions",
+        [
+            "unknown",
+            [],
+            [Region("outside", 0.5, 0.0, 0.6, 1.0)],
+            [Region("empty", 0.0, 0.0, 0.0, 1.0)],
+        ],
+    )
+    def test_resolve_invalid(self, regions: str | list[Region]) -> None:
+        """Tests that unknown presets and regions outside the monitor are
+        rejected"""
+
+        with pytest.raises(ValueError):
+            resolve_regions(regions)
+
+    def test_format_and_parse(self) -> None:
+        """Tests that region descriptions round trip, relative to the
+        monitor"""
+
+        description = format_regions(PRESETS["player_names"], MONITOR)
+
+        assert parse_regions(description) == {
+            "friendly_names": (307, 317, 512, 432),
+            "enemy_names": (307, 792, 512, 432),
+        }
+
+
+class TestRegionCapture:
+    def test_take_regions(self) -> None:
+        """Tests that only the regions are captured, from the right place"""
+
+        screen = SyntheticScreen(200, 100)
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=screen,
+            regions=[
+                Region("top_left", 0.0, 0.0, 0.5, 0.5),
+                Region("bottom_right", 0.5, 0.5, 0.5, 0.5),
+            ],
+        )
+        reference = SyntheticScreen(200, 100)
+
+        top_left, bottom_right = screenshotter.take_regions()
+
+        assert top_left.shape == bottom_right.shape == (50, 100, 3)
+        np.testing.assert_array_equal(
+            top_left,
+            reference.grab({"left": 0, "top": 0, "width": 100, "height": 50})[
+                :, :, :-1
+            ],
+        )
+        np.testing.assert_array_equal(
+            bottom_right,
+            reference.grab(
+                {"left": 100, "top": 50, "width": 100, "height": 50}
+            )[:, :, :-1],
+        )
+
+    def test_take_regions_without_regions(self) -> None:
+        """Tests that the whole monitor is captured without regions"""
+
+        screenshotter = Screenshotter(
+            "http://localhost", sct=SyntheticScreen(64, 32)
+        )
+
+        (screenshot,) = screenshotter.take_regions()
+
+        assert screenshot.shape == (32, 64, 3)
+
+    def test_encode_regions(self) -> None:
+        """Tests that regions are packed into one body, one frame each with
+        the same frame id"""
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(200, 100),
+            regions="player_names",
+        )
+        screenshots = screenshotter.take_regions()
+
+        bundle = screenshotter.encode_regions(screenshots)
+        frames = decode_frames(bundle.tobytes())
+
+        assert len(bundle) == len(bundle.tobytes())
+        assert [frame.header.frame_id for frame in frames] == [1, 1]
+        for frame, screenshot in zip(frames, screenshots):
+            np.testing.assert_array_equal(frame_to_array(frame), screenshot)
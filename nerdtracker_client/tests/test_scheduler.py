@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from nerdtracker_client.screenshots import (
+    AsyncScheduler,
+    Screenshotter,
+    SyntheticScreen,
+)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when slept on, or advanced"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class TestAsyncScheduler:
+    def test_ticks_stay_on_grid(self) -> None:
+        """Tests that the time taken by each tick does not delay the next"""
+
+        clock = FakeClock()
+        scheduler = AsyncScheduler(1.0, clock, clock.sleep)
+        starts: list[float] = []
+
+        async def callback() -> None:
+            starts.append(clock())
+            clock.now += 0.3
+
+        asyncio.run(scheduler.run(callback, ticks=5))
+
+        assert starts == pytest.approx([0.0, 1.0, 2.0, 3.0, 4.0])
+        assert scheduler.ticks == 5
+        assert scheduler.missed_ticks == 0
+        assert scheduler.max_lateness == 0.0
+        assert not scheduler.running
+
+    def test_slow_tick_skips_missed(self) -> None:
+        """Tests that ticks whose deadline passed a whole interval ago are
+        skipped and counted, instead of run in a burst, and that the current
+        one runs straight away"""
+
+        clock = FakeClock()
+        scheduler = AsyncScheduler(1.0, clock, clock.sleep)
+        starts: list[float] = []
+
+        async def callback() -> None:
+            starts.append(clock())
+            if len(starts) == 2:
+                clock.now += 2.5
+
+        asyncio.run(scheduler.run(callback, ticks=4))
+
+        assert starts == pytest.approx([0.0, 1.0, 3.5, 4.0])
+        assert scheduler.missed_ticks == 1
+
+    def test_slight_overrun_not_missed(self) -> None:
+        """Tests that ticks that overrun by less than an interval do not make
+        the next ones count as missed"""
+
+        clock = FakeClock()
+        scheduler = AsyncScheduler(1.0, clock, clock.sleep)
+        starts: list[float] = []
+
+        async def callback() -> None:
+            starts.append(clock())
+            clock.now += 1.1
+
+        asyncio.run(scheduler.run(callback, ticks=5))
+
+        assert starts == pytest.approx([0.0, 1.1, 2.2, 3.3, 4.4])
+        assert scheduler.missed_ticks == 0
+
+    def test_invalid_interval(self) -> None:
+        """Tests that intervals that are not positive are rejected"""
+
+        with pytest.raises(ValueError):
+            AsyncScheduler(0.0)
+        scheduler = AsyncScheduler(1.0)
+        with pytest.raises(ValueError):
+            scheduler.interval = -1.0
+        assert scheduler.interval == 1.0
+
+    def test_stop(self) -> None:
+        """Tests that stopping ends the run after the current tick"""
+
+        clock = FakeClock()
+        scheduler = AsyncScheduler(1.0, clock, clock.sleep)
+
+        async def callback() -> None:
+            if scheduler.ticks == 2:
+                scheduler.stop()
+
+        asyncio.run(scheduler.run(callback))
+
+        assert scheduler.ticks == 3
+        assert not scheduler.running
+
+    def test_cancel(self) -> None:
+        """Tests that cancelling the task stops the scheduler while it
+        sleeps"""
+
+        scheduler = AsyncScheduler(60.0)
+
+        async def callback() -> None:
+            pass
+
+        async def main() -> None:
+            task = asyncio.create_task(scheduler.run(callback))
+            await asyncio.sleep(0.05)
+            assert scheduler.running
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+
+        assert scheduler.ticks == 1
+        assert not scheduler.running
+
+
+class TestScreenshotterRunAsync:
+    def test_run_async(self) -> None:
+        """Tests that the screenshotter uploads one screenshot per tick from
+        the event loop"""
+
+        uploads: list[int] = []
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            time_interval=0.01,
+            sct=SyntheticScreen(64, 32),
+            queue_size=8,
+        )
+        screenshotter.pipeline.upload = lambda upload: uploads.append(
+            upload.frame_id
+        )
+        asyncio.run(screenshotter.run_async(ticks=3))
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.scheduler.ticks == 3
+        assert len(uploads) == 3
@@ -0,0 +1,79 @@
+import time
+
+import numpy as np
+
+from nerdtracker_client.screenshots import Screenshotter
+from nerdtracker_client.screenshots.synthetic import SyntheticScreen
+
+
+class TestScreenshotter:
+    def test_take_screenshot(self) -> None:
+        """Tests that screenshots are taken from the injected screen, without
+        the alpha channel"""
+
+        screen = SyntheticScreen(64, 32, monitor_count=2)
+        screenshotter = Screenshotter("http://localhost", 2, sct=screen)
+
+        screenshot = screenshotter.take_screenshot()
+
+        assert screenshotter.size == (64, 32)
+        assert screenshot.shape == screenshotter.shape == (32, 64, 3)
+        assert screen.frames == 1
+
+    def test_exit_closes_screen(self) -> None:
+        """Tests that exiting the screenshotter closes the screen"""
+
+        screen = SyntheticScreen(64, 32)
+        screenshotter = Screenshotter("http://localhost", sct=screen)
+
+        screenshotter.__exit__(None, None, None)
+
+        assert screen.closed
+
+    def test_timer_stop(self) -> None:
+        """Tests that the timer keeps taking screenshots, even when behind,
+        until it is stopped"""
+
+        screen = SyntheticScreen(64, 32)
+        screenshotter = Screenshotter(
+            "http://localhost", time_interval=0.001, sct=screen
+        )
+        screenshotter.pipeline.upload = lambda upload: None
+        screenshotter.next_call -= 1.0
+
+        screenshotter.timer_start()
+        deadline = time.monotonic() + 5
+        while screen.frames < 5 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        screenshotter.__exit__(None, None, None)
+        frames = screen.frames
+        time.sleep(0.05)
+
+        assert frames >= 5
+        assert screen.frames == frames
+
+
+class TestSyntheticScreen:
+    def test_frames_differ(self) -> None:
+        """Tests that consecutive frames differ in a band of rows only"""
+
+        screen = SyntheticScreen(64, 32)
+
+        first = screen.grab(screen.monitors[1])
+        second = screen.grab(screen.monitors[1])
+
+        changed_rows = (first != second).any(axis=(1, 2)).nonzero()[0]
+        assert first.shape == (32, 64, 4)
+        assert changed_rows.tolist() == [0, 8]
+
+    def test_scoreboard_pattern(self) -> None:
+        """Tests that the scoreboard pattern only has dark and light pixels,
+        with light ones in every other band of 16 rows"""
+
+        screen = SyntheticScreen(64, 64, pattern="scoreboard", seed=1)
+        frame = screen.grab(screen.monitors[1])
+        screen.grab(screen.monitors[1])
+
+        lit_rows = (frame[:, :, 0] == 220).any(axis=1).nonzero()[0]
+        assert set(np.unique(frame[:, :, :3]).tolist()) <= {24, 220, 231, 35}
+        assert {row // 16 % 2 for row in lit_rows if row >= 8} == {1}
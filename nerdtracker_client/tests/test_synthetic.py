@@ -0,0 +1,77 @@
+import random
+
+from nerdtracker_client.player_list import (
+    Listing,
+    LobbySimulator,
+    OCRNoise,
+    SnapshotList,
+    reconciliation_accuracy,
+)
+
+
+class TestOCRNoise:
+    def test_no_noise(self) -> None:
+        """Tests that a noise-free model reads names perfectly"""
+
+        rng = random.Random(0)
+        noise = OCRNoise()
+
+        assert noise.apply("Joy#1648235", rng) == "Joy#1648235"
+
+    def test_empty_rows(self) -> None:
+        """Tests that an empty rate of 1 never reads a row"""
+
+        rng = random.Random(0)
+        noise = OCRNoise(empty_rate=1.0)
+
+        assert all(
+            noise.apply("Joy#1648235", rng) in (None, "") for _ in range(20)
+        )
+
+    def test_substitution(self) -> None:
+        """Tests that a substitution rate of 1 swaps every confusable
+        character for its look-alike"""
+
+        rng = random.Random(0)
+        noise = OCRNoise(substitution_rate=1.0)
+
+        assert noise.apply("0158", rng) == "OlSB"
+
+
+class TestLobbySimulator:
+    def test_seed_determinism(self) -> None:
+        """Tests that two simulations with the same seed are identical"""
+
+        noise = OCRNoise.uniform(0.1)
+        first = LobbySimulator(50, join_rate=0.1, noise=noise, seed=42)
+        second = LobbySimulator(50, join_rate=0.1, noise=noise, seed=42)
+
+        assert list(first.frames(50)) == list(second.frames(50))
+
+    def test_noise_free_rows_match_truth(self) -> None:
+        """Tests that without noise, the rows read are the rows on screen"""
+
+        simulator = LobbySimulator(20, visible_rows=6, seed=1)
+
+        for frame in simulator.frames(50):
+            assert len(frame.rows) == 6
+            assert frame.rows == frame.truth
+
+    def test_noise_free_reconciliation(self) -> None:
+        """Tests that a SnapshotList fed noise-free frames reconstructs every
+        player that was on screen, in order"""
+
+        simulator = LobbySimulator(30, visible_rows=6, seed=2)
+        snapshot_list: SnapshotList[Listing] = SnapshotList(
+            [], max_list_length=30
+        )
+        for frame in simulator.frames(300):
+            snapshot_list.feed_strings(frame.rows)
+
+        assert (
+            reconciliation_accuracy(snapshot_list, simulator.visible_lobby)
+            == 1.0
+        )
+        assert [
+            str(listing.listing_id) for listing in snapshot_list.list
+        ] == simulator.visible_lobby
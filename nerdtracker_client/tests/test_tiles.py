@@ -0,0 +1,209 @@
+import numpy as np
+import pytest
+
+from nerdtracker_client.screenshots import (
+    PngEncoder,
+    Screenshotter,
+    SyntheticScreen,
+    TileReassembler,
+    TileTracker,
+    decode_frames,
+)
+from nerdtracker_client.screenshots.tiles import (
+    encode_tile_update,
+    pad_to_tiles,
+    tile_hashes,
+)
+from nerdtracker_client.screenshots.wire import TILE_MAP, FrameBundle
+
+
+def scoreboard(frames: int, width: int = 100, height: int = 70) -> list:
+    """Grabs consecutive BGR frames of a synthetic scoreboard
+
+    Args:
+        frames (int): Number of frames
+        width (int): Width of the frames. Defaults to 100.
+        height (int): Height of the frames. Defaults to 70.
+
+    Returns:
+        list: The frames
+    """
+    screen = SyntheticScreen(width, height, pattern="scoreboard")
+    return [screen.grab(screen.monitors[1])[:, :, :-1] for _ in range(frames)]
+
+
+def send(update_frames: list, reassembler: TileReassembler) -> list:
+    """Sends frames through the wire format and reassembles them
+
+    Args:
+        update_frames (list): The FramePayloads of a body
+        reassembler (TileReassembler): The server side reassembler
+
+    Returns:
+        list: The reassembled frame of each region
+    """
+    body = FrameBundle(update_frames).tobytes()
+    return reassembler.apply(decode_frames(body))
+
+
+class TestTileHashes:
+    def test_pad_to_tiles(self) -> None:
+        """Tests that frames are padded with zeros to whole tiles"""
+
+        padded = pad_to_tiles(np.ones((10, 20, 3), dtype=np.uint8), 8)
+
+        assert padded.shape == (16, 24, 3)
+        assert padded[:10, :20].all()
+        assert not padded[10:].any() and not padded[:, 20:].any()
+
+    def test_only_changed_tiles_change_hash(self) -> None:
+        """Tests that changing a single byte only changes its tile's hash"""
+
+        frame = scoreboard(1)[0]
+        changed = frame.copy()
+        changed[40, 70, 2] ^= 1
+
+        difference = tile_hashes(frame, 16) != tile_hashes(changed, 16)
+
+        assert difference.shape == (5, 7)
+        assert difference.nonzero() == ([2], [4])
+
+    def test_tile_size_multiple_of_8(self) -> None:
+        """Tests that tile sizes must be a multiple of 8"""
+
+        with pytest.raises(ValueError):
+            tile_hashes(np.zeros((16, 16), dtype=np.uint8), 12)
+        with pytest.raises(ValueError):
+            TileTracker(12)
+
+
+class TestTileTracker:
+    def test_keyframe_then_deltas(self) -> None:
+        """Tests that the first frame is a keyframe, then only the changed
+        tiles are sent until the next keyframe"""
+
+        tracker = TileTracker(16, keyframe_interval=3)
+
+        updates = [
+            tracker.update(frame, frame_id)
+            for frame_id, frame in enumerate(scoreboard(6), start=1)
+        ]
+
+        assert [update.keyframe for update in updates] == [
+            True, False, False, False, True, False,
+        ]  # fmt: skip
+        assert [update.keyframe_id for update in updates] == [1, 1, 1, 1, 5, 5]
+        assert 0 < updates[1].changed.sum() < updates[1].changed.size
+        assert updates[1].pixels.shape == (updates[1].changed.sum() * 16, 16, 3)
+        assert tracker.keyframes == 2
+        assert tracker.deltas == 4
+        assert tracker.bytes_saved > 0
+
+    def test_large_change_is_keyframe(self) -> None:
+        """Tests that a keyframe is sent when most tiles changed"""
+
+        tracker = TileTracker(16, max_changed_fraction=0.5)
+        first, *_ = scoreboard(1)
+        tracker.update(first, 1)
+
+        assert tracker.update(255 - first, 2).keyframe
+
+    def test_request_keyframe(self) -> None:
+        """Tests that a keyframe can be requested"""
+
+        tracker = TileTracker(16)
+        first, second = scoreboard(2)
+        tracker.update(first, 1)
+        tracker.request_keyframe()
+
+        assert tracker.update(second, 2).keyframe
+
+
+class TestTileReassembler:
+    @pytest.mark.parametrize("encoder", [None, PngEncoder()], ids=repr)
+    def test_round_trip(self, encoder: PngEncoder | None) -> None:
+        """Tests that keyframes and deltas are reassembled into the exact
+        frames, including partial edge tiles"""
+
+        tracker = TileTracker(16, keyframe_interval=3)
+        reassembler = TileReassembler()
+
+        for frame_id, frame in enumerate(scoreboard(7), start=1):
+            update = tracker.update(frame, frame_id)
+            (rebuilt,) = send(
+                encode_tile_update(update, encoder, frame_id), reassembler
+            )
+            np.testing.assert_array_equal(rebuilt, frame)
+
+    def test_delta_format(self) -> None:
+        """Tests that a delta is a tile map referencing the keyframe, then
+        the tiles"""
+
+        tracker = TileTracker(16)
+        first, second = scoreboard(2)
+        tracker.update(first, 1)
+
+        tile_map, tiles = encode_tile_update(tracker.update(second, 2), None, 2)
+
+        assert tile_map.header.layout == TILE_MAP
+        assert tile_map.header.frame_id == 1
+        assert tile_map.header.shape == (5, 7)
+        assert tiles.header.frame_id == 2
+
+    def test_unchanged_delta(self) -> None:
+        """Tests that a delta without changed tiles rebuilds the keyframe"""
+
+        tracker = TileTracker(16)
+        reassembler = TileReassembler()
+        (frame,) = scoreboard(1)
+        send(
+            encode_tile_update(tracker.update(frame, 1), PngEncoder(), 1),
+            reassembler,
+        )
+
+        update = tracker.update(frame, 2)
+        (rebuilt,) = send(
+            encode_tile_update(update, PngEncoder(), 2), reassembler
+        )
+
+        assert not update.changed.any()
+        np.testing.assert_array_equal(rebuilt, frame)
+
+    def test_unknown_keyframe(self) -> None:
+        """Tests that a delta referencing a keyframe the server does not
+        have is rejected"""
+
+        tracker = TileTracker(16)
+        first, second = scoreboard(2)
+        tracker.update(first, 1)
+        delta = encode_tile_update(tracker.update(second, 2))
+
+        with pytest.raises(ValueError):
+            send(delta, TileReassembler())
+
+    def test_screenshotter_regions(self) -> None:
+        """Tests that the screenshotter sends every region as a keyframe or
+        a delta, which the reassembler rebuilds"""
+
+        screenshotter = Screenshotter(
+            "http://localhost",
+            sct=SyntheticScreen(200, 100, pattern="scoreboard"),
+            regions="player_names",
+            tile_size=8,
+        )
+        reassembler = TileReassembler()
+
+        for _ in range(3):
+            screenshots = screenshotter.take_regions()
+            body = screenshotter.encode_regions(screenshots).tobytes()
+            rebuilt = reassembler.apply(decode_frames(body))
+            assert len(rebuilt) == 2
+            for region, screenshot in zip(rebuilt, screenshots):
+                np.testing.assert_array_equal(region, screenshot)
+        screenshotter.__exit__(None, None, None)
+
+        assert screenshotter.tile_trackers is not None
+        assert [tracker.deltas for tracker in screenshotter.tile_trackers] == [
+            2,
+            2,
+        ]
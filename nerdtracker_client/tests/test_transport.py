@@ -0,0 +1,133 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from nerdtracker_client.screenshots import (
+    RequestsTransport,
+    Screenshotter,
+    SyntheticScreen,
+    create_transport,
+    encode_frame,
+    frame_to_array,
+)
+from nerdtracker_client.screenshots.wire import CONTENT_TYPE, FramePayload
+from nerdtracker_client.tests.fixtures.server import StandInServer
+
+
+class TestTransport:
+    def test_connection_reused(self, stand_in_server: StandInServer) -> None:
+        """Tests that consecutive uploads share a single connection"""
+
+        server = stand_in_server
+        screenshotter = Screenshotter(
+            server.address, sct=SyntheticScreen(64, 32)
+        )
+        for _ in range(5):
+            response = screenshotter.send_screenshot(
+                screenshotter.take_screenshot()
+            )
+            assert response.status_code == 200
+        screenshotter.__exit__(None, None, None)
+
+        assert len(server.bodies) == 5
+        assert server.connections == 1
+        assert server.bodies[-1].frames[0].header.frame_id == 5
+
+    def test_warm_up(self, stand_in_server: StandInServer) -> None:
+        """Tests that warming up opens the pool's connections, which the
+        uploads then use"""
+
+        server = stand_in_server
+        transport = RequestsTransport(pool_size=2)
+
+        opened = transport.warm_up(server.address)
+        for _ in range(4):
+            transport.post(
+                server.address,
+                encode_frame(np.zeros((4, 4), dtype=np.uint8)),
+                {"Content-Type": CONTENT_TYPE},
+                5.0,
+            )
+        transport.close()
+
+        assert opened == 2
+        assert server.connections == 2
+
+    def test_warm_up_unreachable(self) -> None:
+        """Tests that warming up an unreachable server does not raise"""
+
+        server = StandInServer()
+        address = server.address
+        server.close()
+        transport = RequestsTransport()
+
+        assert transport.warm_up(address, timeout=1.0) == 0
+
+    def test_stand_in_server_rejects_invalid_bodies(
+        self, stand_in_server: StandInServer
+    ) -> None:
+        """Tests that the stand-in server answers 400 to frames cut short,
+        and 411 to bodies without a length"""
+
+        server = stand_in_server
+        frame = encode_frame(np.zeros((4, 4), dtype=np.uint8))
+        transport = RequestsTransport()
+        response = transport.post(
+            server.address,
+            FramePayload(frame.header, frame.payload[:-1]),
+            {},
+            5.0,
+        )
+        # A generator has no length, so requests sends it chunked.
+        chunked = transport.post(
+            server.address, (chunk for chunk in [b"nope"]), {}, 5.0
+        )
+        transport.close()
+
+        assert response.status_code == 400
+        assert chunked.status_code == 411
+        assert not server.bodies
+
+    def test_create_transport(self) -> None:
+        """Tests that transports are created by name"""
+
+        transport = create_transport("requests", pool_size=3)
+
+        assert isinstance(transport, RequestsTransport)
+        assert transport.pool_size == 3
+        with pytest.raises(ValueError):
+            create_transport("carrier-pigeon")
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("httpx") is not None,
+        reason="httpx is installed",
+    )
+    def test_httpx_missing(self) -> None:
+        """Tests that the httpx transport explains that httpx is missing"""
+
+        with pytest.raises(ImportError, match="httpx"):
+            create_transport("httpx")
+
+    def test_httpx(self, stand_in_server: StandInServer) -> None:
+        """Tests uploads through httpx, when it is installed"""
+
+        pytest.importorskip("httpx")
+        server = stand_in_server
+        frame = np.arange(12, dtype=np.uint8).reshape(3, 4)
+
+        transport = create_transport("httpx", http2=False)
+        for _ in range(2):
+            response = transport.post(
+                server.address,
+                encode_frame(frame),
+                {"Content-Type": CONTENT_TYPE},
+                5.0,
+            )
+        transport.close()
+
+        assert response.status_code == 200
+        assert server.connections == 1
+        np.testing.assert_array_equal(
+            frame_to_array(server.bodies[0].frames[0]), frame
+        )
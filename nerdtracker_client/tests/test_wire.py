@@ -0,0 +1,174 @@
+import http.server
+import threading
+from typing import Iterable, Iterator, cast
+
+import numpy as np
+import pytest
+import requests
+
+from nerdtracker_client.screenshots import (
+    Screenshotter,
+    SyntheticScreen,
+    ZlibEncoder,
+    decode_frame,
+    decode_frames,
+    encode_frame,
+    frame_to_array,
+)
+from nerdtracker_client.screenshots.encoders import decode
+from nerdtracker_client.screenshots.wire import CONTENT_TYPE, FRAME_HEADER
+from nerdtracker_client.tests.constants import DATE_FLOAT
+
+
+@pytest.fixture
+def frame_server() -> Iterator[tuple[str, list[bytes]]]:
+    """Runs a local HTTP server that keeps the bodies posted to it
+
+    Yields:
+        tuple[str, list[bytes]]: The address of the server and the bodies
+    """
+    bodies: list[bytes] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            length = int(self.headers["Content-Length"])
+            bodies.append(self.rfile.read(length))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", bodies
+    server.shutdown()
+    server.server_close()
+
+
+class TestWire:
+    def test_round_trip(self) -> None:
+        """Tests that a frame is decoded back with its metadata and pixels"""
+
+        frame = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+
+        payload = encode_frame(frame, frame_id=7, timestamp=DATE_FLOAT)
+        decoded = decode_frame(payload.tobytes())
+
+        assert decoded.header.shape == (2, 3, 4)
+        assert decoded.header.dtype == "|u1"
+        assert decoded.header.layout == "BGRA"
+        assert decoded.header.frame_id == 7
+        assert decoded.header.timestamp == DATE_FLOAT
+        assert len(payload) == FRAME_HEADER.size + frame.nbytes
+        np.testing.assert_array_equal(frame_to_array(decoded), frame)
+
+    def test_contiguous_frame_not_copied(self) -> None:
+        """Tests that the payload of a contiguous frame is a view of it"""
+
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+
+        payload = encode_frame(frame)
+        frame[0, 0, 0] = 9
+
+        assert payload.payload[0] == 9
+
+    def test_sliced_frame(self) -> None:
+        """Tests that a BGRA frame with the alpha channel sliced off is sent
+        as BGR"""
+
+        frame = np.arange(2 * 2 * 4, dtype=np.uint8).reshape(2, 2, 4)
+
+        decoded = decode_frame(encode_frame(frame[:, :, :-1]).tobytes())
+
+        assert decoded.header.layout == "BGR"
+        np.testing.assert_array_equal(frame_to_array(decoded), frame[:, :, :-1])
+
+    def test_not_a_frame(self) -> None:
+        """Tests that decoding another kind of buffer raises a ValueError"""
+
+        with pytest.raises(ValueError):
+            decode_frame(b"x" * FRAME_HEADER.size)
+
+    def test_truncated_frame(self) -> None:
+        """Tests that decoding a frame cut short raises a ValueError"""
+
+        buffer = encode_frame(np.zeros((4, 4), dtype=np.uint8)).tobytes()
+
+        with pytest.raises(ValueError):
+            decode_frame(buffer[:-1])
+
+    def test_post(self, frame_server: tuple[str, list[bytes]]) -> None:
+        """Tests that a payload posted with requests arrives intact"""
+
+        address, bodies = frame_server
+        frame = np.arange(64 * 48 * 3, dtype=np.uint32).reshape(64, 48, 3)
+
+        response = requests.post(
+            address,
+            # requests streams any iterable of byte chunks, memoryviews too.
+            data=cast(Iterable[bytes], encode_frame(frame)),
+            headers={"Content-Type": CONTENT_TYPE},
+            timeout=5,
+        )
+
+        assert response.status_code == 200
+        np.testing.assert_array_equal(
+            frame_to_array(decode_frame(bodies[0])), frame
+        )
+
+    def test_screenshotter_send(
+        self, frame_server: tuple[str, list[bytes]]
+    ) -> None:
+        """Tests that the screenshotter sends numbered binary frames"""
+
+        address, bodies = frame_server
+        screenshotter = Screenshotter(address, sct=SyntheticScreen(64, 32))
+
+        for _ in range(2):
+            screenshotter.send_screenshot(screenshotter.take_screenshot())
+
+        headers = [decode_frame(body).header for body in bodies]
+        assert [header.frame_id for header in headers] == [1, 2]
+        assert headers[0].shape == (32, 64, 3)
+
+    def test_process_screenshot_sends_in_background(
+        self, frame_server: tuple[str, list[bytes]]
+    ) -> None:
+        """Tests that processing a screenshot encodes and sends it on the
+        sender thread"""
+
+        address, bodies = frame_server
+        screenshotter = Screenshotter(
+            address, sct=SyntheticScreen(64, 32), encoder=ZlibEncoder()
+        )
+
+        future = screenshotter.process_screenshot()
+        assert future is not None
+        response = future.result(timeout=5)
+        screenshotter.__exit__(None, None, None)
+
+        assert response.status_code == 200
+        decoded = decode_frame(bodies[0])
+        assert decoded.header.encoding == "zlib"
+        assert decode(decoded).shape == (32, 64, 3)
+
+    def test_screenshotter_send_regions(
+        self, frame_server: tuple[str, list[bytes]]
+    ) -> None:
+        """Tests that the screenshotter sends the regions in one body"""
+
+        address, bodies = frame_server
+        screenshotter = Screenshotter(
+            address, sct=SyntheticScreen(200, 100), regions="player_names"
+        )
+
+        future = screenshotter.process_screenshot()
+        assert future is not None
+        response = future.result(timeout=5)
+        screenshotter.__exit__(None, None, None)
+
+        frames = decode_frames(bodies[0])
+        assert response.status_code == 200
+        assert [frame.header.shape for frame in frames] == [(30, 40, 3)] * 2
@@ -110,8 +110,10 @@ def identify_missing_values(data: list[int | None]) -> list[int]:
             new_data.append(value)
             previous_value = value
 
-    # Find the missing values
+    # Find the missing values. A set keeps this linear in the length of the
+    # range, rather than scanning new_data for every value.
+    present_values = set(new_data)
     for value in range(smallest_value, largest_value + 1):
-        if value not in new_data:
+        if value not in present_values:
             out.append(value)
     return out